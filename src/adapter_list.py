@@ -0,0 +1,147 @@
+"""アダプター一覧表示用のモデル."""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.models.models import AdapterDetails, NetworkAdapter
+
+# 一覧の列（Treeviewの列IDと見出し）
+COLUMNS: tuple[tuple[str, str], ...] = (
+    ("name", "名前"),
+    ("type", "種類"),
+    ("status", "状態"),
+    ("link_speed", "リンク速度"),
+    ("description", "説明"),
+)
+
+
+def format_link_speed(bps: int) -> str:
+    """リンク速度を表示用の文字列に変換."""
+    if bps <= 0:
+        return ""
+    if bps >= 10**9:
+        return f"{bps / 10**9:g} Gbps"
+    if bps >= 10**6:
+        return f"{bps / 10**6:g} Mbps"
+    return f"{bps / 10**3:g} kbps"
+
+
+def detail_rows(details: AdapterDetails) -> list[tuple[str, str]]:
+    """詳細表示の行（項目名と値）を返す（複数の値はカンマ区切り）."""
+    return [
+        ("MACアドレス", details.mac_address or "-"),
+        ("リンク速度", format_link_speed(details.link_speed_bps) or "-"),
+        ("IPv4アドレス", ", ".join(details.ipv4_addresses) or "-"),
+        ("IPv6アドレス", ", ".join(details.ipv6_addresses) or "-"),
+        ("ゲートウェイ", ", ".join(details.gateways) or "-"),
+        ("DNSサーバー", ", ".join(details.dns_servers) or "-"),
+    ]
+
+
+_SORT_KEYS: dict[str, Callable[[NetworkAdapter], Any]] = {
+    "name": lambda a: a.name.casefold(),
+    "type": lambda a: a.adapter_type.value,
+    "status": lambda a: a.status.value,
+    "link_speed": lambda a: a.link_speed_bps,
+    "description": lambda a: a.interface_description.casefold(),
+}
+
+
+@dataclass
+class RowChanges:
+    """前回の一覧からの行単位の差分."""
+
+    inserted: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """差分があるかどうか."""
+        return bool(self.inserted or self.updated or self.removed)
+
+
+class AdapterListModel:
+    """アダプター一覧の並び替え・絞り込み・差分更新を管理するクラス.
+
+    行はアダプター名をキーとして識別する.
+    """
+
+    def __init__(self) -> None:
+        """モデルを初期化."""
+        self._adapters: dict[str, NetworkAdapter] = {}
+        self.sort_column = "name"
+        self.sort_descending = False
+        self.filter_text = ""
+
+    def __len__(self) -> int:
+        """保持しているアダプター数."""
+        return len(self._adapters)
+
+    def get(self, name: str) -> NetworkAdapter | None:
+        """名前からアダプターを取得."""
+        return self._adapters.get(name)
+
+    def update(self, adapters: list[NetworkAdapter]) -> RowChanges:
+        """最新のアダプター一覧を反映し、変化した行だけを返す."""
+        latest = {adapter.name: adapter for adapter in adapters}
+        changes = RowChanges()
+
+        for name in self._adapters.keys() - latest.keys():
+            changes.removed.append(name)
+        for name, adapter in latest.items():
+            previous = self._adapters.get(name)
+            if previous is None:
+                changes.inserted.append(name)
+            elif previous != adapter:
+                changes.updated.append(name)
+
+        self._adapters = latest
+        return changes
+
+    def set_sort(self, column: str) -> None:
+        """並び替えの列を設定（同じ列なら昇順・降順を反転）."""
+        if column not in _SORT_KEYS:
+            raise ValueError(f"unknown column: {column}")
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+
+    def set_filter(self, text: str) -> None:
+        """絞り込み文字列を設定（名前・種類・状態・説明の部分一致）."""
+        self.filter_text = text.strip()
+
+    def matches(self, adapter: NetworkAdapter) -> bool:
+        """アダプターが絞り込み条件に一致するかどうか."""
+        if not self.filter_text:
+            return True
+        needle = self.filter_text.casefold()
+        return any(
+            needle in value.casefold()
+            for value in (
+                adapter.name,
+                adapter.adapter_type.value,
+                adapter.status.value,
+                adapter.interface_description,
+            )
+        )
+
+    def visible_rows(self) -> list[str]:
+        """絞り込み・並び替え後の行（アダプター名）を表示順に返す."""
+        key = _SORT_KEYS[self.sort_column]
+        visible = [a for a in self._adapters.values() if self.matches(a)]
+        visible.sort(key=key, reverse=self.sort_descending)
+        return [adapter.name for adapter in visible]
+
+    def row_values(self, name: str) -> tuple[str, ...]:
+        """行に表示する値を列順に返す."""
+        adapter = self._adapters[name]
+        return (
+            adapter.name,
+            adapter.adapter_type.value,
+            adapter.status.value,
+            format_link_speed(adapter.link_speed_bps),
+            adapter.interface_description,
+        )
@@ -0,0 +1,20 @@
+"""アプリケーションの状態ファイルの保存先."""
+
+import os
+import sys
+from pathlib import Path
+
+APP_DIR_NAME = "NetworkAdapterSwitcher"
+
+
+def state_dir() -> Path:
+    """マシンごとの状態ファイルを保存するディレクトリを返す.
+
+    Windowsでは %LOCALAPPDATA%、それ以外では $XDG_STATE_HOME
+    （未設定なら ~/.local/state）の下に作成する.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    else:
+        base = os.environ.get("XDG_STATE_HOME") or str(Path.home() / ".local" / "state")
+    return Path(base) / APP_DIR_NAME
@@ -1,30 +1,139 @@
 """GUI実装モジュール."""
 
+import functools
 import logging
+import queue
 import tkinter as tk
 from tkinter import messagebox, ttk
+from typing import Protocol
 
-from src.models.models import NetworkAdapter
+from src.adapter_list import COLUMNS, AdapterListModel, RowChanges, detail_rows
+from src.link_probe import ProbeResult
+from src.models.models import AdapterDetails, NetworkAdapter, SwitchMode
+from src.models.shared_state import AdapterStatePublisher, SharedStateError
 from src.network_manager import NetworkManager, NetworkManagerError
+from src.powershell import (
+    BreakerState,
+    CircuitOpenError,
+    PowerShellRunner,
+    PowerShellTimeoutError,
+)
+from src.profiling import Profiler
+from src.reconciler import ReconcilePlan, plan_reconcile, switch_state
+from src.single_instance import InstanceCommand
+from src.traffic_stats import TrafficSampler, default_source
 
 logger = logging.getLogger(__name__)
 
+# 連続した更新要求をまとめる間隔（秒）
+REFRESH_MIN_INTERVAL = 1.0
+
+# サーキットブレーカー状態の確認間隔（ミリ秒）
+BREAKER_POLL_INTERVAL_MS = 1000
+
+# 別の起動から届いた要求の確認間隔（ミリ秒）
+INSTANCE_COMMAND_POLL_INTERVAL_MS = 200
+
+# 通信量グラフの更新間隔（ミリ秒）と大きさ
+TRAFFIC_REDRAW_INTERVAL_MS = 5000
+SPARKLINE_WIDTH = 200
+SPARKLINE_HEIGHT = 28
+
+# アダプター一覧の列幅
+ADAPTER_COLUMN_WIDTHS = {
+    "name": 140,
+    "type": 70,
+    "status": 90,
+    "link_speed": 90,
+    "description": 260,
+}
+
+# プロファイリングモードで操作ごとの時間を計測するメソッド
+PROFILED_MANAGER_OPERATIONS = (
+    "get_adapters",
+    "query_adapters",
+    "enable_adapter",
+    "disable_adapter",
+    "switch_to_ethernet",
+    "switch_to_wifi",
+    "reconcile",
+    "rank_adapters",
+    "restore_metrics",
+    "get_adapter_details",
+)
+PROFILED_GUI_OPERATIONS = (
+    "_refresh_status",
+    "_switch_to_ethernet",
+    "_switch_to_wifi",
+    "_switch_to_best",
+    "_set_selected_adapter",
+    "_restore_metrics",
+    "_redraw_traffic",
+    "_load_details",
+)
+
+BREAKER_STATE_TEXT = {
+    BreakerState.CLOSED: "",
+    BreakerState.OPEN: "PowerShell応答なし（停止中）",
+    BreakerState.HALF_OPEN: "PowerShell復旧確認中...",
+}
+
+
+class Dialogs(Protocol):
+    """GUIが表示するダイアログ（既定は tkinter.messagebox）."""
+
+    def showinfo(self, title: str, message: str) -> str:
+        """情報を表示."""
+        ...
+
+    def showwarning(self, title: str, message: str) -> str:
+        """警告を表示."""
+        ...
+
+    def showerror(self, title: str, message: str) -> str:
+        """エラーを表示."""
+        ...
+
+    def askyesno(self, title: str, message: str) -> bool:
+        """はい・いいえで確認."""
+        ...
+
 
 class NetworkAdapterGUI:
     """ネットワークアダプター切り替えGUI."""
 
-    def __init__(self, root: tk.Tk) -> None:
-        """GUIを初期化."""
+    def __init__(
+        self,
+        root: tk.Tk,
+        profiler: Profiler | None = None,
+        commands: "queue.SimpleQueue[InstanceCommand] | None" = None,
+        network_manager: NetworkManager | None = None,
+        dialogs: Dialogs = messagebox,
+    ) -> None:
+        """GUIを初期化.
+
+        Args:
+            root: Tkのルートウィンドウ
+            profiler: プロファイリングモード時のプロファイラー
+            commands: 別の起動やコマンドライン引数から届く要求
+            network_manager: 使用するマネージャー（省略時は既定値で生成）
+            dialogs: ダイアログの表示先（省略時は tkinter.messagebox）
+        """
         self.root = root
+        self.dialogs = dialogs
+        self.profiler = profiler
+        self.commands = commands
         self.root.title("ネットワークアダプター切り替えツール")
-        self.root.geometry("500x350")
-        self.root.resizable(False, False)
+        self.root.geometry("720x680")
+        self.root.minsize(560, 520)
 
-        self.network_manager = NetworkManager()
+        self.network_manager = network_manager or NetworkManager(
+            refresh_min_interval=REFRESH_MIN_INTERVAL
+        )
 
         # 管理者権限チェック
         if not self.network_manager.is_admin():
-            messagebox.showerror(
+            self.dialogs.showerror(
                 "エラー",
                 "このアプリケーションは管理者権限で実行する必要があります。\n"
                 "管理者として実行してください。",
@@ -32,17 +141,96 @@ class NetworkAdapterGUI:
             self.root.quit()
             return
 
+        self.state_publisher = self._create_state_publisher()
+        self.network_manager.state_publisher = self.state_publisher
+
         self.ethernet_adapter: NetworkAdapter | None = None
         self.wifi_adapter: NetworkAdapter | None = None
+        self.adapter_model = AdapterListModel()
+
+        # 通信量のサンプリングは専用のランナー（ブレーカー）で行い、
+        # そのタイムアウトが切り替え操作のブレーカーを開かないようにする
+        self.traffic_runner = self._create_traffic_runner()
+        self.traffic_sampler = TrafficSampler(default_source(self.traffic_runner))
+
+        if self.profiler is not None:
+            self.profiler.instrument(self.network_manager, PROFILED_MANAGER_OPERATIONS)
+            self.profiler.instrument(self, PROFILED_GUI_OPERATIONS)
+            self._create_profiling_menu()
+            self._schedule_profile_report()
 
         self._create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._poll_breaker_state()
         self._refresh_status()
+        self.traffic_sampler.start()
+        self._redraw_traffic()
+        if self.commands is not None:
+            self._poll_instance_commands()
+
+    @staticmethod
+    def _create_state_publisher() -> AdapterStatePublisher | None:
+        """他のプロセス向けにアダプター状態を公開する共有メモリを作成."""
+        try:
+            return AdapterStatePublisher()
+        except (OSError, SharedStateError) as e:
+            logger.warning(f"アダプター状態の共有メモリを作成できません: {e}")
+            return None
+
+    def _create_traffic_runner(self) -> PowerShellRunner:
+        """通信量のサンプリング専用のランナーを作成."""
+        return PowerShellRunner()
+
+    def _create_profiling_menu(self) -> None:
+        """プロファイリングモード用のメニューを作成."""
+        menubar = tk.Menu(self.root)
+        tools_menu = tk.Menu(menubar, tearoff=False)
+        tools_menu.add_command(
+            label="プロファイルレポートを出力", command=self._dump_profile_report
+        )
+        menubar.add_cascade(label="ツール", menu=tools_menu)
+        self.root.config(menu=menubar)
+
+    def _schedule_profile_report(self) -> None:
+        """定期的なプロファイルレポートの出力を予約."""
+        if self.profiler is None:
+            return
+        interval_ms = int(self.profiler.report_interval * 1000)
+        self.root.after(interval_ms, self._write_periodic_profile_report)
+
+    def _write_periodic_profile_report(self) -> None:
+        """定期的なプロファイルレポートを出力."""
+        if self.profiler is not None:
+            try:
+                self.profiler.write_report()
+            except OSError as e:
+                logger.error(f"プロファイルレポートの出力に失敗: {e}")
+        self._schedule_profile_report()
+
+    def _dump_profile_report(self) -> None:
+        """プロファイルレポートをその場で出力."""
+        if self.profiler is None:
+            return
+        try:
+            path = self.profiler.write_report()
+        except OSError as e:
+            logger.error(f"プロファイルレポートの出力に失敗: {e}")
+            self.dialogs.showerror(
+                "エラー", f"プロファイルレポートを出力できませんでした\n{e}"
+            )
+            return
+        self.status_bar.config(text=f"プロファイルレポートを出力: {path.name}")
+        self.dialogs.showinfo("プロファイル", f"レポートを出力しました\n{path}")
 
     def _create_widgets(self) -> None:
         """ウィジェットを作成."""
         # メインフレーム
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.grid(row=0, column=0, sticky="nsew")
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(2, weight=1)
 
         # タイトル
         title_label = ttk.Label(
@@ -50,39 +238,110 @@ class NetworkAdapterGUI:
             text="ネットワークアダプター切り替え",
             font=("Arial", 14, "bold"),
         )
-        title_label.grid(row=0, column=0, columnspan=2, pady=(0, 20))
+        title_label.grid(row=0, column=0, columnspan=2, pady=(0, 10))
 
-        # イーサネット情報フレーム
-        ethernet_frame = ttk.LabelFrame(main_frame, text="イーサネット", padding="10")
-        ethernet_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=5)
+        # イーサネット・Wi-Fiの概要（コンパクトヘッダー）
+        summary_frame = ttk.LabelFrame(main_frame, text="概要", padding="5")
+        summary_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=5)
+        summary_frame.columnconfigure(1, weight=1)
 
-        ttk.Label(ethernet_frame, text="名前:").grid(
-            row=0, column=0, sticky=tk.W, pady=2
+        ttk.Label(summary_frame, text="イーサネット:").grid(
+            row=0, column=0, sticky=tk.W, padx=(0, 5)
+        )
+        self.ethernet_name_label = ttk.Label(summary_frame, text="読込中...")
+        self.ethernet_name_label.grid(row=0, column=1, sticky=tk.W)
+        self.ethernet_status_label = ttk.Label(summary_frame, text="読込中...")
+        self.ethernet_status_label.grid(row=0, column=2, sticky=tk.W, padx=5)
+        self.ethernet_sparkline, self.ethernet_rate_label = self._create_sparkline(
+            summary_frame, row=0, column=3
         )
-        self.ethernet_name_label = ttk.Label(ethernet_frame, text="読込中...")
-        self.ethernet_name_label.grid(row=0, column=1, sticky=tk.W, pady=2)
 
-        ttk.Label(ethernet_frame, text="状態:").grid(
-            row=1, column=0, sticky=tk.W, pady=2
+        ttk.Label(summary_frame, text="Wi-Fi:").grid(
+            row=1, column=0, sticky=tk.W, padx=(0, 5)
+        )
+        self.wifi_name_label = ttk.Label(summary_frame, text="読込中...")
+        self.wifi_name_label.grid(row=1, column=1, sticky=tk.W)
+        self.wifi_status_label = ttk.Label(summary_frame, text="読込中...")
+        self.wifi_status_label.grid(row=1, column=2, sticky=tk.W, padx=5)
+        self.wifi_sparkline, self.wifi_rate_label = self._create_sparkline(
+            summary_frame, row=1, column=3
         )
-        self.ethernet_status_label = ttk.Label(ethernet_frame, text="読込中...")
-        self.ethernet_status_label.grid(row=1, column=1, sticky=tk.W, pady=2)
 
-        # Wi-Fi情報フレーム
-        wifi_frame = ttk.LabelFrame(main_frame, text="Wi-Fi", padding="10")
-        wifi_frame.grid(row=2, column=0, columnspan=2, sticky="ew", pady=5)
+        # 全アダプター一覧
+        list_frame = ttk.LabelFrame(main_frame, text="すべてのアダプター", padding="5")
+        list_frame.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=5)
+        list_frame.columnconfigure(1, weight=1)
+        list_frame.rowconfigure(1, weight=1)
+
+        ttk.Label(list_frame, text="絞り込み:").grid(row=0, column=0, sticky=tk.W)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *_: self._filter_adapters())
+        ttk.Entry(list_frame, textvariable=self.filter_var).grid(
+            row=0, column=1, columnspan=2, sticky="ew", pady=(0, 5)
+        )
 
-        ttk.Label(wifi_frame, text="名前:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.wifi_name_label = ttk.Label(wifi_frame, text="読込中...")
-        self.wifi_name_label.grid(row=0, column=1, sticky=tk.W, pady=2)
+        self.adapter_tree = ttk.Treeview(
+            list_frame,
+            columns=[column for column, _ in COLUMNS],
+            show="headings",
+            selectmode="browse",
+            height=8,
+        )
+        for column, heading in COLUMNS:
+            self.adapter_tree.heading(
+                column,
+                text=heading,
+                command=functools.partial(self._sort_adapters, column),
+            )
+            self.adapter_tree.column(column, width=ADAPTER_COLUMN_WIDTHS[column])
+        self.adapter_tree.grid(row=1, column=0, columnspan=2, sticky="nsew")
+        self.adapter_tree.bind("<<TreeviewSelect>>", lambda _: self._on_select())
 
-        ttk.Label(wifi_frame, text="状態:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.wifi_status_label = ttk.Label(wifi_frame, text="読込中...")
-        self.wifi_status_label.grid(row=1, column=1, sticky=tk.W, pady=2)
+        scrollbar = ttk.Scrollbar(
+            list_frame, orient=tk.VERTICAL, command=self.adapter_tree.yview
+        )
+        scrollbar.grid(row=1, column=2, sticky="ns")
+        self.adapter_tree.configure(yscrollcommand=scrollbar.set)
+
+        action_frame = ttk.Frame(list_frame)
+        action_frame.grid(row=2, column=0, columnspan=3, sticky=tk.E, pady=(5, 0))
+        self.enable_selected_button = ttk.Button(
+            action_frame,
+            text="選択を有効化",
+            command=lambda: self._set_selected_adapter(enabled=True),
+            state=tk.DISABLED,
+        )
+        self.enable_selected_button.grid(row=0, column=0, padx=5)
+        self.disable_selected_button = ttk.Button(
+            action_frame,
+            text="選択を無効化",
+            command=lambda: self._set_selected_adapter(enabled=False),
+            state=tk.DISABLED,
+        )
+        self.disable_selected_button.grid(row=0, column=1)
+        self.details_button = ttk.Button(
+            action_frame, text="詳細 ▸", command=self._toggle_details
+        )
+        self.details_button.grid(row=0, column=2, padx=(5, 0))
+
+        # 選択したアダプターの詳細（開いたときだけ取得）
+        self.details_visible = False
+        self.details_frame = ttk.LabelFrame(list_frame, text="詳細", padding="5")
+        self.details_frame.grid(row=3, column=0, columnspan=3, sticky="ew", pady=(5, 0))
+        self.details_frame.columnconfigure(1, weight=1)
+        self.detail_value_labels: dict[str, ttk.Label] = {}
+        for row, (label, _) in enumerate(detail_rows(AdapterDetails(name=""))):
+            ttk.Label(self.details_frame, text=f"{label}:").grid(
+                row=row, column=0, sticky=tk.W, padx=(0, 5)
+            )
+            value_label = ttk.Label(self.details_frame, text="-")
+            value_label.grid(row=row, column=1, sticky=tk.W)
+            self.detail_value_labels[label] = value_label
+        self.details_frame.grid_remove()
 
         # ボタンフレーム
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=3, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=3, column=0, columnspan=2, pady=10)
 
         self.ethernet_button = ttk.Button(
             button_frame,
@@ -100,22 +359,140 @@ class NetworkAdapterGUI:
         )
         self.wifi_button.grid(row=0, column=1, padx=5)
 
+        self.best_button = ttk.Button(
+            button_frame,
+            text="最速のアダプターに切り替え（メトリック方式のみ）",
+            command=self._switch_to_best,
+        )
+        self.best_button.grid(row=1, column=0, columnspan=2, pady=(10, 0), sticky="ew")
+
+        # 切り替え方式
+        mode_frame = ttk.Frame(button_frame)
+        mode_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0), sticky="ew")
+        ttk.Label(mode_frame, text="切り替え方式:").grid(row=0, column=0, padx=(0, 5))
+
+        self.switch_mode_var = tk.StringVar(
+            value=self.network_manager.switch_mode.value
+        )
+        ttk.Radiobutton(
+            mode_frame,
+            text="無効化",
+            value=SwitchMode.DISABLE.value,
+            variable=self.switch_mode_var,
+            command=self._change_switch_mode,
+        ).grid(row=0, column=1, padx=5)
+        ttk.Radiobutton(
+            mode_frame,
+            text="メトリック（両方有効）",
+            value=SwitchMode.METRIC.value,
+            variable=self.switch_mode_var,
+            command=self._change_switch_mode,
+        ).grid(row=0, column=2, padx=5)
+
+        self.restore_metrics_button = ttk.Button(
+            mode_frame,
+            text="メトリックを元に戻す",
+            command=self._restore_metrics,
+        )
+        self.restore_metrics_button.grid(row=0, column=3, padx=(10, 0))
+
         # 更新ボタン
         refresh_button = ttk.Button(
             main_frame,
             text="状態を更新",
             command=self._refresh_status,
         )
-        refresh_button.grid(row=4, column=0, columnspan=2, pady=10)
+        refresh_button.grid(row=4, column=0, columnspan=2, pady=5)
 
         # ステータスバー
+        status_frame = ttk.Frame(main_frame)
+        status_frame.grid(row=5, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        status_frame.columnconfigure(0, weight=1)
+
         self.status_bar = ttk.Label(
-            main_frame,
+            status_frame,
             text="準備完了",
             relief=tk.SUNKEN,
             anchor=tk.W,
         )
-        self.status_bar.grid(row=5, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        self.status_bar.grid(row=0, column=0, sticky="ew")
+
+        # サーキットブレーカー状態
+        self.breaker_label = ttk.Label(
+            status_frame, text="", relief=tk.SUNKEN, foreground="red"
+        )
+        self.breaker_label.grid(row=0, column=1, sticky="e")
+
+    @staticmethod
+    def _create_sparkline(
+        parent: ttk.LabelFrame, row: int, column: int
+    ) -> tuple[tk.Canvas, ttk.Label]:
+        """通信量グラフとレート表示ラベルを作成."""
+        frame = ttk.Frame(parent)
+        frame.grid(row=row, column=column, sticky=tk.W, pady=2)
+
+        canvas = tk.Canvas(
+            frame,
+            width=SPARKLINE_WIDTH,
+            height=SPARKLINE_HEIGHT,
+            background="white",
+            highlightthickness=1,
+            highlightbackground="gray",
+        )
+        canvas.grid(row=0, column=0)
+        flat = (0, SPARKLINE_HEIGHT - 1, SPARKLINE_WIDTH, SPARKLINE_HEIGHT - 1)
+        canvas.create_line(*flat, fill="blue", tags="rx")
+        canvas.create_line(*flat, fill="orange", tags="tx")
+
+        rate_label = ttk.Label(frame, text="")
+        rate_label.grid(row=0, column=1, padx=(5, 0))
+        return canvas, rate_label
+
+    @staticmethod
+    def _sparkline_points(values: list[float], peak: float) -> list[float]:
+        """値の履歴をグラフの座標列に変換."""
+        if len(values) < 2 or peak <= 0:
+            bottom = SPARKLINE_HEIGHT - 1
+            return [0, bottom, SPARKLINE_WIDTH, bottom]
+
+        step = SPARKLINE_WIDTH / (len(values) - 1)
+        scale = (SPARKLINE_HEIGHT - 2) / peak
+        points: list[float] = []
+        for i, value in enumerate(values):
+            points.append(i * step)
+            points.append(SPARKLINE_HEIGHT - 1 - value * scale)
+        return points
+
+    @staticmethod
+    def _format_rate(bps: float) -> str:
+        """bpsを読みやすい単位の文字列に変換."""
+        for unit, divisor in (("Gbps", 1e9), ("Mbps", 1e6), ("kbps", 1e3)):
+            if bps >= divisor:
+                return f"{bps / divisor:.1f} {unit}"
+        return f"{bps:.0f} bps"
+
+    def _redraw_traffic(self) -> None:
+        """各アダプターの通信量グラフを更新."""
+        rows = (
+            (self.ethernet_adapter, self.ethernet_sparkline, self.ethernet_rate_label),
+            (self.wifi_adapter, self.wifi_sparkline, self.wifi_rate_label),
+        )
+        for adapter, canvas, rate_label in rows:
+            if adapter is None:
+                rx_values: list[float] = []
+                tx_values: list[float] = []
+            else:
+                rx_values, tx_values = self.traffic_sampler.series(adapter.name)
+
+            peak = max(max(rx_values, default=0.0), max(tx_values, default=0.0))
+            canvas.coords("rx", *self._sparkline_points(rx_values, peak))
+            canvas.coords("tx", *self._sparkline_points(tx_values, peak))
+
+            rx = rx_values[-1] if rx_values else 0.0
+            tx = tx_values[-1] if tx_values else 0.0
+            rate_label.config(text=f"↓{self._format_rate(rx)} ↑{self._format_rate(tx)}")
+
+        self.root.after(TRAFFIC_REDRAW_INTERVAL_MS, self._redraw_traffic)
 
     def _update_status_display(self) -> None:
         """アダプター情報の表示を更新."""
@@ -157,6 +534,201 @@ class NetworkAdapterGUI:
             state=tk.NORMAL if both_adapters_found else tk.DISABLED
         )
         self.wifi_button.config(state=tk.NORMAL if both_adapters_found else tk.DISABLED)
+        self._update_best_button()
+
+    def _update_best_button(self) -> None:
+        """最速のアダプターへの切り替えはメトリック方式でのみ有効にする.
+
+        無効化方式では待機側のアダプターにIPアドレスがなく計測できない.
+        """
+        available = (
+            self.ethernet_adapter is not None
+            and self.wifi_adapter is not None
+            and self.network_manager.switch_mode == SwitchMode.METRIC
+        )
+        self.best_button.config(state=tk.NORMAL if available else tk.DISABLED)
+
+    def _apply_adapter_rows(self, changes: RowChanges) -> None:
+        """変化した行だけを一覧に反映し、表示順を整える."""
+        tree = self.adapter_tree
+        for name in changes.removed:
+            tree.delete(name)
+        for name in changes.inserted:
+            tree.insert(
+                "", tk.END, iid=name, values=self.adapter_model.row_values(name)
+            )
+        for name in changes.updated:
+            tree.item(name, values=self.adapter_model.row_values(name))
+        for name in changes.updated + changes.removed:
+            self.network_manager.invalidate_adapter_details(name)
+
+        self._reorder_adapter_rows()
+        if changes.removed or changes.updated:
+            self._on_select()
+
+    def _reorder_adapter_rows(self) -> None:
+        """絞り込み・並び替えの結果に合わせて行を移動（順序が同じなら何もしない）."""
+        tree = self.adapter_tree
+        visible = self.adapter_model.visible_rows()
+        current = tree.get_children()
+        if list(current) == visible:
+            return
+
+        visible_set = set(visible)
+        hidden = [name for name in current if name not in visible_set]
+        if hidden:
+            tree.detach(*hidden)
+        for index, name in enumerate(visible):
+            tree.move(name, "", index)
+
+    def _sort_adapters(self, column: str) -> None:
+        """見出しクリックで一覧を並び替え."""
+        self.adapter_model.set_sort(column)
+        arrow = " ▼" if self.adapter_model.sort_descending else " ▲"
+        for col, heading in COLUMNS:
+            self.adapter_tree.heading(
+                col, text=heading + (arrow if col == column else "")
+            )
+        self._reorder_adapter_rows()
+
+    def _filter_adapters(self) -> None:
+        """絞り込み文字列に合わせて一覧を更新."""
+        self.adapter_model.set_filter(self.filter_var.get())
+        self._reorder_adapter_rows()
+
+    def _selected_adapter(self) -> NetworkAdapter | None:
+        """一覧で選択中のアダプター."""
+        selection = self.adapter_tree.selection()
+        if not selection:
+            return None
+        return self.adapter_model.get(selection[0])
+
+    def _on_select(self) -> None:
+        """選択中のアダプターに応じて有効化・無効化ボタンを切り替え."""
+        adapter = self._selected_adapter()
+        enabled = adapter is not None and adapter.is_enabled()
+        self.enable_selected_button.config(
+            state=tk.NORMAL if adapter is not None and not enabled else tk.DISABLED
+        )
+        self.disable_selected_button.config(state=tk.NORMAL if enabled else tk.DISABLED)
+        if self.details_visible:
+            self._load_details()
+
+    def _toggle_details(self) -> None:
+        """詳細表示を開閉（開いたときに選択中のアダプターの詳細を取得）."""
+        self.details_visible = not self.details_visible
+        if self.details_visible:
+            self.details_frame.grid()
+            self.details_button.config(text="詳細 ▾")
+            self._load_details()
+        else:
+            self.details_frame.grid_remove()
+            self.details_button.config(text="詳細 ▸")
+
+    def _load_details(self) -> None:
+        """選択中のアダプターの詳細を表示（取得済みならキャッシュを使う）."""
+        adapter = self._selected_adapter()
+        if adapter is None:
+            self.details_frame.config(text="詳細")
+            self._show_detail_values(None)
+            return
+
+        self.details_frame.config(text=f"詳細: {adapter.name}")
+        try:
+            details = self.network_manager.get_adapter_details(adapter.name)
+        except NetworkManagerError as e:
+            logger.error(f"アダプター詳細取得エラー: {e}")
+            self._show_detail_values(None, placeholder="取得失敗")
+            self.status_bar.config(text=self._failure_status(e, "詳細の取得失敗"))
+            return
+        self._show_detail_values(details)
+
+    def _show_detail_values(
+        self, details: AdapterDetails | None, placeholder: str = "-"
+    ) -> None:
+        """詳細表示の値を更新."""
+        if details is None:
+            for value_label in self.detail_value_labels.values():
+                value_label.config(text=placeholder)
+            return
+        for label, value in detail_rows(details):
+            self.detail_value_labels[label].config(text=value)
+
+    def _set_selected_adapter(self, enabled: bool) -> None:
+        """選択中のアダプターを有効化・無効化."""
+        adapter = self._selected_adapter()
+        if adapter is None:
+            return
+
+        action = "有効化" if enabled else "無効化"
+        if not self.dialogs.askyesno(
+            "確認", f"{adapter.name} を{action}します。\n\nよろしいですか？"
+        ):
+            return
+
+        try:
+            self.status_bar.config(text=f"{adapter.name} を{action}中...")
+            self.root.update()
+
+            if enabled:
+                self.network_manager.enable_adapter(adapter.name)
+            else:
+                self.network_manager.disable_adapter(adapter.name)
+
+            self._refresh_status()
+
+        except NetworkManagerError as e:
+            logger.error(f"アダプター{action}エラー: {e}")
+            self.dialogs.showerror(
+                "エラー", f"{adapter.name} の{action}に失敗しました\n{e}"
+            )
+            self.status_bar.config(text=self._failure_status(e, f"{action}失敗"))
+
+    def _poll_breaker_state(self) -> None:
+        """サーキットブレーカーの状態をステータスバーに反映."""
+        state = self.network_manager.runner.breaker.state
+        self.breaker_label.config(text=BREAKER_STATE_TEXT[state])
+        self.root.after(BREAKER_POLL_INTERVAL_MS, self._poll_breaker_state)
+
+    @staticmethod
+    def _failure_status(e: NetworkManagerError, default: str) -> str:
+        """エラー原因に応じたステータスバーの文言を返す."""
+        if isinstance(e.__cause__, PowerShellTimeoutError):
+            return f"{default}（タイムアウト）"
+        if isinstance(e.__cause__, CircuitOpenError):
+            return f"{default}（PowerShell停止中）"
+        return default
+
+    def _poll_instance_commands(self) -> None:
+        """別の起動から届いた要求をメインスレッドで処理."""
+        assert self.commands is not None
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            self._handle_instance_command(command)
+        self.root.after(INSTANCE_COMMAND_POLL_INTERVAL_MS, self._poll_instance_commands)
+
+    def _handle_instance_command(self, command: InstanceCommand) -> None:
+        """ウィンドウを前面に表示し、切り替えの要求なら確認なしで切り替え."""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        if command == InstanceCommand.SWITCH_ETHERNET:
+            self._switch_to_ethernet(confirm=False)
+        elif command == InstanceCommand.SWITCH_WIFI:
+            self._switch_to_wifi(confirm=False)
+
+    def _on_close(self) -> None:
+        """実行中の操作をキャンセルしてウィンドウを閉じる."""
+        self.network_manager.runner.shutdown()
+        self.network_manager.wifi_connector.runner.shutdown()
+        self.traffic_sampler.stop()
+        self.traffic_runner.shutdown()
+        if self.state_publisher is not None:
+            self.state_publisher.close()
+        self.root.destroy()
 
     def _refresh_status(self) -> None:
         """アダプター状態を更新."""
@@ -164,36 +736,107 @@ class NetworkAdapterGUI:
             self.status_bar.config(text="アダプター情報を取得中...")
             self.root.update()
 
-            self.ethernet_adapter = self.network_manager.find_ethernet_adapter()
-            self.wifi_adapter = self.network_manager.find_wifi_adapter()
+            adapters = self.network_manager.get_adapters()
+            # 見出しと切り替えの確認は、実際に切り替える物理アダプターの組で表示する
+            # （一覧の先頭にある仮想アダプターを切り替え対象と取り違えない）
+            ethernet, wifi = self.network_manager.find_switch_adapters()
+            by_name = {adapter.name: adapter for adapter in adapters}
+            self.ethernet_adapter = ethernet and by_name.get(ethernet.name, ethernet)
+            self.wifi_adapter = wifi and by_name.get(wifi.name, wifi)
 
             self._update_status_display()
+            self._apply_adapter_rows(self.adapter_model.update(adapters))
             self.status_bar.config(text="更新完了")
-            logger.info("アダプター情報を更新しました")
+            stats = self.network_manager.refresh_stats
+            logger.info(
+                "アダプター情報を更新しました"
+                f"（問い合わせ {stats.executions}/{stats.requests} 回、"
+                f"省略 {stats.saved} 回）"
+            )
 
         except NetworkManagerError as e:
             logger.error(f"アダプター情報更新エラー: {e}")
-            messagebox.showerror("エラー", f"アダプター情報の取得に失敗しました\n{e}")
-            self.status_bar.config(text="更新失敗")
+            self.dialogs.showerror("エラー", f"アダプター情報の取得に失敗しました\n{e}")
+            self.status_bar.config(text=self._failure_status(e, "更新失敗"))
+
+    def _switch_confirmation(self, target: str, other: str, plan: ReconcilePlan) -> str:
+        """切り替え方式に応じた確認メッセージを返す（無効化方式では実行する手順）."""
+        if self.network_manager.switch_mode == SwitchMode.METRIC:
+            return (
+                f"{target} を優先します。\n"
+                f"{other} は有効のまま、メトリックで優先度を下げます。\n\n"
+                "よろしいですか？"
+            )
+        return "\n".join(plan.describe()) + "\n\nよろしいですか？"
+
+    def _switch_plan(
+        self, target: NetworkAdapter, other: NetworkAdapter
+    ) -> ReconcilePlan:
+        """表示中の状態から切り替えの手順を求める（ドライラン）."""
+        return plan_reconcile(switch_state(target, other), [target, other])
+
+    def _show_switch_result(self, message: str) -> None:
+        """切り替え結果を表示（望ましい状態にならなかったアダプターがあれば警告）."""
+        report = self.network_manager.last_reconcile
+        if report is None or not report.drift:
+            self.dialogs.showinfo("成功", message)
+            return
+        drift = "\n".join(entry.describe() for entry in report.drift)
+        self.dialogs.showwarning(
+            "警告",
+            f"{message}\n\n望ましい状態になっていないアダプターがあります\n{drift}",
+        )
+
+    def _change_switch_mode(self) -> None:
+        """切り替え方式を変更."""
+        mode = SwitchMode(self.switch_mode_var.get())
+        self.network_manager.switch_mode = mode
+        logger.info(f"切り替え方式を変更: {mode.value}")
+        self._update_best_button()
+
+    def _restore_metrics(self) -> None:
+        """メトリック方式で変更したメトリックを元に戻す."""
+        if not self.network_manager.has_saved_metrics():
+            self.dialogs.showinfo("情報", "元に戻すメトリックはありません")
+            return
+
+        try:
+            self.status_bar.config(text="メトリックを元に戻し中...")
+            self.root.update()
 
-    def _switch_to_ethernet(self) -> None:
-        """イーサネットに切り替え."""
+            self.network_manager.restore_metrics()
+
+            self.status_bar.config(text="メトリックを元に戻しました")
+            self._refresh_status()
+
+        except NetworkManagerError as e:
+            logger.error(f"メトリック復元エラー: {e}")
+            self.dialogs.showerror("エラー", f"メトリックを元に戻せませんでした\n{e}")
+            self.status_bar.config(text=self._failure_status(e, "復元失敗"))
+
+    def _switch_to_ethernet(self, confirm: bool = True) -> None:
+        """イーサネットに切り替え（confirm=Falseなら確認ダイアログを出さない）."""
         try:
             if not self.ethernet_adapter or not self.wifi_adapter:
-                messagebox.showwarning(
+                self.dialogs.showwarning(
                     "警告", "イーサネットまたはWi-Fiアダプターが見つかりません"
                 )
                 return
 
+            plan = self._switch_plan(self.ethernet_adapter, self.wifi_adapter)
+            if self.network_manager.switch_mode == SwitchMode.DISABLE and plan.is_noop:
+                self.dialogs.showinfo("情報", "すでにイーサネットに切り替わっています")
+                return
+
             # 確認ダイアログ
-            result = messagebox.askyesno(
+            if confirm and not self.dialogs.askyesno(
                 "確認",
-                f"Wi-Fi ({self.wifi_adapter.name}) を無効化し、\n"
-                f"イーサネット ({self.ethernet_adapter.name}) を有効化します。\n\n"
-                "よろしいですか？",
-            )
-
-            if not result:
+                self._switch_confirmation(
+                    f"イーサネット ({self.ethernet_adapter.name})",
+                    f"Wi-Fi ({self.wifi_adapter.name})",
+                    plan,
+                ),
+            ):
                 return
 
             self.status_bar.config(text="イーサネットに切り替え中...")
@@ -201,33 +844,38 @@ class NetworkAdapterGUI:
 
             self.network_manager.switch_to_ethernet()
 
-            messagebox.showinfo("成功", "イーサネットに切り替えました")
+            self._show_switch_result("イーサネットに切り替えました")
             self._refresh_status()
 
         except NetworkManagerError as e:
             logger.error(f"イーサネット切り替えエラー: {e}")
             error_msg = f"イーサネットへの切り替えに失敗しました\n{e}"
-            messagebox.showerror("エラー", error_msg)
-            self.status_bar.config(text="切り替え失敗")
+            self.dialogs.showerror("エラー", error_msg)
+            self.status_bar.config(text=self._failure_status(e, "切り替え失敗"))
 
-    def _switch_to_wifi(self) -> None:
-        """Wi-Fiに切り替え."""
+    def _switch_to_wifi(self, confirm: bool = True) -> None:
+        """Wi-Fiに切り替え（confirm=Falseなら確認ダイアログを出さない）."""
         try:
             if not self.ethernet_adapter or not self.wifi_adapter:
-                messagebox.showwarning(
+                self.dialogs.showwarning(
                     "警告", "イーサネットまたはWi-Fiアダプターが見つかりません"
                 )
                 return
 
+            plan = self._switch_plan(self.wifi_adapter, self.ethernet_adapter)
+            if self.network_manager.switch_mode == SwitchMode.DISABLE and plan.is_noop:
+                self.dialogs.showinfo("情報", "すでにWi-Fiに切り替わっています")
+                return
+
             # 確認ダイアログ
-            result = messagebox.askyesno(
+            if confirm and not self.dialogs.askyesno(
                 "確認",
-                f"イーサネット ({self.ethernet_adapter.name}) を無効化し、\n"
-                f"Wi-Fi ({self.wifi_adapter.name}) を有効化します。\n\n"
-                "よろしいですか？",
-            )
-
-            if not result:
+                self._switch_confirmation(
+                    f"Wi-Fi ({self.wifi_adapter.name})",
+                    f"イーサネット ({self.ethernet_adapter.name})",
+                    plan,
+                ),
+            ):
                 return
 
             self.status_bar.config(text="Wi-Fiに切り替え中...")
@@ -235,13 +883,84 @@ class NetworkAdapterGUI:
 
             self.network_manager.switch_to_wifi()
 
-            messagebox.showinfo("成功", "Wi-Fiに切り替えました")
+            message = "Wi-Fiに切り替えました"
+            association = self.network_manager.last_association
+            if association is not None:
+                message += (
+                    f"\n{association.ssid}（信号 {association.signal_percent}%）に"
+                    f"{association.seconds:.1f}秒で接続しました"
+                )
+            self._show_switch_result(message)
             self._refresh_status()
 
         except NetworkManagerError as e:
             logger.error(f"Wi-Fi切り替えエラー: {e}")
-            messagebox.showerror("エラー", f"Wi-Fiへの切り替えに失敗しました\n{e}")
-            self.status_bar.config(text="切り替え失敗")
+            self.dialogs.showerror("エラー", f"Wi-Fiへの切り替えに失敗しました\n{e}")
+            self.status_bar.config(text=self._failure_status(e, "切り替え失敗"))
+
+    @staticmethod
+    def _format_probe_result(rank: int, result: ProbeResult) -> str:
+        """計測結果を1行の文字列に整形."""
+        if not result.reachable:
+            return f"{rank}. {result.name}: 計測不可（{result.error}）"
+
+        line = f"{rank}. {result.name}: RTT {result.rtt_ms:.1f}ms"
+        line += f" / ジッター {result.jitter_ms:.1f}ms"
+        if result.throughput_bps is not None:
+            line += f" / {result.throughput_bps / 1e6:.1f}Mbps"
+        if result.link_speed_bps:
+            line += f" / リンク {result.link_speed_bps / 1e6:.0f}Mbps"
+        return line
+
+    def _switch_to_best(self) -> None:
+        """リンク品質を計測し、最も良いアダプターに切り替え."""
+        try:
+            self.status_bar.config(text="リンク品質を計測中...")
+            self.root.update()
+
+            ranked = self.network_manager.rank_adapters()
+            best = ranked[0]
+            lines = [self._format_probe_result(i, r) for i, r in enumerate(ranked, 1)]
+            if not best.reachable:
+                self.status_bar.config(text="計測先に到達できません")
+                self.dialogs.showinfo(
+                    "計測結果",
+                    "\n".join(lines)
+                    + "\n\nどのアダプターでも計測先に到達できないため切り替えません",
+                )
+                return
+            self.status_bar.config(text=f"推奨: {best.name}")
+
+            if (
+                self.ethernet_adapter is not None
+                and best.name == self.ethernet_adapter.name
+            ):
+                switch = self.network_manager.switch_to_ethernet
+            elif self.wifi_adapter is not None and best.name == self.wifi_adapter.name:
+                switch = self.network_manager.switch_to_wifi
+            else:
+                self.dialogs.showinfo("計測結果", "\n".join(lines))
+                return
+
+            result = self.dialogs.askyesno(
+                "確認",
+                "\n".join(lines) + f"\n\n{best.name} に切り替えます。よろしいですか？",
+            )
+            if not result:
+                return
+
+            self.status_bar.config(text=f"{best.name} に切り替え中...")
+            self.root.update()
+
+            switch()
+
+            self.dialogs.showinfo("成功", f"{best.name} に切り替えました")
+            self._refresh_status()
+
+        except NetworkManagerError as e:
+            logger.error(f"最速アダプターへの切り替えエラー: {e}")
+            self.dialogs.showerror("エラー", f"切り替えに失敗しました\n{e}")
+            self.status_bar.config(text=self._failure_status(e, "切り替え失敗"))
 
     def run(self) -> None:
         """GUIを起動."""
@@ -0,0 +1,253 @@
+"""アダプターごとのリンク品質を計測するモジュール."""
+
+import logging
+import math
+import os
+import socket
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# 既定のRTT計測先（TCP接続時間を計測）
+DEFAULT_RTT_TARGETS = ("1.1.1.1:443", "8.8.8.8:443")
+
+
+class LinkProbeError(Exception):
+    """リンク品質計測のエラー."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class ProbeTarget:
+    """計測先のホストとポート."""
+
+    host: str
+    port: int
+    request: bytes = b""
+
+    @classmethod
+    def parse(cls, text: str) -> "ProbeTarget":
+        """ "host:port" 形式の文字列から計測先を作成."""
+        host, sep, port = text.strip().rpartition(":")
+        if not sep or not host:
+            raise LinkProbeError(f"計測先の形式が不正です: {text}")
+        try:
+            return cls(host=host, port=int(port))
+        except ValueError as e:
+            raise LinkProbeError(f"計測先のポートが不正です: {text}") from e
+
+    @classmethod
+    def http_get(cls, host: str, port: int, path: str) -> "ProbeTarget":
+        """HTTP GETを送るスループット計測先を作成."""
+        request = f"GET {path} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode("ascii")
+        return cls(host=host, port=port, request=request)
+
+
+@dataclass(frozen=True)
+class ProbeConfig:
+    """計測設定."""
+
+    rtt_targets: tuple[ProbeTarget, ...] = field(
+        default_factory=lambda: tuple(ProbeTarget.parse(t) for t in DEFAULT_RTT_TARGETS)
+    )
+    rtt_samples: int = 5
+    connect_timeout: float = 2.0
+    throughput_target: ProbeTarget | None = None
+    throughput_duration: float = 1.0
+    throughput_max_bytes: int = 8 * 1024 * 1024
+
+    @classmethod
+    def from_env(cls) -> "ProbeConfig":
+        """環境変数から計測設定を作成.
+
+        PROBE_TARGETS: RTT計測先（"host:port" のカンマ区切り）
+        PROBE_THROUGHPUT_TARGET: スループット計測先（"host:port"）
+        PROBE_THROUGHPUT_PATH: 指定時はスループット計測先にHTTP GETを送る
+        """
+        targets_env = os.environ.get("PROBE_TARGETS", "")
+        targets_text = [t for t in targets_env.split(",") if t.strip()]
+        if not targets_text:
+            targets_text = list(DEFAULT_RTT_TARGETS)
+        rtt_targets = tuple(ProbeTarget.parse(t) for t in targets_text)
+
+        throughput_target: ProbeTarget | None = None
+        throughput_env = os.environ.get("PROBE_THROUGHPUT_TARGET", "").strip()
+        if throughput_env:
+            throughput_target = ProbeTarget.parse(throughput_env)
+            path = os.environ.get("PROBE_THROUGHPUT_PATH", "").strip()
+            if path:
+                throughput_target = ProbeTarget.http_get(
+                    throughput_target.host, throughput_target.port, path
+                )
+
+        return cls(rtt_targets=rtt_targets, throughput_target=throughput_target)
+
+
+@dataclass(frozen=True)
+class ProbeCandidate:
+    """計測対象のアダプター."""
+
+    name: str
+    source_address: str | None
+    link_speed_bps: int = 0
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """アダプター1つ分の計測結果."""
+
+    name: str
+    link_speed_bps: int
+    rtt_ms: float | None = None
+    jitter_ms: float | None = None
+    throughput_bps: float | None = None
+    error: str | None = None
+
+    @property
+    def reachable(self) -> bool:
+        """計測先に到達できたかどうか."""
+        return self.rtt_ms is not None
+
+    def sort_key(self) -> tuple[int, float, float, float, int]:
+        """ランキング用のキー（小さいほど良い）."""
+        return (
+            0 if self.reachable else 1,
+            -(self.throughput_bps or 0.0),
+            self.rtt_ms if self.rtt_ms is not None else math.inf,
+            self.jitter_ms if self.jitter_ms is not None else math.inf,
+            -self.link_speed_bps,
+        )
+
+
+def _jitter(rtts: list[float]) -> float:
+    """同じ計測先への連続した計測値の差の平均（ミリ秒）."""
+    return statistics.fmean(abs(b - a) for a, b in zip(rtts, rtts[1:], strict=False))
+
+
+def rank_results(results: list[ProbeResult]) -> list[ProbeResult]:
+    """計測結果を良い順に並べる.
+
+    到達可能なものを優先し、スループット（高い順）、RTT（低い順）、
+    ジッター（低い順）、リンク速度（高い順）の順で比較する.
+    """
+    return sorted(results, key=ProbeResult.sort_key)
+
+
+class LinkProber:
+    """アダプターのアドレスにバインドしたソケットでリンク品質を計測するクラス."""
+
+    def __init__(self, config: ProbeConfig | None = None) -> None:
+        """計測器を初期化."""
+        self.config = config or ProbeConfig()
+
+    def probe(self, candidates: list[ProbeCandidate]) -> list[ProbeResult]:
+        """全候補を並行に計測し、良い順に並べた結果を返す."""
+        if not candidates:
+            return []
+
+        with ThreadPoolExecutor(
+            max_workers=len(candidates), thread_name_prefix="link-probe"
+        ) as executor:
+            results = list(executor.map(self.probe_one, candidates))
+
+        ranked = rank_results(results)
+        for result in ranked:
+            logger.info(
+                f"リンク品質 '{result.name}': rtt={result.rtt_ms}ms "
+                f"jitter={result.jitter_ms}ms throughput={result.throughput_bps}bps "
+                f"link={result.link_speed_bps}bps error={result.error}"
+            )
+        return ranked
+
+    def probe_one(self, candidate: ProbeCandidate) -> ProbeResult:
+        """候補1つを計測."""
+        if candidate.source_address is None:
+            return ProbeResult(
+                name=candidate.name,
+                link_speed_bps=candidate.link_speed_bps,
+                error="IPアドレスが割り当てられていません",
+            )
+
+        per_target = [
+            rtts for rtts in self._measure_rtts(candidate.source_address) if rtts
+        ]
+        if not per_target:
+            return ProbeResult(
+                name=candidate.name,
+                link_speed_bps=candidate.link_speed_bps,
+                error="計測先に接続できません",
+            )
+
+        # 計測先ごとに求めてから平均する（計測先どうしのRTTの差をジッターに含めない）
+        rtt = statistics.fmean(statistics.median(rtts) for rtts in per_target)
+        jitters = [_jitter(rtts) for rtts in per_target if len(rtts) > 1]
+        jitter = statistics.fmean(jitters) if jitters else 0.0
+
+        throughput: float | None = None
+        error: str | None = None
+        if self.config.throughput_target is not None:
+            try:
+                throughput = self._measure_throughput(
+                    candidate.source_address, self.config.throughput_target
+                )
+            except OSError as e:
+                error = f"スループット計測に失敗: {e}"
+
+        return ProbeResult(
+            name=candidate.name,
+            link_speed_bps=candidate.link_speed_bps,
+            rtt_ms=rtt,
+            jitter_ms=jitter,
+            throughput_bps=throughput,
+            error=error,
+        )
+
+    def _connect(self, source_address: str, target: ProbeTarget) -> socket.socket:
+        """送信元アドレスにバインドしたTCP接続を作成."""
+        return socket.create_connection(
+            (target.host, target.port),
+            timeout=self.config.connect_timeout,
+            source_address=(source_address, 0),
+        )
+
+    def _measure_rtts(self, source_address: str) -> list[list[float]]:
+        """TCP接続時間をRTTとして計測先ごとに計測（ミリ秒、rtt_targetsの順）."""
+        rtts: list[list[float]] = [[] for _ in self.config.rtt_targets]
+        for _ in range(self.config.rtt_samples):
+            for target, samples in zip(self.config.rtt_targets, rtts, strict=True):
+                start = time.perf_counter()
+                try:
+                    sock = self._connect(source_address, target)
+                except OSError as e:
+                    logger.debug(f"RTT計測失敗 {source_address}->{target.host}: {e}")
+                    continue
+                samples.append((time.perf_counter() - start) * 1000)
+                sock.close()
+        return rtts
+
+    def _measure_throughput(self, source_address: str, target: ProbeTarget) -> float:
+        """一定時間受信してスループットを計測（bps）."""
+        deadline = time.perf_counter() + self.config.throughput_duration
+        received = 0
+        with self._connect(source_address, target) as sock:
+            if target.request:
+                sock.sendall(target.request)
+            start = time.perf_counter()
+            while received < self.config.throughput_max_bytes:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                sock.settimeout(remaining)
+                try:
+                    chunk = sock.recv(65536)
+                except TimeoutError:
+                    break
+                if not chunk:
+                    break
+                received += len(chunk)
+            elapsed = max(time.perf_counter() - start, 1e-6)
+        return received * 8 / elapsed
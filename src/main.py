@@ -1,6 +1,9 @@
 """ネットワークアダプター切り替えアプリケーションのメインエントリーポイント."""
 
+import argparse
 import logging
+import os
+import queue
 import sys
 import tkinter as tk
 from pathlib import Path
@@ -18,9 +21,40 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析."""
+    parser = argparse.ArgumentParser(description="ネットワークアダプター切り替えツール")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="CPU・メモリのプロファイリングを有効化（環境変数 NAS_PROFILE=1 と同じ）",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help="プロファイルレポートの出力先ディレクトリ",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Prometheus形式のメトリクスを 127.0.0.1 のこのポートで公開"
+        "（環境変数 NAS_METRICS_PORT と同じ）",
+    )
+    parser.add_argument(
+        "--switch",
+        choices=("ethernet", "wifi"),
+        default=None,
+        help="起動後にこのアダプターへ切り替え（起動中ならそのウィンドウで切り替え）",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
     """アプリケーションのメイン処理."""
     try:
+        args = parse_args(argv)
         logger.info("アプリケーション起動")
 
         # srcディレクトリをパスに追加
@@ -28,11 +62,79 @@ def main() -> None:
         if str(src_path) not in sys.path:
             sys.path.insert(0, str(src_path))
 
+        from src.single_instance import (
+            InstanceCommand,
+            SingleInstance,
+            SingleInstanceError,
+        )
+
+        command = {
+            "ethernet": InstanceCommand.SWITCH_ETHERNET,
+            "wifi": InstanceCommand.SWITCH_WIFI,
+        }.get(args.switch, InstanceCommand.SHOW)
+
+        # すでに起動中なら要求を渡して終了（GUIもPowerShellも起動しない）
+        instance: SingleInstance | None = None
+        candidate = SingleInstance()
+        try:
+            primary = candidate.acquire()
+            instance = candidate
+        except OSError as e:
+            logger.warning(f"多重起動の確認ができません: {e}")
+            primary = True
+        if instance is not None and not primary:
+            try:
+                instance.forward(command)
+            except SingleInstanceError as e:
+                logger.error(str(e))
+                sys.exit(1)
+            logger.info(f"起動中のインスタンスに要求を送りました: {command.value}")
+            return
+
+        from src.app_paths import state_dir
         from src.gui import NetworkAdapterGUI
+        from src.metrics import MetricsServer, metrics_port_from_env
+        from src.profiling import PROFILE_DIR_ENV_VAR, Profiler, profiling_requested
+
+        profiler = None
+        if args.profile or profiling_requested():
+            profile_dir = args.profile_dir or Path(
+                os.environ.get(PROFILE_DIR_ENV_VAR) or state_dir() / "profiles"
+            )
+            profiler = Profiler(profile_dir)
+            profiler.start()
+
+        metrics_port = args.metrics_port
+        if metrics_port is None:
+            metrics_port = metrics_port_from_env()
+
+        commands: queue.SimpleQueue[InstanceCommand] = (
+            instance.commands if instance is not None else queue.SimpleQueue()
+        )
+        if command != InstanceCommand.SHOW:
+            commands.put(command)
 
-        root = tk.Tk()
-        app = NetworkAdapterGUI(root)
-        app.run()
+        metrics_server = None
+        try:
+            root = tk.Tk()
+            app = NetworkAdapterGUI(root, profiler=profiler, commands=commands)
+            if metrics_port is not None:
+                try:
+                    metrics_server = MetricsServer(
+                        app.network_manager.metrics.registry, port=metrics_port
+                    )
+                    metrics_server.start()
+                except OSError as e:
+                    logger.warning(f"メトリクスの公開を開始できません: {e}")
+            app.run()
+        finally:
+            if metrics_server is not None:
+                metrics_server.stop()
+            if instance is not None:
+                instance.close()
+            if profiler is not None:
+                profiler.write_report()
+                profiler.stop()
 
         logger.info("アプリケーション終了")
 
@@ -0,0 +1,517 @@
+"""Prometheusテキスト形式のメトリクスとエクスポーター.
+
+メトリクスは常にプロセス内で更新し、--metrics-port または環境変数
+NAS_METRICS_PORT を指定した場合のみローカルホストのHTTPで公開する.
+"""
+
+import logging
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from src.models.models import AdapterStatus, NetworkAdapter
+from src.powershell import BreakerState, PowerShellRunner
+
+logger = logging.getLogger(__name__)
+
+METRICS_PORT_ENV_VAR = "NAS_METRICS_PORT"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# PowerShell操作の所要時間に合わせたヒストグラムの既定の境界（秒）
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = tuple[str, ...]
+Sample = tuple[str, dict[str, str], float]
+
+
+def metrics_port_from_env() -> int | None:
+    """環境変数で指定されたメトリクス公開ポート（未指定・不正ならNone）."""
+    value = os.environ.get(METRICS_PORT_ENV_VAR, "").strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"{METRICS_PORT_ENV_VAR} の値が不正です: {value}")
+        return None
+
+
+def _escape(value: str) -> str:
+    """ラベル値をエスケープ."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """数値をPrometheusの表記に変換."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _format_sample(name: str, labels: dict[str, str], value: float) -> str:
+    """1行分のサンプルを整形."""
+    if labels:
+        pairs = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+        return f"{name}{{{pairs}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class _Value:
+    """ラベルの組み合わせ1つ分の値（子ごとのロックで競合を抑える）."""
+
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """値を増やす."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """値を減らす."""
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        """値を設定."""
+        with self._lock:
+            self._value = value
+
+    def get(self) -> float:
+        """現在の値."""
+        with self._lock:
+            return self._value
+
+
+class _HistogramValue:
+    """ラベルの組み合わせ1つ分のヒストグラム."""
+
+    __slots__ = ("_lock", "_bounds", "_counts", "_sum", "_count")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self._lock = threading.Lock()
+        self._bounds = tuple(bounds)
+        self._counts = [0] * len(self._bounds)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        """観測値を追加."""
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for i, bound in enumerate(self._bounds):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        """累積バケット数・合計・件数."""
+        with self._lock:
+            cumulative: list[int] = []
+            total = 0
+            for count in self._counts:
+                total += count
+                cumulative.append(total)
+            return cumulative, self._sum, self._count
+
+
+class _Metric(ABC):
+    """ラベル付きメトリクスの基底クラス."""
+
+    type_name = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[LabelValues, Any] = {}
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        """ラベルをlabelnamesの順の値の組に変換."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels must be {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _child(self, labels: dict[str, str]) -> Any:
+        """ラベルの組み合わせに対応する子を取得（なければ作成）."""
+        key = self._key(labels)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        """ラベルの組み合わせごとの値を作成."""
+
+    def clear(self) -> None:
+        """すべてのラベルの組み合わせを削除."""
+        with self._lock:
+            self._children = {}
+
+    def _items(self) -> list[tuple[dict[str, str], Any]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [
+            (dict(zip(self.labelnames, key, strict=True)), child)
+            for key, child in items
+        ]
+
+    def samples(self) -> list[Sample]:
+        """出力するサンプルの一覧."""
+        return [(self.name, labels, child.get()) for labels, child in self._items()]
+
+
+class Counter(_Metric):
+    """単調増加するカウンター."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """カウンターを増やす."""
+        if amount < 0:
+            raise ValueError("counter can only increase")
+        self._child(labels).inc(amount)
+
+    def value(self, **labels: str) -> float:
+        """現在の値."""
+        return float(self._child(labels).get())
+
+
+class Gauge(_Metric):
+    """増減する値."""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def set(self, value: float, **labels: str) -> None:
+        """値を設定."""
+        self._child(labels).set(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """値を増やす."""
+        self._child(labels).inc(amount)
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """値を減らす."""
+        self._child(labels).dec(amount)
+
+    def replace(self, values: Iterable[tuple[dict[str, str], float]]) -> None:
+        """すべてのラベルの組み合わせを一度に置き換える.
+
+        新しい組み合わせを作ってから差し替えるため、途中の状態は出力されない.
+        """
+        children: dict[LabelValues, Any] = {}
+        for labels, value in values:
+            child = children[self._key(labels)] = self._new_child()
+            child.set(value)
+        with self._lock:
+            self._children = children
+
+    def value(self, **labels: str) -> float:
+        """現在の値."""
+        return float(self._child(labels).get())
+
+
+class Histogram(_Metric):
+    """観測値の分布."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float, **labels: str) -> None:
+        """観測値を追加."""
+        self._child(labels).observe(value)
+
+    def count(self, **labels: str) -> int:
+        """観測件数."""
+        return int(self._child(labels).snapshot()[2])
+
+    def samples(self) -> list[Sample]:
+        """バケット・合計・件数のサンプル."""
+        samples: list[Sample] = []
+        for labels, child in self._items():
+            cumulative, total, count = child.snapshot()
+            for bound, bucket_count in zip(self.buckets, cumulative, strict=True):
+                le = {**labels, "le": _format_value(bound)}
+                samples.append((f"{self.name}_bucket", le, bucket_count))
+            inf = {**labels, "le": "+Inf"}
+            samples.append((f"{self.name}_bucket", inf, count))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class CallbackMetric:
+    """収集時に関数から値を読み取るメトリクス."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type_name: str,
+        callback: Callable[[], Iterable[tuple[dict[str, str], float]]],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.type_name = type_name
+        self.callback = callback
+
+    def samples(self) -> list[Sample]:
+        """関数から読み取ったサンプル."""
+        return [(self.name, labels, value) for labels, value in self.callback()]
+
+
+MetricLike = _Metric | CallbackMetric
+
+
+class MetricsRegistry:
+    """メトリクスを登録し、Prometheusテキスト形式で出力するクラス."""
+
+    def __init__(self) -> None:
+        """レジストリを初期化."""
+        self._lock = threading.Lock()
+        self._metrics: dict[str, MetricLike] = {}
+
+    def register(self, metric: MetricLike) -> None:
+        """メトリクスを登録."""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """カウンターを作成して登録."""
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """ゲージを作成して登録."""
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """ヒストグラムを作成して登録."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        """全メトリクスをPrometheusテキスト形式で出力."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(_format_sample(name, labels, value))
+        return "\n".join(lines) + "\n"
+
+
+class NetworkMetrics:
+    """ネットワークマネージャーが更新するメトリクス一式."""
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        """メトリクスを作成してレジストリに登録."""
+        self.registry = registry or MetricsRegistry()
+        self.adapter_up = self.registry.gauge(
+            "nas_adapter_up",
+            "Whether the adapter is up (1) or not (0).",
+            ("name", "type"),
+        )
+        self.adapter_link_speed = self.registry.gauge(
+            "nas_adapter_link_speed_bits_per_second",
+            "Reported link speed of the adapter.",
+            ("name", "type"),
+        )
+        self.switches = self.registry.counter(
+            "nas_switches_total",
+            "Adapter switch attempts by target and outcome.",
+            ("target", "outcome"),
+        )
+        self.operation_duration = self.registry.histogram(
+            "nas_operation_duration_seconds",
+            "Latency of NetworkManager operations.",
+            ("operation",),
+        )
+        self.operation_errors = self.registry.counter(
+            "nas_operation_errors_total",
+            "NetworkManager operations that raised an error.",
+            ("operation",),
+        )
+        self.mutations = self.registry.counter(
+            "nas_mutations_total",
+            "Queued adapter changes by action and outcome.",
+            ("action", "outcome"),
+        )
+        self._runner: PowerShellRunner | None = None
+
+    def bind_runner(self, runner: PowerShellRunner) -> None:
+        """ランナーのプロセス起動数などを収集時に読み取るよう登録."""
+        if self._runner is not None:
+            raise ValueError("runner is already bound")
+        self._runner = runner
+        self.registry.register(
+            CallbackMetric(
+                "nas_powershell_spawns_total",
+                "PowerShell processes spawned.",
+                "counter",
+                lambda: [({}, float(runner.spawn_count))],
+            )
+        )
+        self.registry.register(
+            CallbackMetric(
+                "nas_powershell_timeouts_total",
+                "PowerShell processes killed after exceeding their deadline.",
+                "counter",
+                lambda: [({}, float(runner.timeout_count))],
+            )
+        )
+        self.registry.register(
+            CallbackMetric(
+                "nas_circuit_breaker_state",
+                "Current circuit breaker state (1 for the active state).",
+                "gauge",
+                lambda: [
+                    ({"state": state.value}, float(runner.breaker.state == state))
+                    for state in BreakerState
+                ],
+            )
+        )
+
+    def record_adapters(self, adapters: list[NetworkAdapter]) -> None:
+        """問い合わせたアダプター一覧で状態ゲージを置き換える."""
+        labeled = [
+            ({"name": adapter.name, "type": adapter.adapter_type.value}, adapter)
+            for adapter in adapters
+        ]
+        self.adapter_up.replace(
+            (labels, float(adapter.status == AdapterStatus.UP))
+            for labels, adapter in labeled
+        )
+        self.adapter_link_speed.replace(
+            (labels, float(adapter.link_speed_bps)) for labels, adapter in labeled
+        )
+
+    def observe_operation(self, operation: str, seconds: float, failed: bool) -> None:
+        """操作の所要時間と失敗を記録."""
+        self.operation_duration.observe(seconds, operation=operation)
+        if failed:
+            self.operation_errors.inc(operation=operation)
+
+    def record_switch(self, target: str, outcome: str) -> None:
+        """切り替えの結果を記録."""
+        self.switches.inc(target=target, outcome=outcome)
+
+    def record_mutation(self, action: str, outcome: str) -> None:
+        """変更キューでの処理結果（executed/merged/superseded/error）を記録."""
+        self.mutations.inc(action=action, outcome=outcome)
+
+
+class MetricsServer:
+    """ローカルホストでメトリクスを提供するHTTPサーバー.
+
+    専用のデーモンスレッドで動作するため、Tkのメインループを妨げない.
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464
+    ) -> None:
+        """サーバーを初期化（port=0で空きポートを使用）."""
+        self.registry = registry
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """待ち受けアドレスとポート."""
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> None:
+        """バックグラウンドで待ち受けを開始."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        host, port = self.address
+        logger.info(f"メトリクスを公開しました: http://{host}:{port}/metrics")
+
+    def stop(self) -> None:
+        """待ち受けを停止."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._server.server_close()
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(f"metrics: {format % args}")
+
+        return Handler
@@ -1,5 +1,35 @@
 """型定義パッケージ."""
 
-from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+from src.models.models import (
+    MEDIA_TYPE_ETHERNET,
+    MEDIA_TYPE_WIFI,
+    AdapterDetails,
+    AdapterQuery,
+    AdapterStatus,
+    AdapterType,
+    InterfaceMetric,
+    NetworkAdapter,
+    SwitchMode,
+)
+from src.models.shared_state import (
+    DEFAULT_SEGMENT_NAME,
+    AdapterStateReader,
+    AdapterStateSnapshot,
+    SharedStateError,
+)
 
-__all__ = ["AdapterStatus", "AdapterType", "NetworkAdapter"]
+__all__ = [
+    "DEFAULT_SEGMENT_NAME",
+    "MEDIA_TYPE_ETHERNET",
+    "MEDIA_TYPE_WIFI",
+    "AdapterDetails",
+    "AdapterQuery",
+    "AdapterStateReader",
+    "AdapterStateSnapshot",
+    "AdapterStatus",
+    "AdapterType",
+    "InterfaceMetric",
+    "NetworkAdapter",
+    "SharedStateError",
+    "SwitchMode",
+]
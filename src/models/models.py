@@ -1,6 +1,7 @@
 """ネットワークアダプター関連の型定義."""
 
 from dataclasses import dataclass
+from dataclasses import fields as dataclass_fields
 from enum import Enum
 
 
@@ -21,6 +22,23 @@ class AdapterType(Enum):
     UNKNOWN = "Unknown"
 
 
+class SwitchMode(Enum):
+    """アダプターの切り替え方式."""
+
+    DISABLE = "disable"  # 切り替え先以外のアダプターを無効化
+    METRIC = "metric"  # 両方を有効のままインターフェースメトリックで優先度を変更
+
+
+@dataclass(frozen=True)
+class InterfaceMetric:
+    """IPインターフェースのメトリック設定."""
+
+    interface_alias: str
+    address_family: str
+    metric: int
+    automatic: bool
+
+
 @dataclass(frozen=True)
 class NetworkAdapter:
     """ネットワークアダプター情報."""
@@ -29,6 +47,7 @@ class NetworkAdapter:
     interface_description: str
     status: AdapterStatus
     adapter_type: AdapterType
+    link_speed_bps: int = 0
 
     def is_enabled(self) -> bool:
         """アダプターが有効かどうかを返す."""
@@ -41,3 +60,45 @@ class NetworkAdapter:
     def is_wifi(self) -> bool:
         """Wi-Fiアダプターかどうかを返す."""
         return self.adapter_type == AdapterType.WIFI
+
+
+@dataclass(frozen=True)
+class AdapterDetails:
+    """アダプターの詳細情報（詳細表示を開いたときに取得）."""
+
+    name: str
+    mac_address: str = ""
+    link_speed_bps: int = 0
+    ipv4_addresses: tuple[str, ...] = ()
+    ipv6_addresses: tuple[str, ...] = ()
+    gateways: tuple[str, ...] = ()
+    dns_servers: tuple[str, ...] = ()
+
+
+# Get-NetAdapterのMediaTypeの値
+MEDIA_TYPE_ETHERNET = "802.3"
+MEDIA_TYPE_WIFI = "Native 802.11"
+
+
+@dataclass(frozen=True)
+class AdapterQuery:
+    """PowerShell側で絞り込むアダプター一覧の問い合わせ条件.
+
+    fieldsはNetworkAdapterの属性名で指定し、省略時はすべて取得する.
+    取得しなかった属性は既定値（空文字・UNKNOWN・0）になる.
+    """
+
+    physical_only: bool = False
+    media_types: tuple[str, ...] = ()
+    statuses: tuple[AdapterStatus, ...] = ()
+    name_pattern: str | None = None  # PowerShellのワイルドカード（-like）
+    fields: tuple[str, ...] | None = None
+
+    def __post_init__(self) -> None:
+        """取得する属性名を検証."""
+        if self.fields is None:
+            return
+        known = {f.name for f in dataclass_fields(NetworkAdapter)}
+        unknown = [name for name in self.fields if name not in known]
+        if unknown:
+            raise ValueError(f"NetworkAdapterにない属性です: {', '.join(unknown)}")
@@ -0,0 +1,274 @@
+"""共有メモリ上のアダプター状態スナップショット.
+
+1つのプロセス（GUI）が最新のアダプター一覧を固定レイアウトの共有メモリに書き込み、
+他のプロセスはPowerShellもプロセス間通信も使わずに読み取る.
+書き込み中の読み取りはシーケンスロック（奇数=書き込み中）で検出して読み直す.
+
+レイアウト（リトルエンディアン）:
+    ヘッダー（32バイト）: マジック "NASS"、バージョン、予約、シーケンス番号、
+        公開時刻（UNIX時刻）、アダプター数、予約
+    エントリー（272バイト × MAX_ADAPTERS）: 名前（UTF-8 128バイト）、
+        説明（UTF-8 128バイト）、状態コード、種類コード、予約、リンク速度（bps）
+"""
+
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from types import TracebackType
+
+from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+
+DEFAULT_SEGMENT_NAME = "nas_adapter_state"
+MAX_ADAPTERS = 32
+LAYOUT_VERSION = 1
+
+_MAGIC = b"NASS"
+_HEADER = struct.Struct("<4sHHQdII")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 8
+_ENTRY = struct.Struct("<128s128sBB6xQ")
+SEGMENT_SIZE = _HEADER.size + _ENTRY.size * MAX_ADAPTERS
+
+# レイアウトを固定するため、列挙値は定義順ではなくこの並びの位置で保存する
+_STATUS_CODES = (
+    AdapterStatus.UNKNOWN,
+    AdapterStatus.UP,
+    AdapterStatus.DISABLED,
+    AdapterStatus.DISCONNECTED,
+)
+_TYPE_CODES = (AdapterType.UNKNOWN, AdapterType.ETHERNET, AdapterType.WIFI)
+
+
+class SharedStateError(Exception):
+    """共有メモリのアダプター状態のエラー."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class AdapterStateSnapshot:
+    """読み取ったアダプター状態."""
+
+    sequence: int
+    published_at: float
+    adapters: tuple[NetworkAdapter, ...]
+
+
+def _encode(text: str, size: int) -> bytes:
+    """文字列をUTF-8で固定長に切り詰める（文字の途中では切らない）."""
+    data = text.encode("utf-8")
+    if len(data) <= size:
+        return data
+    return data[:size].decode("utf-8", errors="ignore").encode("utf-8")
+
+
+def _decode(data: bytes) -> str:
+    """固定長のUTF-8を文字列に戻す."""
+    return data.rstrip(b"\0").decode("utf-8", errors="replace")
+
+
+def _untrack(segment: shared_memory.SharedMemory) -> None:
+    """resource_trackerの管理から外す（終了時に勝手に削除されないようにする）."""
+    if sys.platform != "win32":
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(
+            segment._name, "shared_memory"  # type: ignore[attr-defined]
+        )
+
+
+def _retrack(segment: shared_memory.SharedMemory) -> None:
+    """_untrack()で外した登録を戻す（unlink()が行う登録解除と対にする）."""
+    if sys.platform != "win32":
+        from multiprocessing import resource_tracker
+
+        resource_tracker.register(
+            segment._name, "shared_memory"  # type: ignore[attr-defined]
+        )
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """既存の共有メモリに接続（読み取り側の終了時に削除されないようにする）."""
+    try:
+        return shared_memory.SharedMemory(
+            name=name, track=False  # type: ignore[call-arg]
+        )
+    except TypeError:
+        # Python 3.12以前はtrack引数がなく、POSIXでは接続しただけで
+        # 終了時にresource_trackerが共有メモリを削除してしまう
+        segment = shared_memory.SharedMemory(name=name)
+        _untrack(segment)
+        return segment
+
+
+class AdapterStatePublisher:
+    """アダプター一覧を共有メモリに書き込むクラス（1プロセスのみ）."""
+
+    def __init__(self, name: str = DEFAULT_SEGMENT_NAME) -> None:
+        """共有メモリを作成（前回の異常終了で残っていれば再利用）.
+
+        Raises:
+            SharedStateError: 既存の共有メモリの大きさが足りない場合
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        try:
+            self._segment = shared_memory.SharedMemory(
+                name=name, create=True, size=SEGMENT_SIZE
+            )
+        except FileExistsError:
+            self._segment = shared_memory.SharedMemory(name=name)
+            if self._segment.size < SEGMENT_SIZE:
+                self._segment.close()
+                _untrack(self._segment)
+                raise SharedStateError(
+                    f"共有メモリ '{name}' の大きさが不足しています"
+                ) from None
+        # 削除はclose()で行う. 同じプロセス内の読み取り側の登録解除と
+        # 衝突しないよう、作成・接続時の登録も外しておく
+        _untrack(self._segment)
+
+        buf = self._segment.buf
+        assert buf is not None
+        self._buf: memoryview = buf
+
+        # 書き込み中（奇数）のまま残っていた場合に備え、偶数から始める
+        sequence: int = _SEQUENCE.unpack_from(self._buf, _SEQUENCE_OFFSET)[0]
+        self._sequence = sequence + (sequence & 1)
+        self._begin_write()
+        self._end_write(0.0, 0)
+
+    def publish(self, adapters: list[NetworkAdapter]) -> int:
+        """アダプター一覧を書き込み、新しいシーケンス番号を返す.
+
+        MAX_ADAPTERSを超えた分は書き込まない.
+        """
+        adapters = adapters[:MAX_ADAPTERS]
+        with self._lock:
+            self._begin_write()
+            for i, adapter in enumerate(adapters):
+                _ENTRY.pack_into(
+                    self._buf,
+                    _HEADER.size + i * _ENTRY.size,
+                    _encode(adapter.name, 128),
+                    _encode(adapter.interface_description, 128),
+                    _STATUS_CODES.index(adapter.status),
+                    _TYPE_CODES.index(adapter.adapter_type),
+                    max(adapter.link_speed_bps, 0),
+                )
+            self._end_write(time.time(), len(adapters))
+            return self._sequence
+
+    def close(self, unlink: bool = True) -> None:
+        """共有メモリを閉じる（unlink=Trueなら削除）."""
+        self._segment.close()
+        # Windowsでは全てのハンドルが閉じられた時点で削除される
+        if unlink and sys.platform != "win32":
+            _retrack(self._segment)
+            try:
+                self._segment.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _begin_write(self) -> None:
+        """シーケンス番号を奇数にして書き込み中であることを示す."""
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._buf, _SEQUENCE_OFFSET, self._sequence)
+
+    def _end_write(self, published_at: float, count: int) -> None:
+        """ヘッダーを書き込み、最後にシーケンス番号を偶数に戻す."""
+        buf = self._buf
+        _HEADER.pack_into(
+            buf, 0, _MAGIC, LAYOUT_VERSION, 0, self._sequence, published_at, count, 0
+        )
+        self._sequence += 1
+        _SEQUENCE.pack_into(buf, _SEQUENCE_OFFSET, self._sequence)
+
+
+class AdapterStateReader:
+    """共有メモリからアダプター状態を読み取るクラス."""
+
+    def __init__(self, name: str = DEFAULT_SEGMENT_NAME) -> None:
+        """共有メモリに接続.
+
+        Raises:
+            SharedStateError: 公開中のプロセスがない・レイアウトが異なる場合
+        """
+        try:
+            self._segment = _attach(name)
+        except FileNotFoundError as e:
+            raise SharedStateError(f"共有メモリ '{name}' が見つかりません") from e
+
+        buf = self._segment.buf
+        assert buf is not None
+        self._buf: memoryview = buf
+
+        magic, version = _HEADER.unpack_from(self._buf, 0)[:2]
+        if magic != _MAGIC or version != LAYOUT_VERSION:
+            self._segment.close()
+            raise SharedStateError(f"共有メモリ '{name}' のレイアウトが異なります")
+
+    def __enter__(self) -> "AdapterStateReader":
+        """コンテキストマネージャーとして使用."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """接続を閉じる."""
+        self.close()
+
+    def close(self) -> None:
+        """接続を閉じる（共有メモリ自体は削除しない）."""
+        self._segment.close()
+
+    def read(self, max_attempts: int = 1000) -> AdapterStateSnapshot:
+        """一貫したスナップショットを読み取る.
+
+        書き込み中または読み取り中に書き換えられた場合は読み直す.
+
+        Raises:
+            SharedStateError: max_attempts回読み直しても一貫しない場合
+        """
+        buf = self._buf
+        for _ in range(max_attempts):
+            before = _SEQUENCE.unpack_from(buf, _SEQUENCE_OFFSET)[0]
+            if before & 1:
+                time.sleep(0)
+                continue
+
+            data = bytes(buf[:SEGMENT_SIZE])
+
+            after = _SEQUENCE.unpack_from(buf, _SEQUENCE_OFFSET)[0]
+            if before == after:
+                return self._parse(data)
+            time.sleep(0)
+
+        raise SharedStateError("一貫したスナップショットを読み取れませんでした")
+
+    @staticmethod
+    def _parse(data: bytes) -> AdapterStateSnapshot:
+        """コピーした共有メモリの内容を解析."""
+        _, _, _, _, published_at, count, _ = _HEADER.unpack_from(data, 0)
+        sequence = _SEQUENCE.unpack_from(data, _SEQUENCE_OFFSET)[0]
+        adapters = []
+        for i in range(min(count, MAX_ADAPTERS)):
+            name, description, status, adapter_type, link_speed = _ENTRY.unpack_from(
+                data, _HEADER.size + i * _ENTRY.size
+            )
+            adapters.append(
+                NetworkAdapter(
+                    name=_decode(name),
+                    interface_description=_decode(description),
+                    status=_STATUS_CODES[status],
+                    adapter_type=_TYPE_CODES[adapter_type],
+                    link_speed_bps=link_speed,
+                )
+            )
+        return AdapterStateSnapshot(sequence, published_at, tuple(adapters))
@@ -0,0 +1,117 @@
+"""アダプターの状態を変更する操作を直列化する変更キュー.
+
+変更は1つのワーカースレッドで順番に実行する.
+実行待ちの要求は対象（キー）ごとに1つにまとめ、
+同じ内容の要求は合流させ、異なる内容の要求は古いものを取り消す.
+"""
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import Enum
+
+
+class MutationOutcome(Enum):
+    """要求の処理結果."""
+
+    EXECUTED = "executed"
+    MERGED = "merged"
+    SUPERSEDED = "superseded"
+
+
+@dataclass
+class _Request:
+    """実行待ちの要求1件（合流した要求のFutureも保持）."""
+
+    action: str
+    fn: Callable[[], object]
+    future: "Future[MutationOutcome]"
+    merged: "list[Future[MutationOutcome]]" = field(default_factory=list)
+
+
+class MutationQueue:
+    """変更操作を1つずつ実行し、実行待ちの要求を最小の差分にまとめるクラス.
+
+    実行待ちの要求と同じキーの要求が来た場合:
+    - 操作が同じなら合流し、実行結果を共有する（MERGED）
+    - 操作が異なれば古い要求を実行せずに取り消す（SUPERSEDED）
+    ワーカースレッドは要求がある間だけ動作する.
+    """
+
+    def __init__(self) -> None:
+        """キューを初期化."""
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, _Request] = {}
+        self._worker: threading.Thread | None = None
+        self._worker_ident: int | None = None
+
+    @property
+    def pending_count(self) -> int:
+        """実行待ちの要求数."""
+        with self._lock:
+            return len(self._pending)
+
+    def submit(
+        self, key: Hashable, action: str, fn: Callable[[], object]
+    ) -> "Future[MutationOutcome]":
+        """変更を要求し、処理結果を返すFutureを返す.
+
+        実行時に例外が発生した場合、その例外はFutureに設定される.
+
+        Args:
+            key: 変更の対象（同じ対象への要求はまとめられる）
+            action: 変更の内容（同じ内容の要求は合流する）
+            fn: 変更を実行する関数
+        """
+        future: Future[MutationOutcome] = Future()
+        superseded: _Request | None = None
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None and pending.action == action:
+                pending.merged.append(future)
+                return future
+            if pending is not None:
+                superseded = self._pending.pop(key)
+            self._pending[key] = _Request(action, fn, future)
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="mutation-queue", daemon=True
+                )
+                self._worker.start()
+
+        if superseded is not None:
+            for waiter in [superseded.future, *superseded.merged]:
+                waiter.set_result(MutationOutcome.SUPERSEDED)
+        return future
+
+    def on_worker_thread(self) -> bool:
+        """呼び出し元がワーカースレッド（実行中の変更の内部）かどうか.
+
+        変更の内部から別の変更を要求すると自分自身を待つことになるため、
+        呼び出し側はこの場合その場で実行する.
+        """
+        return threading.get_ident() == self._worker_ident
+
+    def _run(self) -> None:
+        """実行待ちの要求を順に実行するワーカー."""
+        self._worker_ident = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    self._worker_ident = None
+                    return
+                key = next(iter(self._pending))
+                request = self._pending.pop(key)
+
+            try:
+                request.fn()
+            except BaseException as e:
+                for waiter in [request.future, *request.merged]:
+                    waiter.set_exception(e)
+            else:
+                request.future.set_result(MutationOutcome.EXECUTED)
+                for waiter in request.merged:
+                    waiter.set_result(MutationOutcome.MERGED)
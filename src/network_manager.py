@@ -1,17 +1,86 @@
 """ネットワークアダプター管理モジュール."""
 
 import ctypes
+import functools
 import json
 import logging
 import subprocess
-import sys
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Concatenate, ParamSpec, TypeVar, cast
 
-from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+from src.app_paths import state_dir
+from src.link_probe import LinkProber, ProbeCandidate, ProbeConfig, ProbeResult
+from src.metrics import NetworkMetrics
+from src.models.models import (
+    MEDIA_TYPE_ETHERNET,
+    MEDIA_TYPE_WIFI,
+    AdapterDetails,
+    AdapterQuery,
+    AdapterStatus,
+    AdapterType,
+    InterfaceMetric,
+    NetworkAdapter,
+    SwitchMode,
+)
+from src.models.shared_state import AdapterStatePublisher
+from src.mutation_queue import MutationOutcome, MutationQueue
+from src.powershell import (
+    CancellationToken,
+    OperationCancelledError,
+    PowerShellError,
+    PowerShellRunner,
+    PowerShellTimeoutError,
+)
+from src.reconciler import (
+    DesiredState,
+    Drift,
+    ReconcilePlan,
+    ReconcileReport,
+    ReconcileStep,
+    find_drift,
+    plan_reconcile,
+    switch_state,
+)
+from src.single_flight import SingleFlight, SingleFlightStats
+from src.wifi import AssociationResult, WifiConnector, WifiError
 
 logger = logging.getLogger(__name__)
 
-# Windows用のサブプロセスウィンドウ非表示フラグ
-CREATE_NO_WINDOW = 0x08000000 if sys.platform == "win32" else 0
+# メトリック方式で優先するアダプターと、もう一方に設定するインターフェースメトリック
+PREFERRED_METRIC = 5
+DEPRIORITIZED_METRIC = 500
+
+# 変更前のメトリックを保存するファイル名
+METRIC_BACKUP_FILE = "original_metrics.json"
+
+# 前回の切り替えで検出したアダプター名を記憶するファイル名
+ADAPTER_NAMES_FILE = "adapter_names.json"
+
+# NetworkAdapterの属性とGet-NetAdapterのプロパティの対応
+_ADAPTER_PROPERTIES = {
+    "name": "Name",
+    "interface_description": "InterfaceDescription",
+    "status": "Status",
+    "adapter_type": "InterfaceDescription",  # 種類は説明から判定する
+    "link_speed_bps": "LinkSpeed",
+}
+
+# 切り替え対象の候補（物理的なイーサネットとWi-Fiのみ）
+SWITCH_CANDIDATES = AdapterQuery(
+    physical_only=True,
+    media_types=(MEDIA_TYPE_ETHERNET, MEDIA_TYPE_WIFI),
+    fields=("name", "interface_description", "status", "adapter_type"),
+)
+
+# ConvertTo-Jsonで数値になるAddressFamilyの値
+_ADDRESS_FAMILIES = {2: "IPv4", 23: "IPv6"}
+
+# 切り替え要求の変更キューでのキー（切り替え同士は後の要求が優先される）
+_SWITCH_KEY = "switch"
 
 
 class NetworkManagerError(Exception):
@@ -20,9 +89,127 @@ class NetworkManagerError(Exception):
     pass
 
 
+def _remaining(deadline: float | None) -> float | None:
+    """デッドラインまでの残り秒数を返す（未指定ならNone）."""
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def _switch_outcome(error: BaseException | None) -> str:
+    """切り替えの結果をメトリクスのラベル値に分類."""
+    if error is None:
+        return "success"
+    cause: BaseException | None = error
+    while cause is not None:
+        if isinstance(cause, OperationCancelledError):
+            return "cancelled"
+        if isinstance(cause, PowerShellTimeoutError):
+            return "timeout"
+        cause = cause.__cause__
+    return "error"
+
+
+def _mutation_outcome(future: "Future[MutationOutcome]") -> str:
+    """変更キューの処理結果をメトリクスのラベル値に変換."""
+    if future.exception() is not None:
+        return "error"
+    return future.result().value
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _measured(operation: str, switch_target: str | None = None) -> Callable[
+    [Callable[Concatenate["NetworkManager", P], R]],
+    Callable[Concatenate["NetworkManager", P], R],
+]:
+    """操作の所要時間（切り替えなら結果も）をメトリクスに記録するデコレーター."""
+
+    def decorator(
+        func: Callable[Concatenate["NetworkManager", P], R],
+    ) -> Callable[Concatenate["NetworkManager", P], R]:
+        @functools.wraps(func)
+        def wrapper(self: "NetworkManager", *args: P.args, **kwargs: P.kwargs) -> R:
+            error: BaseException | None = None
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                self.metrics.observe_operation(operation, elapsed, error is not None)
+                if switch_target is not None:
+                    self.metrics.record_switch(switch_target, _switch_outcome(error))
+
+        return cast(Callable[Concatenate["NetworkManager", P], R], wrapper)
+
+    return decorator
+
+
 class NetworkManager:
     """ネットワークアダプターを管理するクラス."""
 
+    def __init__(
+        self,
+        runner: PowerShellRunner | None = None,
+        refresh_min_interval: float = 0.0,
+        switch_mode: SwitchMode = SwitchMode.DISABLE,
+        state_path: Path | None = None,
+        metrics: NetworkMetrics | None = None,
+        wifi_connector: WifiConnector | None = None,
+        state_publisher: AdapterStatePublisher | None = None,
+    ) -> None:
+        """マネージャーを初期化.
+
+        Args:
+            runner: PowerShellの実行に使うランナー（省略時は既定値で生成）
+            refresh_min_interval: アダプター一覧の結果を再利用する秒数
+            switch_mode: 切り替え方式
+            state_path: 状態ファイルの保存先（省略時はマシンごとの既定の場所）
+            metrics: 更新するメトリクス（省略時は新しく生成）
+            wifi_connector: Wi-Fi切り替え後に優先SSIDへ接続する処理
+                （省略時は環境変数 WIFI_PREFERRED_SSIDS から生成）
+            state_publisher: 問い合わせたアダプター一覧を共有メモリに公開する場合に指定
+        """
+        self.runner = runner or PowerShellRunner()
+        self.metrics = metrics or NetworkMetrics()
+        self.metrics.bind_runner(self.runner)
+        # netshはPowerShellの起動回数・ブレーカーに含めないよう別のランナーで実行する
+        self.wifi_connector = wifi_connector or WifiConnector(PowerShellRunner())
+        self.mutations = MutationQueue()
+        self.state_publisher = state_publisher
+        self._details_lock = threading.Lock()
+        self._details_cache: dict[str, AdapterDetails] = {}
+        self.last_association: AssociationResult | None = None
+        self.last_reconcile: ReconcileReport | None = None
+        self.switch_mode = switch_mode
+        self.state_path = state_path or state_dir()
+        self._adapter_flight: SingleFlight[list[NetworkAdapter]] = SingleFlight(
+            min_interval=refresh_min_interval
+        )
+        self._candidate_flight: SingleFlight[list[NetworkAdapter]] = SingleFlight(
+            min_interval=refresh_min_interval
+        )
+
+    @property
+    def refresh_stats(self) -> SingleFlightStats:
+        """アダプター一覧の問い合わせの集計値（省略できた回数を含む）."""
+        return self._adapter_flight.stats
+
+    def _invalidate_adapter_state(self) -> None:
+        """アダプター一覧の直前の結果と詳細情報のキャッシュを破棄."""
+        self._adapter_flight.invalidate()
+        self._candidate_flight.invalidate()
+        self.invalidate_adapter_details()
+
+    def cancel_all(self) -> None:
+        """実行中のすべての操作をキャンセル."""
+        self.runner.cancel_all()
+
     @staticmethod
     def is_admin() -> bool:
         """管理者権限で実行されているかチェック."""
@@ -60,33 +247,70 @@ class NetworkManager:
             return AdapterStatus.DISCONNECTED
         return AdapterStatus.UNKNOWN
 
-    def get_adapters(self) -> list[NetworkAdapter]:
-        """全ネットワークアダプターの情報を取得."""
+    @staticmethod
+    def _parse_link_speed(link_speed: object) -> int:
+        """LinkSpeed（例: "1 Gbps", "866.7 Mbps"）をbps単位の整数に変換."""
+        if isinstance(link_speed, int | float):
+            return int(link_speed)
+        if not isinstance(link_speed, str):
+            return 0
+
+        parts = link_speed.strip().split()
+        if not parts:
+            return 0
+        try:
+            value = float(parts[0])
+        except ValueError:
+            return 0
+
+        unit = parts[1].lower() if len(parts) > 1 else "bps"
+        multipliers = {"bps": 1, "kbps": 10**3, "mbps": 10**6, "gbps": 10**9}
+        return int(value * multipliers.get(unit, 1))
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        """PowerShellの単一引用符文字列としてエスケープ."""
+        return "'" + value.replace("'", "''") + "'"
+
+    @_measured("get_adapters")
+    def get_adapters(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> list[NetworkAdapter]:
+        """全ネットワークアダプターの情報を取得.
+
+        同時に要求された場合は実行中の問い合わせに合流し、結果を共有する.
+
+        Args:
+            timeout: デッドライン（秒）. 省略時はランナーの既定値
+            cancel: 実行中にキャンセルするためのトークン
+        """
+        try:
+            adapters = self._adapter_flight.do(
+                lambda: self._query_adapters(timeout, cancel), wait_timeout=timeout
+            )
+        except TimeoutError as e:
+            logger.error(f"アダプター情報取得の待機がタイムアウト: {e}")
+            raise NetworkManagerError(f"アダプター情報取得エラー: {e}") from e
+        return list(adapters)
+
+    def _query_adapters(
+        self,
+        timeout: float | None,
+        cancel: CancellationToken | None,
+    ) -> list[NetworkAdapter]:
+        """PowerShellでアダプター一覧を問い合わせ."""
         try:
             # PowerShellコマンドでアダプター情報を取得
-            # UTF-8エンコーディングを明示的に設定
+            # UTF-8エンコーディングはランナーが設定する
             ps_command = (
-                "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; "
-                "$OutputEncoding = [System.Text.Encoding]::UTF8; "
                 "Get-NetAdapter | "
-                "Select-Object Name, InterfaceDescription, Status | "
+                "Select-Object Name, InterfaceDescription, Status, LinkSpeed | "
                 "ConvertTo-Json"
             )
-            cmd = [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                ps_command,
-            ]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                check=True,
-                creationflags=CREATE_NO_WINDOW,
-            )
+
+            result = self.runner.run(ps_command, timeout=timeout, cancel=cancel)
 
             if result.returncode != 0:
                 raise NetworkManagerError(
@@ -100,26 +324,16 @@ class NetworkManager:
             if isinstance(adapters_data, dict):
                 adapters_data = [adapters_data]
 
-            adapters: list[NetworkAdapter] = []
-            for data in adapters_data:
-                name = data.get("Name", "")
-                interface_desc = data.get("InterfaceDescription", "")
-                status_str = data.get("Status", "Unknown")
-
-                adapter_type = self._parse_adapter_type(interface_desc)
-                status = self._parse_status(status_str)
-
-                adapters.append(
-                    NetworkAdapter(
-                        name=name,
-                        interface_description=interface_desc,
-                        status=status,
-                        adapter_type=adapter_type,
-                    )
-                )
+            adapters = [self._parse_adapter(data) for data in adapters_data]
 
+            self.metrics.record_adapters(adapters)
+            if self.state_publisher is not None:
+                self.state_publisher.publish(adapters)
             return adapters
 
+        except PowerShellError as e:
+            logger.error(f"PowerShellコマンド実行エラー: {e}")
+            raise NetworkManagerError(f"アダプター情報取得エラー: {e}") from e
         except subprocess.CalledProcessError as e:
             logger.error(f"PowerShellコマンド実行エラー: {e}")
             raise NetworkManagerError(f"アダプター情報取得エラー: {e}") from e
@@ -130,126 +344,1020 @@ class NetworkManager:
             logger.error(f"予期しないエラー: {e}")
             raise NetworkManagerError(f"アダプター情報取得エラー: {e}") from e
 
-    def find_ethernet_adapter(self) -> NetworkAdapter | None:
-        """イーサネットアダプターを検索."""
-        adapters = self.get_adapters()
-        for adapter in adapters:
-            if adapter.is_ethernet():
-                return adapter
-        return None
+    @classmethod
+    def _parse_adapter(cls, data: dict[str, object]) -> NetworkAdapter:
+        """Get-NetAdapterの1件分のJSONをNetworkAdapterに変換."""
+        interface_desc = str(data.get("InterfaceDescription") or "")
+        return NetworkAdapter(
+            name=str(data.get("Name") or ""),
+            interface_description=interface_desc,
+            status=cls._parse_status(str(data.get("Status") or "Unknown")),
+            adapter_type=cls._parse_adapter_type(interface_desc),
+            link_speed_bps=cls._parse_link_speed(data.get("LinkSpeed")),
+        )
 
-    def find_wifi_adapter(self) -> NetworkAdapter | None:
-        """Wi-Fiアダプターを検索."""
-        adapters = self.get_adapters()
-        for adapter in adapters:
-            if adapter.is_wifi():
-                return adapter
-        return None
+    @_measured("query_adapters")
+    def query_adapters(
+        self,
+        query: AdapterQuery,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> list[NetworkAdapter]:
+        """条件に合うアダプターの指定した属性だけを取得.
+
+        絞り込みと属性の選択はPowerShellのパイプライン内で行い、
+        条件に合わないアダプターはJSONに変換しない.
+        状態での絞り込みはAdapterStatusの値（Up・Disabled・Disconnected）で比較する.
+        """
+        try:
+            result = self.runner.run(
+                self._adapter_query_script(query), timeout=timeout, cancel=cancel
+            )
+            data = json.loads(result.stdout) if result.stdout.strip() else []
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            logger.error(f"PowerShellコマンド実行エラー: {e}")
+            raise NetworkManagerError(f"アダプター情報取得エラー: {e}") from e
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON解析エラー: {e}")
+            raise NetworkManagerError(f"アダプター情報解析エラー: {e}") from e
+
+        if isinstance(data, dict):
+            data = [data]
+        return [self._parse_adapter(entry) for entry in data]
+
+    @classmethod
+    def _adapter_query_script(cls, query: AdapterQuery) -> str:
+        """問い合わせ条件からGet-NetAdapterのパイプラインを組み立てる."""
+        pipeline = "Get-NetAdapter"
+        if query.physical_only:
+            pipeline += " -Physical"
 
-    def enable_adapter(self, adapter_name: str) -> None:
-        """指定したアダプターを有効化."""
+        conditions = []
+        if query.media_types:
+            media_types = ", ".join(cls._quote(m) for m in query.media_types)
+            conditions.append(f"$_.MediaType -in @({media_types})")
+        if query.statuses:
+            statuses = ", ".join(cls._quote(s.value) for s in query.statuses)
+            conditions.append(f"$_.Status -in @({statuses})")
+        if query.name_pattern is not None:
+            conditions.append(f"$_.Name -like {cls._quote(query.name_pattern)}")
+        if conditions:
+            pipeline += " | Where-Object { " + " -and ".join(conditions) + " }"
+
+        fields = query.fields if query.fields is not None else _ADAPTER_PROPERTIES
+        properties = ["Name"]
+        for field in fields:
+            prop = _ADAPTER_PROPERTIES[field]
+            if prop not in properties:
+                properties.append(prop)
+        pipeline += " | Select-Object " + ", ".join(properties)
+
+        # 1件以下でも配列として出力する
+        return f"ConvertTo-Json -InputObject @({pipeline})"
+
+    def _switch_candidates(
+        self,
+        timeout: float | None,
+        cancel: CancellationToken | None,
+    ) -> list[NetworkAdapter]:
+        """切り替え対象の候補を取得（続けて呼ばれた場合は結果を共有）."""
+        try:
+            return self._candidate_flight.do(
+                lambda: self.query_adapters(SWITCH_CANDIDATES, timeout, cancel),
+                wait_timeout=timeout,
+            )
+        except TimeoutError as e:
+            logger.error(f"アダプター情報取得の待機がタイムアウト: {e}")
+            raise NetworkManagerError(f"アダプター情報取得エラー: {e}") from e
+
+    def find_switch_adapters(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> tuple[NetworkAdapter | None, NetworkAdapter | None]:
+        """切り替え対象のイーサネットとWi-Fiのアダプターを1回の問い合わせで検索.
+
+        物理アダプターだけを問い合わせるため、Hyper-VやVPNの仮想アダプターは含まない.
+        """
+        adapters = self._switch_candidates(timeout, cancel)
+        ethernet = next((a for a in adapters if a.is_ethernet()), None)
+        wifi = next((a for a in adapters if a.is_wifi()), None)
+        return ethernet, wifi
+
+    def find_ethernet_adapter(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> NetworkAdapter | None:
+        """イーサネットアダプターを検索（物理アダプターだけを問い合わせる）."""
+        return self.find_switch_adapters(timeout, cancel)[0]
+
+    def find_wifi_adapter(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> NetworkAdapter | None:
+        """Wi-Fiアダプターを検索（物理アダプターだけを問い合わせる）."""
+        return self.find_switch_adapters(timeout, cancel)[1]
+
+    def enable_adapter(
+        self,
+        adapter_name: str,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> None:
+        """指定したアダプターを有効化.
+
+        変更キューで他の変更と直列化し、完了まで待つ.
+        後から来た要求で取り消された場合は何もせずに戻る.
+        """
+        self._mutate(
+            ("adapter", adapter_name),
+            "enable",
+            lambda t: self._enable_adapter(adapter_name, t, cancel),
+            timeout,
+        ).result()
+
+    def submit_enable_adapter(
+        self,
+        adapter_name: str,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> "Future[MutationOutcome]":
+        """アダプターの有効化を変更キューに要求し、処理結果のFutureを返す."""
+        return self._mutate(
+            ("adapter", adapter_name),
+            "enable",
+            lambda t: self._enable_adapter(adapter_name, t, cancel),
+            timeout,
+        )
+
+    def disable_adapter(
+        self,
+        adapter_name: str,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> None:
+        """指定したアダプターを無効化.
+
+        変更キューで他の変更と直列化し、完了まで待つ.
+        後から来た要求で取り消された場合は何もせずに戻る.
+        """
+        self._mutate(
+            ("adapter", adapter_name),
+            "disable",
+            lambda t: self._disable_adapter(adapter_name, t, cancel),
+            timeout,
+        ).result()
+
+    def submit_disable_adapter(
+        self,
+        adapter_name: str,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> "Future[MutationOutcome]":
+        """アダプターの無効化を変更キューに要求し、処理結果のFutureを返す."""
+        return self._mutate(
+            ("adapter", adapter_name),
+            "disable",
+            lambda t: self._disable_adapter(adapter_name, t, cancel),
+            timeout,
+        )
+
+    def switch_to_ethernet(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> None:
+        """イーサネットに切り替え（Wi-Fi無効化、イーサネット有効化）.
+
+        すでに望ましい状態のアダプターには何もしない.
+        メトリック方式では両方を有効のままイーサネットを優先する.
+        変更キューで他の変更と直列化し、完了まで待つ.
+
+        Args:
+            timeout: 切り替え全体のデッドライン（秒、キューでの待ち時間を含む）
+            cancel: 実行中にキャンセルするためのトークン
+        """
+        self.submit_switch_to_ethernet(timeout=timeout, cancel=cancel).result()
+
+    def submit_switch_to_ethernet(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> "Future[MutationOutcome]":
+        """イーサネットへの切り替えを変更キューに要求し、処理結果のFutureを返す."""
+        return self._mutate(
+            _SWITCH_KEY,
+            "ethernet",
+            lambda t: self._switch_to_ethernet(t, cancel),
+            timeout,
+        )
+
+    def switch_to_wifi(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> None:
+        """Wi-Fiに切り替え（イーサネット無効化、Wi-Fi有効化）.
+
+        すでに望ましい状態のアダプターには何もしない.
+        メトリック方式では両方を有効のままWi-Fiを優先する.
+        優先SSIDが設定されていれば、有効化後にそのSSIDへ直接接続する.
+        変更キューで他の変更と直列化し、完了まで待つ.
+
+        Args:
+            timeout: 切り替え全体のデッドライン（秒、キューでの待ち時間を含む）
+            cancel: 実行中にキャンセルするためのトークン
+        """
+        self.submit_switch_to_wifi(timeout=timeout, cancel=cancel).result()
+
+    def submit_switch_to_wifi(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> "Future[MutationOutcome]":
+        """Wi-Fiへの切り替えを変更キューに要求し、処理結果のFutureを返す."""
+        return self._mutate(
+            _SWITCH_KEY,
+            "wifi",
+            lambda t: self._switch_to_wifi(t, cancel),
+            timeout,
+        )
+
+    def _mutate(
+        self,
+        key: Hashable,
+        action: str,
+        operation: Callable[[float | None], None],
+        timeout: float | None,
+    ) -> "Future[MutationOutcome]":
+        """変更を変更キューに要求（ワーカー上からの呼び出しはその場で実行）.
+
+        デッドラインは要求した時点から数える.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def run() -> None:
+            operation(_remaining(deadline))
+
+        if self.mutations.on_worker_thread():
+            future: Future[MutationOutcome] = Future()
+            try:
+                run()
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(MutationOutcome.EXECUTED)
+            return future
+
+        future = self.mutations.submit(key, action, run)
+        future.add_done_callback(
+            lambda f: self.metrics.record_mutation(action, _mutation_outcome(f))
+        )
+        return future
+
+    @_measured("enable_adapter")
+    def _enable_adapter(
+        self,
+        adapter_name: str,
+        timeout: float | None,
+        cancel: CancellationToken | None,
+    ) -> None:
+        """指定したアダプターを有効化（変更キューのワーカーで実行）."""
         if not self.is_admin():
             raise NetworkManagerError("管理者権限が必要です")
 
+        self._invalidate_adapter_state()
         try:
-            ps_command = (
-                "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; "
-                "$OutputEncoding = [System.Text.Encoding]::UTF8; "
-                f"Enable-NetAdapter -Name '{adapter_name}' -Confirm:$false"
-            )
-            cmd = [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                ps_command,
-            ]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                check=True,
-                creationflags=CREATE_NO_WINDOW,
-            )
+            ps_command = f"Enable-NetAdapter -Name '{adapter_name}' -Confirm:$false"
+
+            result = self.runner.run(ps_command, timeout=timeout, cancel=cancel)
 
             if result.returncode != 0:
                 raise NetworkManagerError(
                     f"アダプター '{adapter_name}' の有効化に失敗: {result.stderr}"
                 )
 
+            self._invalidate_adapter_state()
             logger.info(f"アダプター '{adapter_name}' を有効化しました")
 
+        except PowerShellError as e:
+            logger.error(f"アダプター有効化エラー: {e}")
+            raise NetworkManagerError(
+                f"アダプター '{adapter_name}' の有効化に失敗: {e}"
+            ) from e
         except subprocess.CalledProcessError as e:
             logger.error(f"アダプター有効化エラー: {e}")
             raise NetworkManagerError(
                 f"アダプター '{adapter_name}' の有効化に失敗: {e}"
             ) from e
 
-    def disable_adapter(self, adapter_name: str) -> None:
-        """指定したアダプターを無効化."""
+    @_measured("disable_adapter")
+    def _disable_adapter(
+        self,
+        adapter_name: str,
+        timeout: float | None,
+        cancel: CancellationToken | None,
+    ) -> None:
+        """指定したアダプターを無効化（変更キューのワーカーで実行）."""
         if not self.is_admin():
             raise NetworkManagerError("管理者権限が必要です")
 
+        self._invalidate_adapter_state()
         try:
-            ps_command = (
-                "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; "
-                "$OutputEncoding = [System.Text.Encoding]::UTF8; "
-                f"Disable-NetAdapter -Name '{adapter_name}' -Confirm:$false"
-            )
-            cmd = [
-                "powershell",
-                "-NoProfile",
-                "-Command",
-                ps_command,
-            ]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                check=True,
-                creationflags=CREATE_NO_WINDOW,
-            )
+            ps_command = f"Disable-NetAdapter -Name '{adapter_name}' -Confirm:$false"
+
+            result = self.runner.run(ps_command, timeout=timeout, cancel=cancel)
 
             if result.returncode != 0:
                 raise NetworkManagerError(
                     f"アダプター '{adapter_name}' の無効化に失敗: {result.stderr}"
                 )
 
+            self._invalidate_adapter_state()
             logger.info(f"アダプター '{adapter_name}' を無効化しました")
 
+        except PowerShellError as e:
+            logger.error(f"アダプター無効化エラー: {e}")
+            raise NetworkManagerError(
+                f"アダプター '{adapter_name}' の無効化に失敗: {e}"
+            ) from e
         except subprocess.CalledProcessError as e:
             logger.error(f"アダプター無効化エラー: {e}")
             raise NetworkManagerError(
                 f"アダプター '{adapter_name}' の無効化に失敗: {e}"
             ) from e
 
-    def switch_to_ethernet(self) -> None:
-        """イーサネットに切り替え（Wi-Fi無効化、イーサネット有効化）."""
-        ethernet = self.find_ethernet_adapter()
-        wifi = self.find_wifi_adapter()
+    @_measured("switch_to_ethernet", switch_target="ethernet")
+    def _switch_to_ethernet(
+        self,
+        timeout: float | None,
+        cancel: CancellationToken | None,
+    ) -> None:
+        """イーサネットへの切り替えを実行（変更キューのワーカーで実行）."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        logger.info("イーサネットに切り替えます")
+        self._switch(AdapterType.ETHERNET, deadline, cancel)
 
-        if ethernet is None:
-            raise NetworkManagerError("イーサネットアダプターが見つかりません")
-        if wifi is None:
-            raise NetworkManagerError("Wi-Fiアダプターが見つかりません")
+    @_measured("switch_to_wifi", switch_target="wifi")
+    def _switch_to_wifi(
+        self,
+        timeout: float | None,
+        cancel: CancellationToken | None,
+    ) -> None:
+        """Wi-Fiへの切り替えを実行（変更キューのワーカーで実行）."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        logger.info("Wi-Fiに切り替えます")
+        wifi = self._switch(AdapterType.WIFI, deadline, cancel)
+        self._connect_preferred_wifi(wifi.name, deadline, cancel)
 
-        logger.info("イーサネットに切り替えます")
-        self.disable_adapter(wifi.name)
-        self.enable_adapter(ethernet.name)
+    def _switch(
+        self,
+        target_type: AdapterType,
+        deadline: float | None,
+        cancel: CancellationToken | None,
+    ) -> NetworkAdapter:
+        """target_typeのアダプターに切り替え、切り替え先のアダプターを返す.
 
-    def switch_to_wifi(self) -> None:
-        """Wi-Fiに切り替え（イーサネット無効化、Wi-Fi有効化）."""
-        ethernet = self.find_ethernet_adapter()
-        wifi = self.find_wifi_adapter()
+        無効化方式で前回のアダプター名を記憶していれば、一覧を取得せずに切り替える.
+        記憶したアダプターが見つからない・変わっていた場合は一覧から検出し直す.
+        """
+        self.last_reconcile = None
+        known = self._load_adapter_names()
+        if self.switch_mode == SwitchMode.DISABLE and known is not None:
+            switched = self._fast_switch(target_type, *known, deadline, cancel)
+            if switched is not None:
+                return switched
+
+        ethernet, wifi = self.find_switch_adapters(
+            timeout=_remaining(deadline), cancel=cancel
+        )
 
         if ethernet is None:
             raise NetworkManagerError("イーサネットアダプターが見つかりません")
         if wifi is None:
             raise NetworkManagerError("Wi-Fiアダプターが見つかりません")
 
-        logger.info("Wi-Fiに切り替えます")
-        self.disable_adapter(ethernet.name)
-        self.enable_adapter(wifi.name)
+        target, other = ethernet, wifi
+        if target_type == AdapterType.WIFI:
+            target, other = wifi, ethernet
+        if self.switch_mode == SwitchMode.METRIC:
+            self._prefer_by_metric(target, other, deadline, cancel)
+        else:
+            self._apply(switch_state(target, other), [ethernet, wifi], deadline, cancel)
+        self._save_adapter_names(ethernet, wifi)
+        return target
+
+    def _fast_switch(
+        self,
+        target_type: AdapterType,
+        ethernet: NetworkAdapter,
+        wifi: NetworkAdapter,
+        deadline: float | None,
+        cancel: CancellationToken | None,
+    ) -> NetworkAdapter | None:
+        """記憶したアダプター名で、一覧を取得せずに切り替える.
+
+        名前を指定した状態確認・必要な無効化と有効化・変更後の確認を
+        1回のPowerShell起動で行う. アダプターが見つからない・説明が
+        記憶と異なる場合は変更前に中断し、記憶を破棄してNoneを返す.
+        """
+        if not self.is_admin():
+            raise NetworkManagerError("管理者権限が必要です")
+
+        target, other = ethernet, wifi
+        if target_type == AdapterType.WIFI:
+            target, other = wifi, ethernet
+        desired = switch_state(target, other)
+        names = f"{self._quote(ethernet.name)}, {self._quote(wifi.name)}"
+        query = (
+            f"@(Get-NetAdapter -Name {names} | "
+            "Select-Object Name, InterfaceDescription, Status, LinkSpeed)"
+        )
+        checks = " -or ".join(
+            f"($before | Where-Object Name -eq {self._quote(a.name)})"
+            f".InterfaceDescription -ne {self._quote(a.interface_description)}"
+            for a in (ethernet, wifi)
+        )
+        target_name = self._quote(target.name)
+        other_name = self._quote(other.name)
+        ps_command = (
+            "$ErrorActionPreference = 'Stop'; "
+            f"$before = {query}; "
+            f"if ({checks}) {{ throw 'adapter changed' }}; "
+            f"$o = ($before | Where-Object Name -eq {other_name}).Status; "
+            f"$t = ($before | Where-Object Name -eq {target_name}).Status; "
+            "if ($o -ne 'Disabled') { "
+            f"Disable-NetAdapter -Name {other_name} -Confirm:$false }}; "
+            "if ($t -ne 'Up' -and $t -ne 'Disconnected') { "
+            f"Enable-NetAdapter -Name {target_name} -Confirm:$false }}; "
+            f"[PSCustomObject]@{{ Before = $before; After = {query} }} | "
+            "ConvertTo-Json -Depth 3"
+        )
+
+        self._invalidate_adapter_state()
+        start = time.perf_counter()
+        try:
+            result = self.runner.run(
+                ps_command, timeout=_remaining(deadline), cancel=cancel
+            )
+            elapsed = time.perf_counter() - start
+            data = json.loads(result.stdout)
+            before = [self._parse_adapter(d) for d in data["Before"]]
+            after = [self._parse_adapter(d) for d in data["After"]]
+        except PowerShellError as e:
+            logger.error(f"切り替えエラー: {e}")
+            raise NetworkManagerError(f"切り替えに失敗: {e}") from e
+        except (subprocess.CalledProcessError, ValueError, KeyError, TypeError) as e:
+            logger.info(
+                f"記憶したアダプター名では切り替えられません（検出し直します）: {e}"
+            )
+            self._forget_adapter_names()
+            return None
+        finally:
+            self._invalidate_adapter_state()
+
+        plan = plan_reconcile(desired, before)
+        drift = find_drift(desired, after)
+        for entry in drift:
+            logger.warning(f"望ましい状態と異なります: {entry.describe()}")
+        self._observe_fast_steps(plan, drift, elapsed)
+        self.last_reconcile = ReconcileReport(plan, plan.steps, drift, True)
+        return next((a for a in after if a.name == target.name), target)
+
+    def _observe_fast_steps(
+        self, plan: ReconcilePlan, drift: tuple[Drift, ...], elapsed: float
+    ) -> None:
+        """一括で実行した手順を enable_adapter / disable_adapter として記録.
+
+        1回のPowerShell起動で実行するため、所要時間は手順数で按分する.
+        変更後も望ましい状態と異なるアダプターの手順は失敗として数える.
+        """
+        drifted = {entry.adapter_name for entry in drift}
+        for step in plan.steps:
+            self.metrics.observe_operation(
+                f"{step.action}_adapter",
+                elapsed / len(plan.steps),
+                step.adapter_name in drifted,
+            )
+
+    def _load_adapter_names(self) -> tuple[NetworkAdapter, NetworkAdapter] | None:
+        """記憶したイーサネットとWi-Fiのアダプター（状態は不明）を読み込む."""
+        path = self.state_path / ADAPTER_NAMES_FILE
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return (
+                NetworkAdapter(
+                    data["ethernet"]["name"],
+                    data["ethernet"]["interface_description"],
+                    AdapterStatus.UNKNOWN,
+                    AdapterType.ETHERNET,
+                ),
+                NetworkAdapter(
+                    data["wifi"]["name"],
+                    data["wifi"]["interface_description"],
+                    AdapterStatus.UNKNOWN,
+                    AdapterType.WIFI,
+                ),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"記憶したアダプター名を読み込めません: {e}")
+            return None
+
+    def _save_adapter_names(
+        self, ethernet: NetworkAdapter, wifi: NetworkAdapter
+    ) -> None:
+        """次回の切り替えのためにアダプター名を記憶（失敗しても切り替えは続行）."""
+        data = {
+            key: {
+                "name": adapter.name,
+                "interface_description": adapter.interface_description,
+            }
+            for key, adapter in (("ethernet", ethernet), ("wifi", wifi))
+        }
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+        path = self.state_path / ADAPTER_NAMES_FILE
+        try:
+            if path.exists() and path.read_text(encoding="utf-8") == text:
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"アダプター名を保存できません: {e}")
+
+    def _forget_adapter_names(self) -> None:
+        """記憶したアダプター名を破棄."""
+        try:
+            (self.state_path / ADAPTER_NAMES_FILE).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"記憶したアダプター名を削除できません: {e}")
+
+    def preview_reconcile(
+        self,
+        desired: DesiredState,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> ReconcilePlan:
+        """望ましい状態にするための手順を返す（ドライラン、何も変更しない）."""
+        adapters = self.get_adapters(timeout=timeout, cancel=cancel)
+        return plan_reconcile(desired, adapters)
+
+    def reconcile(
+        self,
+        desired: DesiredState,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> ReconcileReport | None:
+        """アダプターを望ましい状態にし、結果を返す.
+
+        すでに望ましい状態のアダプターには何もしない.
+        変更キューで他の変更と直列化し、完了まで待つ.
+        後から来た要求で取り消された場合はNoneを返す.
+
+        Args:
+            desired: 望ましい状態
+            timeout: 全体のデッドライン（秒、キューでの待ち時間を含む）
+            cancel: 実行中にキャンセルするためのトークン
+        """
+        reports: list[ReconcileReport] = []
+        self._mutate(
+            _SWITCH_KEY,
+            f"reconcile:{desired}",
+            lambda t: reports.append(self._reconcile(desired, t, cancel)),
+            timeout,
+        ).result()
+        return reports[0] if reports else None
+
+    @_measured("reconcile")
+    def _reconcile(
+        self,
+        desired: DesiredState,
+        timeout: float | None,
+        cancel: CancellationToken | None,
+    ) -> ReconcileReport:
+        """現在の状態を取得して望ましい状態にする（変更キューのワーカーで実行）."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        adapters = self.get_adapters(timeout=_remaining(deadline), cancel=cancel)
+        return self._apply(desired, adapters, deadline, cancel)
+
+    def _apply(
+        self,
+        desired: DesiredState,
+        adapters: list[NetworkAdapter],
+        deadline: float | None,
+        cancel: CancellationToken | None,
+    ) -> ReconcileReport:
+        """スナップショットとの差分だけを実行し、実行後の状態を確認.
+
+        手順がなければPowerShellを起動しない.
+        確認の問い合わせに失敗しても変更は済んでいるため、警告のみ記録する.
+        """
+        plan = plan_reconcile(desired, adapters)
+        executed: list[ReconcileStep] = []
+        for step in plan.steps:
+            change = self.enable_adapter if step.enable else self.disable_adapter
+            change(step.adapter_name, timeout=_remaining(deadline), cancel=cancel)
+            executed.append(step)
+
+        drift = plan.missing
+        verified = True
+        if executed:
+            try:
+                drift = find_drift(
+                    desired,
+                    self.get_adapters(timeout=_remaining(deadline), cancel=cancel),
+                )
+            except NetworkManagerError as e:
+                logger.warning(f"変更後の状態を確認できませんでした: {e}")
+                verified = False
+        else:
+            logger.info("すでに望ましい状態のため変更しません")
+
+        for entry in drift:
+            logger.warning(f"望ましい状態と異なります: {entry.describe()}")
+
+        report = ReconcileReport(plan, tuple(executed), drift, verified)
+        self.last_reconcile = report
+        return report
+
+    def _connect_preferred_wifi(
+        self,
+        interface: str,
+        deadline: float | None,
+        cancel: CancellationToken | None,
+    ) -> None:
+        """優先SSIDへ直接接続し、接続完了までの時間を記録.
+
+        接続に失敗してもアダプターの切り替え自体は完了しているため、
+        警告を記録してWindowsの自動接続に任せる.
+        """
+        self.last_association = None
+        if not self.wifi_connector.enabled:
+            return
+
+        start = time.perf_counter()
+        try:
+            result = self.wifi_connector.connect_preferred(
+                interface, timeout=_remaining(deadline), cancel=cancel
+            )
+        except WifiError as e:
+            self.metrics.observe_operation(
+                "wifi_association", time.perf_counter() - start, True
+            )
+            if isinstance(e.__cause__, OperationCancelledError):
+                raise NetworkManagerError(f"Wi-Fiへの接続を中断: {e}") from e
+            logger.warning(f"優先SSIDへの接続に失敗（自動接続に任せます）: {e}")
+            return
+
+        self.metrics.observe_operation("wifi_association", result.seconds, False)
+        self.last_association = result
+
+    def get_interface_metrics(
+        self,
+        adapter_names: list[str],
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> list[InterfaceMetric]:
+        """指定したアダプターのIPインターフェースのメトリックを取得."""
+        aliases = ", ".join(self._quote(name) for name in adapter_names)
+        try:
+            ps_command = (
+                f"Get-NetIPInterface -InterfaceAlias {aliases} | "
+                "Select-Object InterfaceAlias, AddressFamily, "
+                "InterfaceMetric, AutomaticMetric | "
+                "ConvertTo-Json"
+            )
+
+            result = self.runner.run(ps_command, timeout=timeout, cancel=cancel)
+            data = json.loads(result.stdout) if result.stdout.strip() else []
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            logger.error(f"メトリック取得エラー: {e}")
+            raise NetworkManagerError(f"メトリック取得エラー: {e}") from e
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON解析エラー: {e}")
+            raise NetworkManagerError(f"メトリック解析エラー: {e}") from e
+
+        if isinstance(data, dict):
+            data = [data]
+
+        metrics: list[InterfaceMetric] = []
+        for entry in data:
+            family = entry.get("AddressFamily", "")
+            automatic = entry.get("AutomaticMetric", "")
+            metrics.append(
+                InterfaceMetric(
+                    interface_alias=entry.get("InterfaceAlias", ""),
+                    address_family=_ADDRESS_FAMILIES.get(family, str(family)),
+                    metric=int(entry.get("InterfaceMetric") or 0),
+                    automatic=automatic in (1, "Enabled"),
+                )
+            )
+        return metrics
+
+    def has_saved_metrics(self) -> bool:
+        """変更前のメトリックが保存されているかどうか."""
+        return (self.state_path / METRIC_BACKUP_FILE).exists()
+
+    @_measured("restore_metrics")
+    def restore_metrics(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> None:
+        """メトリック方式で変更したインターフェースメトリックを元に戻す."""
+        if not self.is_admin():
+            raise NetworkManagerError("管理者権限が必要です")
+
+        saved = self._load_saved_metrics()
+        if not saved:
+            logger.info("復元するメトリックはありません")
+            return
+
+        commands = []
+        for entry in saved:
+            alias = self._quote(entry.interface_alias)
+            target = (
+                f"Set-NetIPInterface -InterfaceAlias {alias}"
+                f" -AddressFamily {entry.address_family}"
+            )
+            if entry.automatic:
+                commands.append(f"{target} -AutomaticMetric Enabled")
+            else:
+                commands.append(f"{target} -InterfaceMetric {entry.metric}")
+
+        try:
+            self.runner.run("; ".join(commands), timeout=timeout, cancel=cancel)
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            logger.error(f"メトリック復元エラー: {e}")
+            raise NetworkManagerError(f"メトリックの復元に失敗: {e}") from e
+
+        (self.state_path / METRIC_BACKUP_FILE).unlink(missing_ok=True)
+        self._invalidate_adapter_state()
+        logger.info("インターフェースメトリックを元に戻しました")
+
+    def _load_saved_metrics(self) -> list[InterfaceMetric]:
+        """保存した変更前のメトリックを読み込む."""
+        path = self.state_path / METRIC_BACKUP_FILE
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return []
+        except (OSError, json.JSONDecodeError) as e:
+            raise NetworkManagerError(f"保存したメトリックの読み込みに失敗: {e}") from e
+        return [InterfaceMetric(**entry) for entry in data]
+
+    def _save_original_metrics(self, metrics: list[InterfaceMetric]) -> None:
+        """変更前のメトリックを保存（保存済みのインターフェースは上書きしない）."""
+        saved = self._load_saved_metrics()
+        known = {(m.interface_alias, m.address_family) for m in saved}
+        saved.extend(
+            m for m in metrics if (m.interface_alias, m.address_family) not in known
+        )
+
+        path = self.state_path / METRIC_BACKUP_FILE
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps([vars(m) for m in saved], ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            raise NetworkManagerError(f"メトリックの保存に失敗: {e}") from e
+
+    def _prefer_by_metric(
+        self,
+        preferred: NetworkAdapter,
+        other: NetworkAdapter,
+        deadline: float | None,
+        cancel: CancellationToken | None,
+    ) -> None:
+        """両方のアダプターを有効のまま、メトリックで優先するアダプターを切り替え."""
+        if not self.is_admin():
+            raise NetworkManagerError("管理者権限が必要です")
+
+        self._apply(
+            DesiredState(by_name={preferred.name: True, other.name: True}),
+            [preferred, other],
+            deadline,
+            cancel,
+        )
+
+        self._save_original_metrics(
+            self.get_interface_metrics(
+                [preferred.name, other.name],
+                timeout=_remaining(deadline),
+                cancel=cancel,
+            )
+        )
+
+        ps_command = (
+            f"Set-NetIPInterface -InterfaceAlias {self._quote(preferred.name)} "
+            f"-InterfaceMetric {PREFERRED_METRIC}; "
+            f"Set-NetIPInterface -InterfaceAlias {self._quote(other.name)} "
+            f"-InterfaceMetric {DEPRIORITIZED_METRIC}"
+        )
+        try:
+            self.runner.run(ps_command, timeout=_remaining(deadline), cancel=cancel)
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            logger.error(f"メトリック変更エラー: {e}")
+            raise NetworkManagerError(f"メトリックの変更に失敗: {e}") from e
+
+        self._invalidate_adapter_state()
+        logger.info(
+            f"メトリックで '{preferred.name}' を優先しました"
+            f"（'{other.name}' は有効のまま）"
+        )
+
+    def get_adapter_addresses(
+        self,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> dict[str, str]:
+        """アダプター名とIPv4アドレスの対応を取得（リンクローカルは除外）."""
+        try:
+            ps_command = (
+                "Get-NetIPAddress -AddressFamily IPv4 | "
+                "Where-Object { $_.IPAddress -notlike '169.254.*' } | "
+                "Select-Object InterfaceAlias, IPAddress | "
+                "ConvertTo-Json"
+            )
+
+            result = self.runner.run(ps_command, timeout=timeout, cancel=cancel)
+            data = json.loads(result.stdout) if result.stdout.strip() else []
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            logger.error(f"IPアドレス取得エラー: {e}")
+            raise NetworkManagerError(f"IPアドレス取得エラー: {e}") from e
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON解析エラー: {e}")
+            raise NetworkManagerError(f"IPアドレス解析エラー: {e}") from e
+
+        if isinstance(data, dict):
+            data = [data]
+
+        addresses: dict[str, str] = {}
+        for entry in data:
+            alias = entry.get("InterfaceAlias", "")
+            address = entry.get("IPAddress", "")
+            if alias and address:
+                addresses.setdefault(alias, address)
+        return addresses
+
+    def invalidate_adapter_details(self, adapter_name: str | None = None) -> None:
+        """詳細情報のキャッシュを破棄（名前を省略するとすべて）."""
+        with self._details_lock:
+            if adapter_name is None:
+                self._details_cache.clear()
+            else:
+                self._details_cache.pop(adapter_name, None)
+
+    @_measured("get_adapter_details")
+    def get_adapter_details(
+        self,
+        adapter_name: str,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> AdapterDetails:
+        """アダプターのアドレス・ゲートウェイ・DNS・MAC・リンク速度を取得.
+
+        Get-NetAdapterとGet-NetIPConfigurationを1回の問い合わせにまとめ、
+        結果はアダプターの状態が変わるまでキャッシュする.
+        """
+        with self._details_lock:
+            cached = self._details_cache.get(adapter_name)
+        if cached is not None:
+            return cached
+
+        name = self._quote(adapter_name)
+        ps_command = (
+            f"$a = Get-NetAdapter -Name {name}; "
+            f"$c = Get-NetIPConfiguration -InterfaceAlias {name} "
+            "-ErrorAction SilentlyContinue; "
+            "[PSCustomObject]@{ "
+            "Name = $a.Name; MacAddress = $a.MacAddress; LinkSpeed = $a.LinkSpeed; "
+            "IPv4 = @($c.IPv4Address | ForEach-Object { $_.IPAddress }); "
+            "IPv6 = @($c.IPv6Address | ForEach-Object { $_.IPAddress }); "
+            "Gateways = @(@($c.IPv4DefaultGateway) + @($c.IPv6DefaultGateway) | "
+            "Where-Object { $_ } | ForEach-Object { $_.NextHop }); "
+            "Dns = @($c.DNSServer | ForEach-Object { $_.ServerAddresses }) "
+            "} | ConvertTo-Json"
+        )
+        try:
+            result = self.runner.run(ps_command, timeout=timeout, cancel=cancel)
+            data = json.loads(result.stdout)
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            logger.error(f"アダプター詳細取得エラー: {e}")
+            raise NetworkManagerError(
+                f"アダプター '{adapter_name}' の詳細取得に失敗: {e}"
+            ) from e
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON解析エラー: {e}")
+            raise NetworkManagerError(f"アダプター詳細解析エラー: {e}") from e
+
+        details = AdapterDetails(
+            name=data.get("Name") or adapter_name,
+            mac_address=data.get("MacAddress") or "",
+            link_speed_bps=self._parse_link_speed(data.get("LinkSpeed")),
+            ipv4_addresses=self._as_strings(data.get("IPv4")),
+            ipv6_addresses=self._as_strings(data.get("IPv6")),
+            gateways=self._as_strings(data.get("Gateways")),
+            dns_servers=self._as_strings(data.get("Dns")),
+        )
+        with self._details_lock:
+            self._details_cache[adapter_name] = details
+        return details
+
+    @staticmethod
+    def _as_strings(value: object) -> tuple[str, ...]:
+        """ConvertTo-Jsonの値（null・単一値・配列）を文字列のタプルに変換."""
+        if value is None:
+            return ()
+        if isinstance(value, list):
+            return tuple(str(v) for v in value if v)
+        return (str(value),) if value else ()
+
+    @_measured("rank_adapters")
+    def rank_adapters(
+        self,
+        prober: LinkProber | None = None,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> list[ProbeResult]:
+        """切り替え対象のイーサネットとWi-Fiのリンク品質を計測し、良い順に返す."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return self._probe_adapters(prober, deadline, cancel)[0]
+
+    @_measured("switch_to_best")
+    def switch_to_best(
+        self,
+        prober: LinkProber | None = None,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> NetworkAdapter:
+        """計測結果が最も良いアダプターに切り替え、そのアダプターを返す.
+
+        Raises:
+            NetworkManagerError: どのアダプターも計測先に到達できない場合
+                （現在の状態のまま切り替えない）
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ranked, targets = self._probe_adapters(prober, deadline, cancel)
+        if not ranked[0].reachable:
+            raise NetworkManagerError(
+                "どのアダプターでも計測先に到達できないため切り替えません"
+            )
+
+        best = next(a for a in targets if a.name == ranked[0].name)
+        logger.info(f"計測結果に基づき '{best.name}' に切り替えます")
+        if best.is_ethernet():
+            self.switch_to_ethernet(timeout=_remaining(deadline), cancel=cancel)
+        else:
+            self.switch_to_wifi(timeout=_remaining(deadline), cancel=cancel)
+        return best
+
+    def _probe_adapters(
+        self,
+        prober: LinkProber | None,
+        deadline: float | None,
+        cancel: CancellationToken | None,
+    ) -> tuple[list[ProbeResult], list[NetworkAdapter]]:
+        """切り替え対象のアダプターの組を計測し、計測結果と計測対象を返す.
+
+        Hyper-VやVPNの仮想アダプターは切り替えられないため計測しない.
+        無効化方式では待機側のアダプターが無効でIPアドレスがなく計測できないため、
+        メトリック方式（両方有効）でのみ計測する.
+
+        Raises:
+            NetworkManagerError: 無効化方式の場合・計測対象がない場合
+        """
+        if self.switch_mode != SwitchMode.METRIC:
+            raise NetworkManagerError(
+                "リンク品質の計測はメトリック方式（両方有効）でのみ使用できます"
+            )
+        pair = self.find_switch_adapters(timeout=_remaining(deadline), cancel=cancel)
+        targets = [adapter for adapter in pair if adapter is not None]
+        if not targets:
+            raise NetworkManagerError("計測対象のアダプターが見つかりません")
+
+        # 切り替え候補の問い合わせにはリンク速度が含まれないため一覧から補う
+        link_speeds = {
+            adapter.name: adapter.link_speed_bps
+            for adapter in self.get_adapters(
+                timeout=_remaining(deadline), cancel=cancel
+            )
+        }
+        addresses = self.get_adapter_addresses(
+            timeout=_remaining(deadline), cancel=cancel
+        )
+        candidates = [
+            ProbeCandidate(
+                name=adapter.name,
+                source_address=addresses.get(adapter.name),
+                link_speed_bps=link_speeds.get(adapter.name, adapter.link_speed_bps),
+            )
+            for adapter in targets
+        ]
+        prober = prober or LinkProber(ProbeConfig.from_env())
+        return prober.probe(candidates), targets
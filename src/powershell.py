@@ -0,0 +1,411 @@
+"""PowerShell実行モジュール（デッドライン・キャンセル・サーキットブレーカー）."""
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable, Sequence
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+# Windows用のサブプロセスウィンドウ非表示フラグ
+CREATE_NO_WINDOW = 0x08000000 if sys.platform == "win32" else 0
+
+# PowerShellの出力をUTF-8に固定するための前置きスクリプト
+UTF8_PREAMBLE = (
+    "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; "
+    "$OutputEncoding = [System.Text.Encoding]::UTF8; "
+)
+
+# 操作ごとの既定のデッドライン（秒）
+DEFAULT_TIMEOUT = 30.0
+
+
+class PowerShellError(Exception):
+    """PowerShell実行のエラー."""
+
+    pass
+
+
+class PowerShellTimeoutError(PowerShellError):
+    """デッドライン超過によりプロセスツリーを強制終了した."""
+
+    pass
+
+
+class OperationCancelledError(PowerShellError):
+    """実行中の操作が呼び出し側からキャンセルされた."""
+
+    pass
+
+
+class CircuitOpenError(PowerShellError):
+    """サーキットブレーカーが開いているため即時失敗した."""
+
+    pass
+
+
+class CancellationToken:
+    """実行中の操作をキャンセルするためのトークン."""
+
+    def __init__(self) -> None:
+        """トークンを初期化."""
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """キャンセルを要求."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """キャンセルが要求されているかどうか."""
+        return self._event.is_set()
+
+
+class BreakerState(Enum):
+    """サーキットブレーカーの状態."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """連続タイムアウトで遮断し、バックグラウンドで復旧を確認するブレーカー."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        probe: Callable[[], bool] | None = None,
+    ) -> None:
+        """ブレーカーを初期化.
+
+        Args:
+            failure_threshold: 遮断するまでの連続タイムアウト回数
+            reset_timeout: 遮断後に復旧確認を行うまでの秒数
+            probe: 復旧確認に使う関数（成功時にTrueを返す）
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+
+        self._lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._consecutive_timeouts = 0
+        self._timer: threading.Timer | None = None
+        self._listeners: list[Callable[[BreakerState], None]] = []
+        self._closed = False
+
+    @property
+    def state(self) -> BreakerState:
+        """現在の状態."""
+        with self._lock:
+            return self._state
+
+    @property
+    def consecutive_timeouts(self) -> int:
+        """連続タイムアウト回数."""
+        with self._lock:
+            return self._consecutive_timeouts
+
+    def add_listener(self, listener: Callable[[BreakerState], None]) -> None:
+        """状態遷移の通知先を登録."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def before_call(self) -> None:
+        """呼び出し前のチェック. 遮断中はCircuitOpenErrorを送出."""
+        with self._lock:
+            state = self._state
+        if state != BreakerState.CLOSED:
+            raise CircuitOpenError(
+                "PowerShellの応答がないため一時的に操作を停止しています"
+            )
+
+    def record_success(self) -> None:
+        """呼び出しが完了したことを記録."""
+        with self._lock:
+            self._consecutive_timeouts = 0
+
+    def record_timeout(self) -> None:
+        """呼び出しがタイムアウトしたことを記録."""
+        with self._lock:
+            self._consecutive_timeouts += 1
+            should_open = (
+                self._state == BreakerState.CLOSED
+                and self._consecutive_timeouts >= self.failure_threshold
+            )
+        if should_open:
+            logger.warning(
+                f"PowerShellが{self.failure_threshold}回連続でタイムアウトしたため"
+                "サーキットブレーカーを開きます"
+            )
+            self._transition(BreakerState.OPEN)
+            self._schedule_probe()
+
+    def shutdown(self) -> None:
+        """復旧確認タイマーを停止."""
+        with self._lock:
+            self._closed = True
+            timer = self._timer
+            self._timer = None
+        if timer is not None:
+            timer.cancel()
+
+    def _transition(self, state: BreakerState) -> None:
+        """状態を遷移させてリスナーに通知."""
+        with self._lock:
+            if self._state == state:
+                return
+            self._state = state
+            if state == BreakerState.CLOSED:
+                self._consecutive_timeouts = 0
+            listeners = list(self._listeners)
+
+        logger.info(f"サーキットブレーカーの状態: {state.value}")
+        for listener in listeners:
+            try:
+                listener(state)
+            except Exception as e:
+                logger.error(f"ブレーカー通知エラー: {e}")
+
+    def _schedule_probe(self) -> None:
+        """一定時間後に復旧確認を予約."""
+        with self._lock:
+            if self._closed:
+                return
+            timer = threading.Timer(self.reset_timeout, self._probe_recovery)
+            timer.daemon = True
+            self._timer = timer
+        timer.start()
+
+    def _probe_recovery(self) -> None:
+        """バックグラウンドで復旧を確認."""
+        self._transition(BreakerState.HALF_OPEN)
+        try:
+            recovered = self.probe() if self.probe is not None else True
+        except Exception as e:
+            logger.warning(f"復旧確認に失敗: {e}")
+            recovered = False
+
+        if recovered:
+            logger.info("PowerShellの応答が回復しました")
+            self._transition(BreakerState.CLOSED)
+        else:
+            self._transition(BreakerState.OPEN)
+            self._schedule_probe()
+
+
+def kill_process_tree(process: "subprocess.Popen[str]") -> None:
+    """プロセスとその子孫をすべて強制終了."""
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+                timeout=10,
+                creationflags=CREATE_NO_WINDOW,
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except Exception as e:
+        logger.warning(f"プロセスツリーの終了に失敗: {e}")
+
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+class PowerShellRunner:
+    """デッドライン付きでPowerShellを実行するクラス."""
+
+    def __init__(
+        self,
+        default_timeout: float = DEFAULT_TIMEOUT,
+        breaker: CircuitBreaker | None = None,
+        poll_interval: float = 0.1,
+        probe_timeout: float = 10.0,
+    ) -> None:
+        """ランナーを初期化.
+
+        Args:
+            default_timeout: タイムアウト未指定時のデッドライン（秒）
+            breaker: 使用するサーキットブレーカー（省略時は既定値で生成）
+            poll_interval: デッドライン・キャンセル確認の間隔（秒）
+            probe_timeout: 復旧確認コマンドのデッドライン（秒）
+        """
+        self.default_timeout = default_timeout
+        self.poll_interval = poll_interval
+        self.probe_timeout = probe_timeout
+        self.breaker = breaker or CircuitBreaker(probe=self._probe)
+
+        self._lock = threading.Lock()
+        self._active: set[CancellationToken] = set()
+        self._timeout_count = 0
+        self._spawn_count = 0
+
+    @property
+    def timeout_count(self) -> int:
+        """これまでにタイムアウトした回数."""
+        with self._lock:
+            return self._timeout_count
+
+    @property
+    def spawn_count(self) -> int:
+        """これまでに起動したプロセスの数."""
+        with self._lock:
+            return self._spawn_count
+
+    def run(
+        self,
+        script: str,
+        *,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> "subprocess.CompletedProcess[str]":
+        """PowerShellスクリプトを実行."""
+        cmd = ["powershell", "-NoProfile", "-Command", UTF8_PREAMBLE + script]
+        return self.run_process(cmd, timeout=timeout, cancel=cancel)
+
+    def run_process(
+        self,
+        cmd: Sequence[str],
+        *,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+        use_breaker: bool = True,
+        encoding: str = "utf-8",
+    ) -> "subprocess.CompletedProcess[str]":
+        """コマンドを実行し、デッドライン超過・キャンセル時はプロセスツリーを終了.
+
+        encodingには標準出力・標準エラーの文字コードを指定する
+        （PowerShellはUTF8_PREAMBLEでUTF-8に揃えるため既定はUTF-8）.
+
+        Raises:
+            CircuitOpenError: ブレーカーが開いている場合
+            PowerShellTimeoutError: デッドラインを超過した場合
+            OperationCancelledError: キャンセルされた場合
+            subprocess.CalledProcessError: 終了コードが0以外の場合
+        """
+        # 呼び出し側の待ち時間でデッドラインを使い切っている場合は起動しない.
+        # PowerShellの応答とは無関係なので、ブレーカーにも記録しない
+        if timeout is not None and timeout <= 0:
+            raise PowerShellTimeoutError("実行前にデッドラインを超過しました")
+
+        if use_breaker:
+            self.breaker.before_call()
+
+        if timeout is None:
+            timeout = self.default_timeout
+        token = cancel or CancellationToken()
+        if token.cancelled:
+            raise OperationCancelledError("操作はキャンセルされました")
+
+        deadline = time.monotonic() + timeout
+        process = subprocess.Popen(
+            list(cmd),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding=encoding,
+            creationflags=CREATE_NO_WINDOW,
+            start_new_session=sys.platform != "win32",
+        )
+
+        with self._lock:
+            self._spawn_count += 1
+            self._active.add(token)
+        try:
+            stdout, stderr = self._wait(process, deadline, token, timeout)
+        except PowerShellTimeoutError:
+            if use_breaker:
+                self.breaker.record_timeout()
+            raise
+        finally:
+            with self._lock:
+                self._active.discard(token)
+
+        if use_breaker:
+            self.breaker.record_success()
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, list(cmd), stdout, stderr
+            )
+        return subprocess.CompletedProcess(
+            list(cmd), process.returncode, stdout, stderr
+        )
+
+    def cancel_all(self) -> None:
+        """実行中のすべての操作をキャンセル."""
+        with self._lock:
+            tokens = list(self._active)
+        for token in tokens:
+            token.cancel()
+
+    def shutdown(self) -> None:
+        """実行中の操作をキャンセルし、ブレーカーを停止."""
+        self.cancel_all()
+        self.breaker.shutdown()
+
+    def _wait(
+        self,
+        process: "subprocess.Popen[str]",
+        deadline: float,
+        token: CancellationToken,
+        timeout: float,
+    ) -> tuple[str, str]:
+        """プロセスの終了をデッドラインとキャンセルを確認しながら待機."""
+        while True:
+            if token.cancelled:
+                self._terminate(process)
+                logger.info("実行中のPowerShell操作をキャンセルしました")
+                raise OperationCancelledError("操作はキャンセルされました")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._terminate(process)
+                with self._lock:
+                    self._timeout_count += 1
+                logger.warning(
+                    f"PowerShellが{timeout:.1f}秒以内に応答しなかったため"
+                    "プロセスツリーを終了しました"
+                )
+                raise PowerShellTimeoutError(
+                    f"PowerShellが{timeout:.1f}秒以内に応答しませんでした"
+                )
+
+            try:
+                stdout, stderr = process.communicate(
+                    timeout=min(self.poll_interval, remaining)
+                )
+                return stdout or "", stderr or ""
+            except subprocess.TimeoutExpired:
+                continue
+
+    @staticmethod
+    def _terminate(process: "subprocess.Popen[str]") -> None:
+        """プロセスツリーを終了し、パイプを回収."""
+        kill_process_tree(process)
+        try:
+            process.communicate(timeout=5)
+        except (subprocess.TimeoutExpired, ValueError, OSError):
+            pass
+
+    def _probe(self) -> bool:
+        """PowerShellが応答するかを確認."""
+        try:
+            self.run_process(
+                ["powershell", "-NoProfile", "-Command", "exit 0"],
+                timeout=self.probe_timeout,
+                use_breaker=False,
+            )
+            return True
+        except (PowerShellError, subprocess.CalledProcessError, OSError):
+            return False
@@ -0,0 +1,210 @@
+"""CPU・メモリのホットスポットを記録するプロファイリングモード.
+
+環境変数 NAS_PROFILE=1 または --profile 指定時のみ有効になる.
+無効時はこのモジュールの機能は一切呼ばれないため、オーバーヘッドはない.
+"""
+
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV_VAR = "NAS_PROFILE"
+PROFILE_DIR_ENV_VAR = "NAS_PROFILE_DIR"
+
+# 定期レポートの既定の間隔（秒）
+DEFAULT_REPORT_INTERVAL = 300.0
+
+
+def profiling_requested() -> bool:
+    """環境変数でプロファイリングが要求されているかどうか."""
+    return os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in ("1", "true", "yes")
+
+
+@dataclass
+class OperationStats:
+    """操作ごとの実行回数と時間の集計."""
+
+    calls: int = 0
+    cpu_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+
+class Profiler:
+    """cProfileとtracemallocで定期的にレポートを書き出すクラス.
+
+    cProfileはstart()を呼んだスレッド（GUIのメインループ）を計測し、
+    instrument()で包んだ操作はプロセス全体のCPU時間を操作ごとに集計する
+    （変更キューのワーカーなど別スレッドで実行される処理を含めるため.
+    同時に動いている他のスレッドの分も含まれる）.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        report_interval: float = DEFAULT_REPORT_INTERVAL,
+        top_n: int = 30,
+        traceback_frames: int = 5,
+    ) -> None:
+        """プロファイラーを初期化.
+
+        Args:
+            output_dir: レポートの出力先ディレクトリ
+            report_interval: 定期レポートの間隔（秒）
+            top_n: レポートに載せる関数・メモリ確保箇所の件数
+            traceback_frames: tracemallocで記録するスタックの深さ
+        """
+        self.output_dir = output_dir
+        self.report_interval = report_interval
+        self.top_n = top_n
+        self.traceback_frames = traceback_frames
+
+        self._profile = cProfile.Profile()
+        self._lock = threading.Lock()
+        self._operations: dict[str, OperationStats] = {}
+        self._previous_snapshot: tracemalloc.Snapshot | None = None
+        self._running = False
+
+    def start(self) -> None:
+        """計測を開始（呼び出したスレッドがCPUプロファイルの対象）."""
+        if self._running:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+        self._previous_snapshot = self._snapshot()
+        self._profile.enable()
+        self._running = True
+        logger.info(f"プロファイリングを開始しました（出力先: {self.output_dir}）")
+
+    def stop(self) -> None:
+        """計測を停止."""
+        if not self._running:
+            return
+        self._profile.disable()
+        tracemalloc.stop()
+        self._running = False
+
+    def instrument(self, target: object, method_names: Iterable[str]) -> None:
+        """インスタンスのメソッドを操作ごとの時間計測で包む."""
+        prefix = type(target).__name__
+        for name in method_names:
+            method = getattr(target, name)
+            setattr(target, name, self._timed(f"{prefix}.{name}", method))
+
+    def _timed(self, operation: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """呼び出しごとのCPU時間と経過時間を集計するラッパーを返す."""
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                cpu = time.process_time() - cpu_start
+                wall = time.perf_counter() - wall_start
+                with self._lock:
+                    stats = self._operations.setdefault(operation, OperationStats())
+                    stats.calls += 1
+                    stats.cpu_seconds += cpu
+                    stats.wall_seconds += wall
+
+        return wrapper
+
+    def operation_stats(self) -> dict[str, OperationStats]:
+        """操作ごとの集計値のコピー."""
+        with self._lock:
+            return {
+                name: OperationStats(s.calls, s.cpu_seconds, s.wall_seconds)
+                for name, s in self._operations.items()
+            }
+
+    def write_report(self) -> Path:
+        """レポートを書き出してそのパスを返す.
+
+        CPUプロファイルを読み出すため、start()を呼んだスレッドから呼ぶこと.
+        """
+        sections = [
+            f"# プロファイルレポート {datetime.now().isoformat(timespec='seconds')}",
+            self._cpu_section(),
+            self._allocation_section(),
+            self._operation_section(),
+        ]
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = self.output_dir / f"profile_{timestamp}.txt"
+        path.write_text("\n\n".join(sections) + "\n", encoding="utf-8")
+        logger.info(f"プロファイルレポートを出力しました: {path}")
+        return path
+
+    def _cpu_section(self) -> str:
+        """累積時間の多い関数の一覧."""
+        if self._running:
+            self._profile.disable()
+        try:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        except TypeError:
+            # まだ何も計測されていない場合
+            stream = io.StringIO("計測データなし")
+        finally:
+            if self._running:
+                self._profile.enable()
+        return "## CPU（累積時間順）\n" + stream.getvalue()
+
+    def _allocation_section(self) -> str:
+        """前回のスナップショットからのメモリ確保の増加."""
+        if not tracemalloc.is_tracing():
+            return "## メモリ確保の増加\n計測データなし"
+
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            "## メモリ確保の増加（前回レポートからの差分）",
+            f"現在: {current / 1024:.1f} KiB / ピーク: {peak / 1024:.1f} KiB",
+        ]
+        if self._previous_snapshot is not None:
+            diffs = snapshot.compare_to(self._previous_snapshot, "lineno")
+            lines.extend(str(diff) for diff in diffs[: self.top_n])
+        self._previous_snapshot = snapshot
+        return "\n".join(lines)
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """tracemalloc自身の確保を除いたスナップショット."""
+        return tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+
+    def _operation_section(self) -> str:
+        """操作ごとのCPU時間."""
+        lines = [
+            "## 操作ごとの時間",
+            "操作\t回数\tCPU合計(s)\tCPU平均(ms)\t経過合計(s)",
+        ]
+        ordered = sorted(
+            self.operation_stats().items(),
+            key=lambda item: item[1].cpu_seconds,
+            reverse=True,
+        )
+        for name, stats in ordered:
+            average_ms = stats.cpu_seconds / stats.calls * 1000 if stats.calls else 0
+            lines.append(
+                f"{name}\t{stats.calls}\t{stats.cpu_seconds:.4f}\t"
+                f"{average_ms:.2f}\t{stats.wall_seconds:.4f}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,162 @@
+"""望ましいアダプターの状態と現在の状態の差分を求めるモジュール.
+
+望ましい状態（アダプター名または種類 → 有効にするかどうか）と
+アダプター一覧のスナップショットを比べ、必要な有効化・無効化だけを
+順序付きの計画にする. すでに望ましい状態のアダプターには何もしない.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+
+
+@dataclass(frozen=True)
+class DesiredState:
+    """望ましいアダプターの状態.
+
+    名前での指定は種類での指定より優先する.
+    どちらにも該当しないアダプターはそのままにする.
+    """
+
+    by_name: Mapping[str, bool] = field(default_factory=dict)
+    by_type: Mapping[AdapterType, bool] = field(default_factory=dict)
+
+    def wants_enabled(self, adapter: NetworkAdapter) -> bool | None:
+        """アダプターを有効にしたいか（指定がなければNone）."""
+        if adapter.name in self.by_name:
+            return self.by_name[adapter.name]
+        return self.by_type.get(adapter.adapter_type)
+
+    def __str__(self) -> str:
+        """内容が同じなら同じになる文字列（変更キューでの合流判定に使用）."""
+        entries = [f"{name}={enabled}" for name, enabled in self.by_name.items()]
+        entries += [f"[{t.value}]={enabled}" for t, enabled in self.by_type.items()]
+        return ",".join(sorted(entries))
+
+
+def switch_state(target: NetworkAdapter, other: NetworkAdapter) -> DesiredState:
+    """targetだけを有効にする切り替え用の望ましい状態."""
+    return DesiredState(by_name={other.name: False, target.name: True})
+
+
+def _is_enabled(status: AdapterStatus) -> bool | None:
+    """状態が有効か（不明ならNone）. 未接続は有効として扱う."""
+    if status == AdapterStatus.UNKNOWN:
+        return None
+    return status != AdapterStatus.DISABLED
+
+
+@dataclass(frozen=True)
+class ReconcileStep:
+    """計画の1手順."""
+
+    adapter_name: str
+    enable: bool
+    current: AdapterStatus
+
+    @property
+    def action(self) -> str:
+        """操作名（"enable" / "disable"）."""
+        return "enable" if self.enable else "disable"
+
+    def describe(self) -> str:
+        """確認表示用の説明."""
+        verb = "有効化" if self.enable else "無効化"
+        return f"{self.adapter_name} を{verb}（現在: {self.current.value}）"
+
+
+@dataclass(frozen=True)
+class Drift:
+    """望ましい状態と異なるまま残ったアダプター."""
+
+    adapter_name: str
+    enable: bool
+    actual: AdapterStatus | None  # Noneはアダプターが見つからない
+
+    def describe(self) -> str:
+        """表示用の説明."""
+        wanted = "有効" if self.enable else "無効"
+        actual = "見つかりません" if self.actual is None else self.actual.value
+        return f"{self.adapter_name}: {wanted}にしたいが {actual}"
+
+
+@dataclass(frozen=True)
+class ReconcilePlan:
+    """望ましい状態にするための手順（無効化を先、有効化を後に並べる）."""
+
+    steps: tuple[ReconcileStep, ...]
+    missing: tuple[Drift, ...] = ()
+
+    @property
+    def is_noop(self) -> bool:
+        """実行する手順がないかどうか."""
+        return not self.steps
+
+    def describe(self) -> list[str]:
+        """確認表示（ドライラン）用の手順の説明."""
+        lines = [f"{i}. {step.describe()}" for i, step in enumerate(self.steps, 1)]
+        lines += [drift.describe() for drift in self.missing]
+        return lines
+
+
+@dataclass(frozen=True)
+class ReconcileReport:
+    """計画を実行した結果."""
+
+    plan: ReconcilePlan
+    executed: tuple[ReconcileStep, ...]
+    drift: tuple[Drift, ...]
+    verified: bool
+
+    @property
+    def converged(self) -> bool:
+        """望ましい状態になったことを確認できたかどうか."""
+        return self.verified and not self.drift
+
+
+def _missing(
+    desired: DesiredState, adapters: list[NetworkAdapter]
+) -> tuple[Drift, ...]:
+    """指定したのに一覧に見つからない名前・種類."""
+    names = {adapter.name for adapter in adapters}
+    types = {adapter.adapter_type for adapter in adapters}
+    missing = [
+        Drift(name, enabled, None)
+        for name, enabled in desired.by_name.items()
+        if name not in names
+    ]
+    missing += [
+        Drift(adapter_type.value, enabled, None)
+        for adapter_type, enabled in desired.by_type.items()
+        if adapter_type not in types
+    ]
+    return tuple(missing)
+
+
+def plan_reconcile(
+    desired: DesiredState, adapters: list[NetworkAdapter]
+) -> ReconcilePlan:
+    """スナップショットとの差分から最小の手順を作成.
+
+    状態が不明なアダプターは確認できないため手順に含める.
+    無効化を先に行い、同じアダプターを奪い合う構成でも順番が決まるようにする.
+    """
+    disables: list[ReconcileStep] = []
+    enables: list[ReconcileStep] = []
+    for adapter in adapters:
+        wanted = desired.wants_enabled(adapter)
+        if wanted is None or _is_enabled(adapter.status) == wanted:
+            continue
+        step = ReconcileStep(adapter.name, wanted, adapter.status)
+        (enables if wanted else disables).append(step)
+    return ReconcilePlan(tuple(disables + enables), _missing(desired, adapters))
+
+
+def find_drift(
+    desired: DesiredState, adapters: list[NetworkAdapter]
+) -> tuple[Drift, ...]:
+    """望ましい状態と異なるアダプターを列挙."""
+    plan = plan_reconcile(desired, adapters)
+    drift = [Drift(step.adapter_name, step.enable, step.current) for step in plan.steps]
+    return tuple(drift) + plan.missing
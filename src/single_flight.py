@@ -0,0 +1,127 @@
+"""同じ問い合わせの同時実行をまとめるシングルフライト層."""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    """シングルフライト層の集計値."""
+
+    requests: int
+    executions: int
+    joined: int
+    cached: int
+
+    @property
+    def saved(self) -> int:
+        """実行せずに済んだ問い合わせ数."""
+        return self.joined + self.cached
+
+
+class _Flight(Generic[T]):
+    """実行中の問い合わせ1件."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """実行中の問い合わせがあれば合流し、その結果を共有するクラス.
+
+    min_intervalを指定すると、直前の結果からその秒数以内の要求には
+    問い合わせを行わず直前の結果を返す.
+    """
+
+    def __init__(self, min_interval: float = 0.0) -> None:
+        """シングルフライト層を初期化.
+
+        Args:
+            min_interval: 直前の結果を再利用する秒数（0なら再利用しない）
+        """
+        self.min_interval = min_interval
+
+        self._lock = threading.Lock()
+        self._flight: _Flight[T] | None = None
+        self._last_result: T | None = None
+        self._last_time: float | None = None
+
+        self._requests = 0
+        self._executions = 0
+        self._joined = 0
+        self._cached = 0
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """集計値."""
+        with self._lock:
+            return SingleFlightStats(
+                requests=self._requests,
+                executions=self._executions,
+                joined=self._joined,
+                cached=self._cached,
+            )
+
+    def invalidate(self) -> None:
+        """直前の結果を破棄（状態を変更する操作の後に呼ぶ）."""
+        with self._lock:
+            self._last_result = None
+            self._last_time = None
+
+    def do(self, fn: Callable[[], T], wait_timeout: float | None = None) -> T:
+        """問い合わせを実行、または実行中の問い合わせに合流して結果を返す.
+
+        Args:
+            fn: 問い合わせ本体
+            wait_timeout: 合流した場合に結果を待つ最大秒数
+
+        Raises:
+            TimeoutError: 合流先の問い合わせがwait_timeout以内に終わらない場合
+        """
+        with self._lock:
+            self._requests += 1
+            flight = self._flight
+            if flight is not None:
+                self._joined += 1
+                leader = False
+            elif (
+                self._last_time is not None
+                and time.monotonic() - self._last_time < self.min_interval
+            ):
+                self._cached += 1
+                return self._last_result  # type: ignore[return-value]
+            else:
+                flight = self._flight = _Flight()
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            if not flight.done.wait(wait_timeout):
+                raise TimeoutError("実行中の問い合わせが時間内に終わりませんでした")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result  # type: ignore[return-value]
+
+        try:
+            result = fn()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+            raise
+
+        flight.result = result
+        with self._lock:
+            self._flight = None
+            self._last_result = result
+            self._last_time = time.monotonic()
+        flight.done.set()
+        return result
@@ -0,0 +1,220 @@
+"""アプリケーションの多重起動を防ぐモジュール.
+
+最初に起動したインスタンスがロックファイルを排他ロックし、
+ローカルホストで2回目以降の起動からの要求を待ち受ける.
+2回目以降の起動はコマンドライン引数の意図（ウィンドウ表示・切り替え）を
+送ってすぐに終了する.
+
+ロックはOSのファイルロックのため、異常終了したインスタンスのロックは
+OSが解放する. 残った接続先ファイルは次に起動したインスタンスが上書きする.
+"""
+
+import json
+import logging
+import os
+import queue
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import IO
+
+from src.app_paths import state_dir
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE = "instance.lock"
+ENDPOINT_FILE = "instance.json"
+
+
+class InstanceCommand(Enum):
+    """起動中のインスタンスに送る要求."""
+
+    SHOW = "show"
+    SWITCH_ETHERNET = "switch-ethernet"
+    SWITCH_WIFI = "switch-wifi"
+
+
+class SingleInstanceError(Exception):
+    """多重起動防止のエラー."""
+
+    pass
+
+
+def _try_lock(file: IO[bytes]) -> bool:
+    """ファイルの排他ロックを待たずに試み、取得できたかを返す."""
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(file: IO[bytes]) -> None:
+    """ファイルの排他ロックを解放."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class SingleInstance:
+    """1つのインスタンスだけが起動するようにするクラス.
+
+    acquire()が成功したインスタンスは受け取った要求をcommandsに入れる.
+    GUIはメインスレッドでcommandsを取り出して処理する.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        connect_timeout: float = 0.5,
+        startup_wait: float = 3.0,
+    ) -> None:
+        """初期化.
+
+        Args:
+            directory: ロックファイルの保存先（省略時はマシンごとの既定の場所）
+            connect_timeout: 起動中のインスタンスへの接続タイムアウト（秒）
+            startup_wait: 起動直後で接続先がまだない場合に待つ秒数
+        """
+        self.directory = directory or state_dir()
+        self.connect_timeout = connect_timeout
+        self.startup_wait = startup_wait
+        self.commands: queue.SimpleQueue[InstanceCommand] = queue.SimpleQueue()
+        self._lock_file: IO[bytes] | None = None
+        self._server: socketserver.TCPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_primary(self) -> bool:
+        """このプロセスがロックを保持しているかどうか."""
+        return self._lock_file is not None
+
+    def acquire(self) -> bool:
+        """ロックの取得を試み、取得できたら要求の待ち受けを開始.
+
+        Returns:
+            最初のインスタンスならTrue、すでに起動中ならFalse
+        """
+        if self._lock_file is not None:
+            return True
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.directory / LOCK_FILE, "a+b")
+        if not _try_lock(lock_file):
+            lock_file.close()
+            return False
+
+        self._lock_file = lock_file
+        try:
+            self._start_server()
+        except OSError:
+            self.close()
+            raise
+        return True
+
+    def forward(self, command: InstanceCommand) -> None:
+        """起動中のインスタンスに要求を送る.
+
+        起動直後で接続先がまだない場合はstartup_waitまで再試行する.
+
+        Raises:
+            SingleInstanceError: 起動中のインスタンスに送れなかった場合
+        """
+        deadline = time.monotonic() + self.startup_wait
+        while True:
+            try:
+                self._send(command)
+                return
+            except (OSError, ValueError, KeyError, SingleInstanceError) as e:
+                if time.monotonic() >= deadline:
+                    raise SingleInstanceError(
+                        f"起動中のインスタンスに要求を送れません: {e}"
+                    ) from e
+            time.sleep(0.05)
+
+    def close(self) -> None:
+        """待ち受けを停止してロックを解放."""
+        if self._server is not None:
+            if self._thread is not None:
+                self._server.shutdown()
+                self._thread.join(timeout=5)
+                self._thread = None
+            self._server.server_close()
+            self._server = None
+        if self._lock_file is not None:
+            (self.directory / ENDPOINT_FILE).unlink(missing_ok=True)
+            try:
+                _unlock(self._lock_file)
+            except OSError:
+                pass
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _start_server(self) -> None:
+        """要求の待ち受けを開始し、接続先ファイルを書き込む."""
+        token = secrets.token_hex(16)
+        commands = self.commands
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                try:
+                    request = json.loads(self.rfile.readline(4096))
+                    if request.get("token") != token:
+                        return
+                    command = InstanceCommand(request.get("command"))
+                except (ValueError, AttributeError):
+                    return
+                logger.info(f"別の起動からの要求を受け取りました: {command.value}")
+                commands.put(command)
+                self.wfile.write(b"ok\n")
+
+        self._server = socketserver.TCPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="single-instance", daemon=True
+        )
+        self._thread.start()
+
+        # 読み取り側が書きかけの内容を読まないよう、一時ファイルから置き換える
+        port = self._server.server_address[1]
+        path = self.directory / ENDPOINT_FILE
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(
+            json.dumps({"pid": os.getpid(), "port": port, "token": token}),
+            encoding="utf-8",
+        )
+        os.replace(temporary, path)
+
+    def _send(self, command: InstanceCommand) -> None:
+        """接続先ファイルを読み、要求を1つ送って応答を確認."""
+        endpoint = json.loads(
+            (self.directory / ENDPOINT_FILE).read_text(encoding="utf-8")
+        )
+        message = json.dumps({"token": endpoint["token"], "command": command.value})
+        with socket.create_connection(
+            ("127.0.0.1", int(endpoint["port"])), timeout=self.connect_timeout
+        ) as connection:
+            connection.sendall(message.encode("utf-8") + b"\n")
+            reply = connection.makefile("rb").readline()
+        if reply.strip() != b"ok":
+            raise SingleInstanceError(
+                "起動中のインスタンスが要求を受け付けませんでした"
+            )
@@ -0,0 +1,993 @@
+"""長時間の連続操作でリソースの増加と応答時間の劣化を調べるソークテスト.
+
+アダプターの状態をメモリ上に持つ偽のPowerShellに対して、
+NetworkManager（表示できる環境ではNetworkAdapterGUIも）で一覧の更新と
+切り替えを指定回数繰り返す. 偽のPowerShellも応答ごとに子プロセスを起動するため、
+プロセス起動・パイプ・回収の経路は実際と同じになる.
+
+一定のサイクルごとにRSS・開いているファイル記述子（Windowsではハンドル）・
+スレッド数・子プロセス数・Tkのウィジェット数を記録し、ウォームアップ後の
+最初と最後の区間を比べてしきい値を超えて増えていれば失敗とする.
+操作ごとの所要時間も同じ区間の中央値で比べる.
+
+    python -m src.soak --cycles 5000 --report soak-report.json
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import logging
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+import uuid
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from src.gui import NetworkAdapterGUI
+from src.models.models import (
+    MEDIA_TYPE_ETHERNET,
+    MEDIA_TYPE_WIFI,
+    AdapterStatus,
+)
+from src.models.shared_state import AdapterStatePublisher
+from src.network_manager import NetworkManager, NetworkManagerError
+from src.powershell import CancellationToken, PowerShellRunner
+from src.wifi import WifiConfig, WifiConnector
+
+logger = logging.getLogger(__name__)
+
+MIB = 1024 * 1024
+
+# 偽のPowerShellの子プロセス（引数の標準出力・標準エラー・終了コードを返す）
+_ECHO_SCRIPT = (
+    "import sys; "
+    "sys.stdout.buffer.write(sys.argv[1].encode('utf-8')); "
+    "sys.stderr.buffer.write(sys.argv[2].encode('utf-8')); "
+    "sys.exit(int(sys.argv[3]))"
+)
+
+_QUOTED = r"'((?:[^']|'')*)'"
+
+
+class SoakError(Exception):
+    """ソークテストを実行できない場合のエラー."""
+
+    pass
+
+
+class FakeCommandError(Exception):
+    """偽のPowerShellが失敗として扱うスクリプト."""
+
+    pass
+
+
+def _unquote(value: str) -> str:
+    """単一引用符内のエスケープ（''）を戻す."""
+    return value.replace("''", "'")
+
+
+@dataclass
+class FakeAdapter:
+    """偽のPowerShellが持つアダプター."""
+
+    name: str
+    interface_description: str
+    media_type: str
+    status: str = AdapterStatus.UP.value
+    physical: bool = True
+    link_speed: str = "1 Gbps"
+    received_bytes: int = 0
+    sent_bytes: int = 0
+
+    def row(self) -> dict[str, object]:
+        """Get-NetAdapter | Select-Object 相当の1件分."""
+        return {
+            "Name": self.name,
+            "InterfaceDescription": self.interface_description,
+            "Status": self.status,
+            "LinkSpeed": self.link_speed,
+            "MediaType": self.media_type,
+        }
+
+
+def default_fake_adapters() -> list[FakeAdapter]:
+    """イーサネット・Wi-Fi・仮想アダプターが1つずつある構成."""
+    return [
+        FakeAdapter(
+            "Ethernet", "Realtek PCIe GbE Family Controller", MEDIA_TYPE_ETHERNET
+        ),
+        FakeAdapter(
+            "Wi-Fi",
+            "Intel(R) Wi-Fi 6 AX200 160MHz",
+            MEDIA_TYPE_WIFI,
+            status=AdapterStatus.DISABLED.value,
+            link_speed="866.7 Mbps",
+        ),
+        FakeAdapter(
+            "vEthernet (Default Switch)",
+            "Hyper-V Virtual Ethernet Adapter",
+            MEDIA_TYPE_ETHERNET,
+            physical=False,
+            link_speed="10 Gbps",
+        ),
+    ]
+
+
+class FakePowerShellBackend:
+    """NetworkManagerが送るスクリプトにメモリ上のアダプターの状態で応答するクラス.
+
+    スクリプトは実行せず、コマンドレットと引数の形だけを見て応答を組み立てる.
+    対応していないスクリプトはFakeCommandError（終了コード1）とする.
+    """
+
+    def __init__(self, adapters: list[FakeAdapter] | None = None) -> None:
+        """バックエンドを初期化.
+
+        Args:
+            adapters: 初期状態のアダプター（省略時はdefault_fake_adapters()）
+        """
+        self.adapters = adapters if adapters is not None else default_fake_adapters()
+        self.commands: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def respond(self, script: str) -> str:
+        """スクリプトの標準出力を返す.
+
+        Raises:
+            FakeCommandError: 対応していない・失敗するスクリプトの場合
+        """
+        with self._lock:
+            if "[PSCustomObject]@{ Before" in script:
+                return self._count("fast_switch", self._fast_switch(script))
+            if "Get-NetIPConfiguration" in script:
+                return self._count("details", self._details(script))
+            if script.startswith("Get-NetAdapterStatistics"):
+                return self._count("statistics", self._statistics())
+            if script.startswith("ConvertTo-Json -InputObject @(Get-NetAdapter"):
+                return self._count("query", self._query(script))
+            if script.startswith("Get-NetAdapter |"):
+                rows = [adapter.row() for adapter in self.adapters]
+                return self._count("get_adapters", json.dumps(rows))
+            if re.match(r"(Enable|Disable)-NetAdapter ", script):
+                self._apply_changes(script)
+                return self._count("enable_disable", "")
+        raise FakeCommandError(f"対応していないスクリプトです: {script[:80]}")
+
+    def _count(self, kind: str, output: str) -> str:
+        """スクリプトの種類ごとの回数を記録して出力を返す."""
+        self.commands[kind] += 1
+        return output
+
+    def _find(self, name: str) -> FakeAdapter:
+        """名前でアダプターを探す."""
+        for adapter in self.adapters:
+            if adapter.name == name:
+                return adapter
+        raise FakeCommandError(f"アダプター '{name}' が見つかりません")
+
+    def _apply_changes(self, script: str) -> None:
+        """スクリプト中の有効化・無効化を順に反映."""
+        pattern = rf"(Enable|Disable)-NetAdapter -Name {_QUOTED}"
+        for verb, name in re.findall(pattern, script):
+            adapter = self._find(_unquote(name))
+            if verb == "Disable":
+                adapter.status = AdapterStatus.DISABLED.value
+            elif adapter.status == AdapterStatus.DISABLED.value:
+                adapter.status = AdapterStatus.UP.value
+
+    def _fast_switch(self, script: str) -> str:
+        """記憶したアダプター名での切り替え（確認・変更・確認）."""
+        names = re.search(rf"Get-NetAdapter -Name ({_QUOTED}(?:, {_QUOTED})*)", script)
+        if names is None:
+            raise FakeCommandError("アダプター名が指定されていません")
+        selected = [
+            self._find(_unquote(name)) for name in re.findall(_QUOTED, names.group(1))
+        ]
+        before = [adapter.row() for adapter in selected]
+
+        pattern = (
+            rf"Where-Object Name -eq {_QUOTED}\)"
+            rf"\.InterfaceDescription -ne {_QUOTED}"
+        )
+        for name, description in re.findall(pattern, script):
+            adapter = self._find(_unquote(name))
+            if adapter.interface_description != _unquote(description):
+                raise FakeCommandError("adapter changed")
+
+        self._apply_changes(script)
+        after = [adapter.row() for adapter in selected]
+        return json.dumps({"Before": before, "After": after})
+
+    def _query(self, script: str) -> str:
+        """Where-Objectでの絞り込みとSelect-Objectでの属性の選択."""
+        adapters = self.adapters
+        if "Get-NetAdapter -Physical" in script:
+            adapters = [a for a in adapters if a.physical]
+
+        media_types = re.search(r"\$_\.MediaType -in @\(([^)]*)\)", script)
+        if media_types is not None:
+            allowed = {_unquote(m) for m in re.findall(_QUOTED, media_types.group(1))}
+            adapters = [a for a in adapters if a.media_type in allowed]
+        statuses = re.search(r"\$_\.Status -in @\(([^)]*)\)", script)
+        if statuses is not None:
+            allowed = {_unquote(s) for s in re.findall(_QUOTED, statuses.group(1))}
+            adapters = [a for a in adapters if a.status in allowed]
+        name_pattern = re.search(rf"\$_\.Name -like {_QUOTED}", script)
+        if name_pattern is not None:
+            adapters = [
+                a
+                for a in adapters
+                if fnmatch.fnmatchcase(a.name, _unquote(name_pattern.group(1)))
+            ]
+
+        selected = re.search(r"Select-Object ([\w, ]+)\)", script)
+        properties = selected.group(1).split(", ") if selected else ["Name"]
+        rows = [
+            {prop: adapter.row().get(prop) for prop in properties}
+            for adapter in adapters
+        ]
+        return json.dumps(rows)
+
+    def _details(self, script: str) -> str:
+        """Get-NetAdapterとGet-NetIPConfigurationをまとめた詳細."""
+        name = re.search(rf"Get-NetAdapter -Name {_QUOTED}", script)
+        if name is None:
+            raise FakeCommandError("アダプター名が指定されていません")
+        adapter = self._find(_unquote(name.group(1)))
+        up = adapter.status == AdapterStatus.UP.value
+        index = self.adapters.index(adapter)
+        return json.dumps(
+            {
+                "Name": adapter.name,
+                "MacAddress": f"00-15-5D-00-00-{index:02X}",
+                "LinkSpeed": adapter.link_speed,
+                "IPv4": [f"192.168.{index}.10"] if up else [],
+                "IPv6": [],
+                "Gateways": [f"192.168.{index}.1"] if up else [],
+                "Dns": ["192.168.0.1"] if up else [],
+            }
+        )
+
+    def _statistics(self) -> str:
+        """Get-NetAdapterStatistics相当（接続中のアダプターのカウンターを進める）."""
+        rows = []
+        for adapter in self.adapters:
+            if adapter.status == AdapterStatus.UP.value:
+                adapter.received_bytes += 150_000
+                adapter.sent_bytes += 20_000
+            rows.append(
+                {
+                    "Name": adapter.name,
+                    "ReceivedBytes": adapter.received_bytes,
+                    "SentBytes": adapter.sent_bytes,
+                    "ReceivedUnicastPackets": adapter.received_bytes // 1500,
+                    "SentUnicastPackets": adapter.sent_bytes // 1500,
+                }
+            )
+        return json.dumps(rows)
+
+
+class FakePowerShellRunner(PowerShellRunner):
+    """PowerShellの代わりにFakePowerShellBackendの応答を返すランナー.
+
+    応答は子プロセスに出力させるため、デッドライン・キャンセル・
+    プロセスの回収は実際のPowerShellと同じ経路を通る.
+    """
+
+    def __init__(self, backend: FakePowerShellBackend) -> None:
+        """ランナーを初期化."""
+        super().__init__()
+        self.backend = backend
+
+    def run(
+        self,
+        script: str,
+        *,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> "subprocess.CompletedProcess[str]":
+        """偽のPowerShellでスクリプトを実行."""
+        try:
+            stdout, stderr, returncode = self.backend.respond(script), "", 0
+        except FakeCommandError as e:
+            stdout, stderr, returncode = "", str(e), 1
+        cmd = [
+            sys.executable,
+            "-I",
+            "-S",
+            "-c",
+            _ECHO_SCRIPT,
+            stdout,
+            stderr,
+            str(returncode),
+        ]
+        return self.run_process(cmd, timeout=timeout, cancel=cancel)
+
+    def _probe(self) -> bool:
+        """偽のPowerShellは常に応答する."""
+        return True
+
+
+class _SoakNetworkManager(NetworkManager):
+    """偽のPowerShellに対して使うNetworkManager（管理者権限の確認を省略）."""
+
+    @staticmethod
+    def is_admin() -> bool:
+        """偽のPowerShellでは常に管理者として扱う."""
+        return True
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """あるサイクル終了時点のリソース使用量（取得できない値はNone）."""
+
+    cycle: int
+    elapsed: float
+    rss_bytes: int | None
+    open_handles: int | None
+    threads: int | None
+    child_processes: int | None
+    tk_objects: int | None = None
+    tk_pending_callbacks: int | None = None
+
+
+# 増加量を比べるリソースと、SoakConfigのしきい値の属性名
+_GROWTH_LIMITS = (
+    ("rss_bytes", "max_rss_growth_bytes"),
+    ("open_handles", "max_handle_growth"),
+    ("threads", "max_thread_growth"),
+    ("tk_objects", "max_tk_object_growth"),
+    ("tk_pending_callbacks", "max_pending_callback_growth"),
+)
+
+
+def _proc_status(field_name: str) -> int | None:
+    """/proc/self/status の数値項目（kBは単位を除いた値）."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith(f"{field_name}:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _child_process_count() -> int | None:
+    """このプロセスを親とするプロセス（回収されていないゾンビを含む）の数."""
+    try:
+        entries = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return None
+    pid = os.getpid()
+    count = 0
+    for entry in entries:
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii", errors="replace") as f:
+                stat = f.read()
+        except OSError:
+            continue  # 読み取り中に終了したプロセス
+        # プロセス名に空白や括弧を含み得るため、最後の ")" の後ろを分割する
+        fields = stat[stat.rfind(")") + 2 :].split()
+        if len(fields) > 1 and fields[1] == str(pid):
+            count += 1
+    return count
+
+
+def _windows_counters() -> tuple[int | None, int | None]:
+    """Windowsでのワーキングセット（バイト）とハンドル数."""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        process = kernel32.GetCurrentProcess()
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        rss = None
+        if kernel32.K32GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            rss = int(counters.WorkingSetSize)
+
+        handles = wintypes.DWORD()
+        count = None
+        if kernel32.GetProcessHandleCount(process, ctypes.byref(handles)):
+            count = int(handles.value)
+        return rss, count
+    except Exception as e:
+        logger.warning(f"リソース使用量を取得できません: {e}")
+        return None, None
+
+
+def _count_tk_objects(widget: tk.Misc) -> int:
+    """ウィジェットとその子孫、キャンバス上の図形の数."""
+    count = 1
+    if isinstance(widget, tk.Canvas):
+        count += len(widget.find_all())
+    for child in widget.winfo_children():
+        count += _count_tk_objects(child)
+    return count
+
+
+def sample_resources(
+    cycle: int, elapsed: float, root: tk.Misc | None = None
+) -> ResourceSample:
+    """現在のリソース使用量を記録.
+
+    Linuxでは /proc から、Windowsではワーキングセットとハンドル数を取得する.
+    スレッド数は取得できればOSのスレッド数、なければPythonのスレッド数.
+    """
+    if sys.platform == "win32":
+        rss, handles = _windows_counters()
+        threads = threading.active_count()
+        children = None
+    else:
+        rss_kb = _proc_status("VmRSS")
+        rss = None if rss_kb is None else rss_kb * 1024
+        try:
+            handles = len(os.listdir("/proc/self/fd"))
+        except OSError:
+            handles = None
+        threads = _proc_status("Threads") or threading.active_count()
+        children = _child_process_count()
+
+    tk_objects = pending = None
+    if root is not None:
+        tk_objects = _count_tk_objects(root)
+        pending = int(root.tk.eval("llength [after info]"))
+    return ResourceSample(
+        cycle, elapsed, rss, handles, threads, children, tk_objects, pending
+    )
+
+
+@dataclass(frozen=True)
+class SoakConfig:
+    """ソークテストの設定としきい値.
+
+    増加量はウォームアップ後の最初と最後の区間（window の割合）の平均の差で、
+    所要時間は同じ区間の中央値の比で判定する.
+    子プロセスは開始時より多いまま最後の区間で残り続けている数で判定する.
+    """
+
+    cycles: int = 1000
+    sample_interval: int = 10
+    warmup_cycles: int = 50
+    window: float = 0.2
+    gui: bool | None = None  # Noneなら表示できる環境でのみGUIを使う
+    operation_timeout: float = 30.0
+    max_rss_growth_bytes: int = 32 * MIB
+    max_handle_growth: int = 8
+    max_thread_growth: int = 2
+    max_child_processes: int = 0
+    max_tk_object_growth: int = 50
+    max_pending_callback_growth: int = 2
+    max_latency_drift: float = 0.5
+    latency_drift_floor: float = 0.01
+
+    def __post_init__(self) -> None:
+        """設定値を検証.
+
+        Raises:
+            ValueError: サイクル数・区間の指定が不正な場合
+        """
+        if self.cycles <= self.warmup_cycles:
+            raise ValueError(
+                "cycles はウォームアップのサイクル数より大きくしてください"
+            )
+        if self.sample_interval < 1:
+            raise ValueError("sample_interval は1以上にしてください")
+        if not 0 < self.window <= 0.5:
+            raise ValueError("window は0より大きく0.5以下にしてください")
+
+
+@dataclass(frozen=True)
+class ResourceTrend:
+    """リソースの推移."""
+
+    metric: str
+    first: float
+    last: float
+    growth: float
+    slope_per_1000_cycles: float
+    peak: float
+
+
+@dataclass(frozen=True)
+class LatencyTrend:
+    """操作ごとの所要時間（秒）の推移."""
+
+    operation: str
+    calls: int
+    first_median: float
+    last_median: float
+    drift: float  # 最後の中央値 / 最初の中央値 - 1
+    p95: float
+
+
+@dataclass(frozen=True)
+class SoakReport:
+    """ソークテストの結果."""
+
+    cycles: int
+    gui: bool
+    elapsed: float
+    spawns: int
+    samples: tuple[ResourceSample, ...]
+    resources: tuple[ResourceTrend, ...]
+    latencies: tuple[LatencyTrend, ...]
+    errors: tuple[str, ...]
+    failures: tuple[str, ...]
+
+    @property
+    def passed(self) -> bool:
+        """しきい値を超えた増加・劣化・操作の失敗がなかったかどうか."""
+        return not self.failures
+
+    def to_dict(self) -> dict[str, object]:
+        """JSONに変換できる辞書."""
+        data = asdict(self)
+        data["passed"] = self.passed
+        return data
+
+    def format(self) -> str:
+        """推移をまとめたテキストのレポート."""
+        mode = "GUIあり" if self.gui else "GUIなし"
+        lines = [
+            f"ソークテスト: {self.cycles}サイクル（{mode}）、"
+            f"{self.elapsed:.1f}秒、PowerShell起動 {self.spawns} 回",
+            "",
+            "リソース（ウォームアップ後の最初の区間 → 最後の区間）",
+        ]
+        for trend in self.resources:
+            scale, unit = (MIB, " MiB") if trend.metric == "rss_bytes" else (1, "")
+            lines.append(
+                f"  {trend.metric}: {trend.first / scale:.1f}{unit} → "
+                f"{trend.last / scale:.1f}{unit}"
+                f"（{trend.growth / scale:+.1f}{unit}、"
+                f"傾き {trend.slope_per_1000_cycles / scale:+.1f}{unit}/1000サイクル、"
+                f"最大 {trend.peak / scale:.1f}{unit}）"
+            )
+        lines += ["", "操作ごとの所要時間（中央値）"]
+        for latency in self.latencies:
+            lines.append(
+                f"  {latency.operation}: {latency.first_median:.4f}秒 → "
+                f"{latency.last_median:.4f}秒（{latency.drift:+.1%}）、"
+                f"p95 {latency.p95:.4f}秒、{latency.calls}回"
+            )
+        lines += ["", "結果: " + ("合格" if self.passed else "不合格")]
+        lines += [f"- {failure}" for failure in self.failures]
+        return "\n".join(lines)
+
+
+def _window_size(count: int, window: float) -> int:
+    """区間に含める件数（少なくとも1件）."""
+    return max(1, int(count * window))
+
+
+def _slope(points: list[tuple[int, float]]) -> float:
+    """最小二乗法による1サイクルあたりの傾き."""
+    if len(points) < 2:
+        return 0.0
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def _resource_trends(
+    config: SoakConfig, samples: Sequence[ResourceSample]
+) -> tuple[list[ResourceTrend], list[str]]:
+    """ウォームアップ後のリソースの推移と、しきい値を超えた項目."""
+    measured = [s for s in samples if s.cycle >= config.warmup_cycles]
+    trends: list[ResourceTrend] = []
+    failures: list[str] = []
+    metrics = [metric for metric, _ in _GROWTH_LIMITS] + ["child_processes"]
+    for metric in metrics:
+        points = [
+            (s.cycle, float(value))
+            for s in measured
+            if (value := getattr(s, metric)) is not None
+        ]
+        if not points:
+            continue
+        size = _window_size(len(points), config.window)
+        first = statistics.fmean(y for _, y in points[:size])
+        last_values = [y for _, y in points[-size:]]
+        last = statistics.fmean(last_values)
+        trend = ResourceTrend(
+            metric,
+            first,
+            last,
+            last - first,
+            _slope(points) * 1000,
+            max(y for _, y in points),
+        )
+        trends.append(trend)
+
+        if metric == "child_processes":
+            # 一時的な子プロセスは許容し、開始時（resource_trackerなど）より
+            # 多いまま最後の区間で残り続けている場合だけ失敗
+            baseline = samples[0].child_processes or 0
+            remaining = min(last_values) - baseline
+            if remaining > config.max_child_processes:
+                failures.append(
+                    f"子プロセスが {remaining:.0f} 個残っています"
+                    f"（上限 {config.max_child_processes}）"
+                )
+            continue
+        limit = getattr(config, dict(_GROWTH_LIMITS)[metric])
+        if trend.growth > limit:
+            failures.append(
+                f"{metric} が {trend.growth:+.1f} 増加しました（上限 {limit}）"
+            )
+    return trends, failures
+
+
+def _latency_trends(
+    config: SoakConfig, latencies: dict[str, list[float]]
+) -> tuple[list[LatencyTrend], list[str]]:
+    """ウォームアップ後の操作ごとの所要時間の推移と、劣化した操作."""
+    trends: list[LatencyTrend] = []
+    failures: list[str] = []
+    for operation, durations in latencies.items():
+        measured = durations[config.warmup_cycles :]
+        if not measured:
+            continue
+        size = _window_size(len(measured), config.window)
+        first = statistics.median(measured[:size])
+        last = statistics.median(measured[-size:])
+        drift = last / first - 1 if first > 0 else 0.0
+        p95 = sorted(measured)[min(len(measured) - 1, int(len(measured) * 0.95))]
+        trends.append(LatencyTrend(operation, len(durations), first, last, drift, p95))
+        if (
+            drift > config.max_latency_drift
+            and last - first > config.latency_drift_floor
+        ):
+            failures.append(
+                f"{operation} の所要時間が {first:.4f}秒 から {last:.4f}秒 に"
+                f"劣化しました（{drift:+.0%}、上限 {config.max_latency_drift:+.0%}）"
+            )
+    return trends, failures
+
+
+def build_report(
+    config: SoakConfig,
+    samples: Sequence[ResourceSample],
+    latencies: dict[str, list[float]],
+    errors: Sequence[str] = (),
+    gui: bool = False,
+    elapsed: float = 0.0,
+    spawns: int = 0,
+) -> SoakReport:
+    """記録した値から推移を求め、しきい値と比べたレポートを作成."""
+    resources, failures = _resource_trends(config, samples)
+    latency_trends, latency_failures = _latency_trends(config, latencies)
+    failures += latency_failures
+    if errors:
+        failures.append(f"操作が {len(errors)} 回失敗しました（最初: {errors[0]}）")
+    return SoakReport(
+        cycles=config.cycles,
+        gui=gui,
+        elapsed=elapsed,
+        spawns=spawns,
+        samples=tuple(samples),
+        resources=tuple(resources),
+        latencies=tuple(latency_trends),
+        errors=tuple(errors),
+        failures=tuple(failures),
+    )
+
+
+Operation = tuple[str, Callable[[], object]]
+
+
+class _ManagerDriver:
+    """NetworkManagerを直接操作するドライバー."""
+
+    def __init__(self, manager: NetworkManager, timeout: float) -> None:
+        """ドライバーを初期化."""
+        self.manager = manager
+        self.root: tk.Tk | None = None
+        self.operations: list[Operation] = [
+            ("get_adapters", lambda: manager.get_adapters(timeout=timeout)),
+            ("switch_to_wifi", lambda: manager.switch_to_wifi(timeout=timeout)),
+            (
+                "get_adapter_details",
+                lambda: manager.get_adapter_details("Wi-Fi", timeout=timeout),
+            ),
+            ("switch_to_ethernet", lambda: manager.switch_to_ethernet(timeout=timeout)),
+        ]
+
+    def call(self, operation: Callable[[], object]) -> str | None:
+        """操作を実行し、失敗した場合はその内容を返す."""
+        try:
+            operation()
+        except NetworkManagerError as e:
+            return str(e)
+        return None
+
+    def pump(self) -> None:
+        """GUIがないため何もしない."""
+
+    def close(self) -> None:
+        """実行中の操作を止める."""
+        self.manager.runner.shutdown()
+
+
+class _DialogRecorder:
+    """ダイアログを表示せずに記録する（GUIのdialogsに渡す）."""
+
+    def __init__(self) -> None:
+        """記録を初期化."""
+        self.problems: list[str] = []
+
+    def showinfo(self, title: str, message: str, **options: object) -> str:
+        """情報は記録しない."""
+        return "ok"
+
+    def showwarning(self, title: str, message: str, **options: object) -> str:
+        """警告を記録."""
+        self.problems.append(f"{title}: {message}")
+        return "ok"
+
+    def showerror(self, title: str, message: str, **options: object) -> str:
+        """エラーを記録."""
+        self.problems.append(f"{title}: {message}")
+        return "ok"
+
+    def askyesno(self, title: str, message: str, **options: object) -> bool:
+        """確認には常に「はい」と答える."""
+        return True
+
+
+class _HeadlessGUI(NetworkAdapterGUI):
+    """ソークテスト用のGUI（共有メモリは実行中のアプリケーションと別の名前）."""
+
+    @staticmethod
+    def _create_state_publisher() -> AdapterStatePublisher | None:
+        """このソークテストだけの共有メモリを作成."""
+        return AdapterStatePublisher(f"nas_soak_{uuid.uuid4().hex[:12]}")
+
+    def _create_traffic_runner(self) -> PowerShellRunner:
+        """通信量も同じ偽のPowerShellから別のランナーで取得."""
+        runner = self.network_manager.runner
+        assert isinstance(runner, FakePowerShellRunner)
+        return FakePowerShellRunner(runner.backend)
+
+
+class _GuiDriver:
+    """非表示のウィンドウでNetworkAdapterGUIを操作するドライバー."""
+
+    def __init__(self, root: tk.Tk, manager: NetworkManager) -> None:
+        """ダイアログを記録するGUIを作成."""
+        self.root: tk.Tk | None = root
+        self.dialogs = _DialogRecorder()
+        self.gui = _HeadlessGUI(root, network_manager=manager, dialogs=self.dialogs)
+        gui = self.gui
+        self.operations: list[Operation] = [
+            ("gui._refresh_status", gui._refresh_status),
+            ("gui._switch_to_wifi", lambda: gui._switch_to_wifi(confirm=False)),
+            ("gui._switch_to_ethernet", lambda: gui._switch_to_ethernet(confirm=False)),
+        ]
+
+    def call(self, operation: Callable[[], object]) -> str | None:
+        """操作を実行し、エラー・警告のダイアログが出た場合はその内容を返す."""
+        shown = len(self.dialogs.problems)
+        operation()
+        problems = self.dialogs.problems[shown:]
+        return "; ".join(problems) if problems else None
+
+    def pump(self) -> None:
+        """保留中のイベントとafterの処理を実行."""
+        if self.root is not None:
+            self.root.update()
+
+    def close(self) -> None:
+        """ウィンドウを閉じる."""
+        if self.root is not None:
+            self.gui._on_close()
+            self.root = None
+
+
+def _create_root(required: bool) -> tk.Tk | None:
+    """非表示のルートウィンドウを作成（表示できない環境ではNone）.
+
+    Raises:
+        SoakError: requiredで表示できない場合
+    """
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        if required:
+            raise SoakError(f"表示できる環境がないためGUIを起動できません: {e}") from e
+        logger.info(f"表示できる環境がないためGUIなしで実行します: {e}")
+        return None
+    root.withdraw()
+    return root
+
+
+def run_soak(
+    config: SoakConfig | None = None,
+    backend: FakePowerShellBackend | None = None,
+    progress: Callable[[ResourceSample], None] | None = None,
+) -> SoakReport:
+    """偽のPowerShellに対して操作を繰り返し、推移のレポートを返す.
+
+    Args:
+        config: 設定としきい値（省略時は既定値）
+        backend: 偽のPowerShell（省略時は既定の構成）
+        progress: リソース使用量を記録するたびに呼ばれる関数
+
+    Raises:
+        SoakError: GUIを要求したが表示できない場合
+    """
+    config = config or SoakConfig()
+    backend = backend or FakePowerShellBackend()
+    runner = FakePowerShellRunner(backend)
+    latencies: dict[str, list[float]] = {}
+    errors: list[str] = []
+
+    with tempfile.TemporaryDirectory(prefix="nas-soak-") as state:
+        manager = _SoakNetworkManager(
+            runner=runner,
+            state_path=Path(state),
+            wifi_connector=WifiConnector(FakePowerShellRunner(backend), WifiConfig()),
+        )
+        root = _create_root(config.gui is True) if config.gui is not False else None
+        driver: _ManagerDriver | _GuiDriver = (
+            _ManagerDriver(manager, config.operation_timeout)
+            if root is None
+            else _GuiDriver(root, manager)
+        )
+
+        start = time.monotonic()
+        try:
+            samples = [sample_resources(0, 0.0, driver.root)]
+            for cycle in range(1, config.cycles + 1):
+                for name, operation in driver.operations:
+                    began = time.perf_counter()
+                    error = driver.call(operation)
+                    latencies.setdefault(name, []).append(time.perf_counter() - began)
+                    if error is not None:
+                        errors.append(f"サイクル{cycle} {name}: {error}")
+                    driver.pump()
+
+                if cycle % config.sample_interval == 0 or cycle == config.cycles:
+                    gc.collect()
+                    sample = sample_resources(
+                        cycle, time.monotonic() - start, driver.root
+                    )
+                    samples.append(sample)
+                    if progress is not None:
+                        progress(sample)
+        finally:
+            driver.close()
+
+    return build_report(
+        config,
+        samples,
+        latencies,
+        errors,
+        gui=root is not None,
+        elapsed=time.monotonic() - start,
+        spawns=runner.spawn_count,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析."""
+    defaults = SoakConfig()
+    parser = argparse.ArgumentParser(
+        description="偽のPowerShellに対して操作を繰り返し、"
+        "リソースの増加と応答時間の劣化を調べる"
+    )
+    parser.add_argument("--cycles", type=int, default=defaults.cycles)
+    parser.add_argument(
+        "--sample-interval",
+        type=int,
+        default=defaults.sample_interval,
+        help="リソース使用量を記録するサイクル間隔",
+    )
+    parser.add_argument("--warmup", type=int, default=defaults.warmup_cycles)
+    gui = parser.add_mutually_exclusive_group()
+    gui.add_argument(
+        "--gui", dest="gui", action="store_true", default=None, help="GUIも操作する"
+    )
+    gui.add_argument(
+        "--no-gui", dest="gui", action="store_false", help="NetworkManagerだけを操作"
+    )
+    parser.add_argument(
+        "--max-rss-growth-mb",
+        type=float,
+        default=defaults.max_rss_growth_bytes / MIB,
+    )
+    parser.add_argument(
+        "--max-handle-growth", type=int, default=defaults.max_handle_growth
+    )
+    parser.add_argument(
+        "--max-thread-growth", type=int, default=defaults.max_thread_growth
+    )
+    parser.add_argument(
+        "--max-latency-drift",
+        type=float,
+        default=defaults.max_latency_drift,
+        help="所要時間の中央値の劣化の上限（0.5なら50%%）",
+    )
+    parser.add_argument(
+        "--report", type=Path, default=None, help="JSON形式のレポートの出力先"
+    )
+    parser.add_argument("--verbose", action="store_true", help="操作のログを表示")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """ソークテストを実行し、合格なら0、不合格なら1を返す."""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        config = SoakConfig(
+            cycles=args.cycles,
+            sample_interval=args.sample_interval,
+            warmup_cycles=args.warmup,
+            gui=args.gui,
+            max_rss_growth_bytes=int(args.max_rss_growth_mb * MIB),
+            max_handle_growth=args.max_handle_growth,
+            max_thread_growth=args.max_thread_growth,
+            max_latency_drift=args.max_latency_drift,
+        )
+        report = run_soak(
+            config,
+            progress=lambda s: print(
+                f"サイクル {s.cycle}/{args.cycles}: RSS "
+                f"{(s.rss_bytes or 0) / MIB:.1f} MiB、ハンドル {s.open_handles}、"
+                f"スレッド {s.threads}",
+                file=sys.stderr,
+            ),
+        )
+    except (ValueError, SoakError) as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        return 2
+
+    print(report.format())
+    if args.report is not None:
+        args.report.write_text(
+            json.dumps(report.to_dict(), ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""アダプターごとの通信量を定期的に収集するモジュール."""
+
+import json
+import logging
+import subprocess
+import sys
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+from src.powershell import PowerShellError, PowerShellRunner
+
+logger = logging.getLogger(__name__)
+
+# 既定のサンプリング間隔（秒）とリングバッファの長さ
+# WindowsではサンプリングのたびにPowerShellを起動するため、間隔は長めにする
+DEFAULT_INTERVAL = 5.0
+DEFAULT_CAPACITY = 120
+
+
+class TrafficStatsError(Exception):
+    """通信量収集のエラー."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class CounterSample:
+    """アダプター1つ分のカウンター値."""
+
+    rx_bytes: int
+    tx_bytes: int
+    rx_packets: int
+    tx_packets: int
+
+
+class StatisticsSource(Protocol):
+    """カウンター値の取得元."""
+
+    def read(self) -> dict[str, CounterSample]:
+        """アダプター名ごとのカウンター値を返す."""
+        ...
+
+
+class RingBuffer:
+    """配列を使った固定長のリングバッファ（float）."""
+
+    __slots__ = ("_data", "_head", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        """バッファを初期化."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._data = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        """最大要素数."""
+        return len(self._data)
+
+    def __len__(self) -> int:
+        """格納されている要素数."""
+        return self._count
+
+    def append(self, value: float) -> None:
+        """値を追加（満杯なら最古の値を上書き）."""
+        self._data[self._head] = value
+        self._head = (self._head + 1) % len(self._data)
+        if self._count < len(self._data):
+            self._count += 1
+
+    def latest(self) -> float:
+        """最新の値（空なら0.0）."""
+        if self._count == 0:
+            return 0.0
+        return self._data[self._head - 1]
+
+    def values(self) -> list[float]:
+        """古い順の値のリスト."""
+        start = (self._head - self._count) % len(self._data)
+        if start + self._count <= len(self._data):
+            return self._data[start : start + self._count].tolist()
+        return (self._data[start:] + self._data[: self._head]).tolist()
+
+
+class AdapterTraffic:
+    """アダプター1つ分の通信レート履歴."""
+
+    __slots__ = (
+        "rx_bps",
+        "tx_bps",
+        "rx_pps",
+        "tx_pps",
+        "absent_ticks",
+        "_last",
+        "_last_time",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        """履歴を初期化."""
+        self.rx_bps = RingBuffer(capacity)
+        self.tx_bps = RingBuffer(capacity)
+        self.rx_pps = RingBuffer(capacity)
+        self.tx_pps = RingBuffer(capacity)
+        self.absent_ticks = 0  # 連続してカウンター値がなかった回数
+        self._last: CounterSample | None = None
+        self._last_time = 0.0
+
+    def update(self, sample: CounterSample | None, now: float) -> None:
+        """新しいカウンター値から前回との差分でレートを計算して追加.
+
+        カウンター値がない（アダプターが消えた）場合は0を追加し、
+        カウンターが巻き戻った場合は基準値だけを更新する.
+        """
+        last, last_time = self._last, self._last_time
+        self._last, self._last_time = sample, now
+
+        if sample is None:
+            self.absent_ticks += 1
+            self._append(0.0, 0.0, 0.0, 0.0)
+            return
+        self.absent_ticks = 0
+        if last is None:
+            return
+
+        elapsed = now - last_time
+        deltas = (
+            sample.rx_bytes - last.rx_bytes,
+            sample.tx_bytes - last.tx_bytes,
+            sample.rx_packets - last.rx_packets,
+            sample.tx_packets - last.tx_packets,
+        )
+        if elapsed <= 0 or min(deltas) < 0:
+            return
+
+        self._append(
+            deltas[0] * 8 / elapsed,
+            deltas[1] * 8 / elapsed,
+            deltas[2] / elapsed,
+            deltas[3] / elapsed,
+        )
+
+    def _append(
+        self, rx_bps: float, tx_bps: float, rx_pps: float, tx_pps: float
+    ) -> None:
+        """各リングバッファにレートを追加."""
+        self.rx_bps.append(rx_bps)
+        self.tx_bps.append(tx_bps)
+        self.rx_pps.append(rx_pps)
+        self.tx_pps.append(tx_pps)
+
+
+class PowerShellStatisticsSource:
+    """Get-NetAdapterStatisticsからカウンター値を取得（Windows）."""
+
+    def __init__(self, runner: PowerShellRunner, timeout: float = 10.0) -> None:
+        """取得元を初期化."""
+        self.runner = runner
+        self.timeout = timeout
+
+    def read(self) -> dict[str, CounterSample]:
+        """アダプター名ごとのカウンター値を返す."""
+        ps_command = (
+            "Get-NetAdapterStatistics | "
+            "Select-Object Name, ReceivedBytes, SentBytes, "
+            "ReceivedUnicastPackets, SentUnicastPackets | "
+            "ConvertTo-Json"
+        )
+        try:
+            result = self.runner.run(ps_command, timeout=self.timeout)
+            data = json.loads(result.stdout) if result.stdout.strip() else []
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            raise TrafficStatsError(f"通信量の取得に失敗: {e}") from e
+        except json.JSONDecodeError as e:
+            raise TrafficStatsError(f"通信量の解析に失敗: {e}") from e
+
+        if isinstance(data, dict):
+            data = [data]
+
+        return {
+            entry.get("Name", ""): CounterSample(
+                rx_bytes=int(entry.get("ReceivedBytes") or 0),
+                tx_bytes=int(entry.get("SentBytes") or 0),
+                rx_packets=int(entry.get("ReceivedUnicastPackets") or 0),
+                tx_packets=int(entry.get("SentUnicastPackets") or 0),
+            )
+            for entry in data
+        }
+
+
+class SysfsStatisticsSource:
+    """/sys/class/net からカウンター値を取得（Linux）."""
+
+    COUNTERS = ("rx_bytes", "tx_bytes", "rx_packets", "tx_packets")
+
+    def __init__(self, root: Path = Path("/sys/class/net")) -> None:
+        """取得元を初期化."""
+        self.root = root
+
+    def read(self) -> dict[str, CounterSample]:
+        """アダプター名ごとのカウンター値を返す."""
+        samples: dict[str, CounterSample] = {}
+        try:
+            interfaces = list(self.root.iterdir())
+        except OSError as e:
+            raise TrafficStatsError(f"通信量の取得に失敗: {e}") from e
+
+        for interface in interfaces:
+            try:
+                values = [
+                    int((interface / "statistics" / name).read_text())
+                    for name in self.COUNTERS
+                ]
+            except (OSError, ValueError):
+                continue
+            samples[interface.name] = CounterSample(*values)
+        return samples
+
+
+def default_source(runner: PowerShellRunner) -> StatisticsSource:
+    """実行環境に応じたカウンター値の取得元を返す."""
+    if sys.platform == "win32":
+        return PowerShellStatisticsSource(runner)
+    return SysfsStatisticsSource()
+
+
+class TrafficSampler:
+    """カウンター値を定期的に読み取り、レートをリングバッファに蓄積するクラス."""
+
+    def __init__(
+        self,
+        source: StatisticsSource,
+        interval: float = DEFAULT_INTERVAL,
+        capacity: int = DEFAULT_CAPACITY,
+        evict_after: int | None = None,
+    ) -> None:
+        """サンプラーを初期化.
+
+        Args:
+            source: カウンター値の取得元
+            interval: サンプリング間隔（秒）
+            capacity: アダプターごとに保持するサンプル数
+            evict_after: この回数続けて見つからないアダプターの履歴を破棄
+                （省略時はcapacity、つまり履歴がすべて0になった時点）
+        """
+        self.source = source
+        self.interval = interval
+        self.capacity = capacity
+        self.evict_after = capacity if evict_after is None else evict_after
+
+        self._lock = threading.Lock()
+        self._traffic: dict[str, AdapterTraffic] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """バックグラウンドでのサンプリングを開始."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="traffic-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """サンプリングを停止."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def sample_once(self, now: float | None = None) -> None:
+        """カウンター値を1回読み取ってレートを更新."""
+        samples = self.source.read()
+        if now is None:
+            now = time.monotonic()
+
+        with self._lock:
+            for name, sample in samples.items():
+                traffic = self._traffic.get(name)
+                if traffic is None:
+                    traffic = self._traffic[name] = AdapterTraffic(self.capacity)
+                traffic.update(sample, now)
+            # 消えたアダプター（VPN・仮想アダプターなど）の履歴は一定回数で破棄し、
+            # 名前が入れ替わり続けても保持する量が増えないようにする
+            for name, traffic in list(self._traffic.items()):
+                if name in samples:
+                    continue
+                traffic.update(None, now)
+                if traffic.absent_ticks >= self.evict_after:
+                    del self._traffic[name]
+
+    def adapter_names(self) -> list[str]:
+        """サンプリング済みのアダプター名."""
+        with self._lock:
+            return list(self._traffic)
+
+    def series(self, name: str) -> tuple[list[float], list[float]]:
+        """受信・送信レート（bps）の履歴を古い順に返す."""
+        with self._lock:
+            traffic = self._traffic.get(name)
+            if traffic is None:
+                return [], []
+            return traffic.rx_bps.values(), traffic.tx_bps.values()
+
+    def latest(self, name: str) -> tuple[float, float]:
+        """最新の受信・送信レート（bps）を返す."""
+        with self._lock:
+            traffic = self._traffic.get(name)
+            if traffic is None:
+                return 0.0, 0.0
+            return traffic.rx_bps.latest(), traffic.tx_bps.latest()
+
+    def _run(self) -> None:
+        """サンプリングループ."""
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except TrafficStatsError as e:
+                logger.warning(f"通信量のサンプリングに失敗: {e}")
+            self._stop.wait(self.interval)
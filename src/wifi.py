@@ -0,0 +1,413 @@
+"""優先SSIDへのWi-Fi高速再接続.
+
+アダプターを有効化した直後に、Windowsの自動選択を待たずに
+設定済みの優先プロファイルへ直接接続する.
+netshはPowerShellを介さずに直接実行する.
+netshの出力は表示言語によって項目名が変わるため、
+パーサーは項目名に依存しない手がかり（行頭の "SSID"、"BSSID"、"%" 表記）を優先して使う.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src.powershell import CancellationToken, PowerShellError, PowerShellRunner
+
+logger = logging.getLogger(__name__)
+
+# スキャン結果を再利用する既定の秒数
+DEFAULT_SCAN_TTL = 10.0
+
+# 接続完了（アソシエーション）を待つ既定の秒数と確認間隔
+DEFAULT_ASSOCIATION_TIMEOUT = 15.0
+DEFAULT_POLL_INTERVAL = 0.5
+
+# netshはコンソールのコードページ（OEM）で出力する
+NETSH_ENCODING = "oem" if sys.platform == "win32" else "utf-8"
+
+# 表示言語ごとの項目名
+_AUTHENTICATION_KEYS = frozenset(("Authentication", "認証"))
+_INTERFACE_NAME_KEYS = frozenset(("Name", "名前"))
+_PROFILE_KEYS = frozenset(("Profile", "プロファイル"))
+
+
+class WifiError(Exception):
+    """Wi-Fi操作のエラー."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class WifiNetwork:
+    """スキャンで見つかったネットワーク（SSID単位）."""
+
+    ssid: str
+    signal_percent: int
+    authentication: str = ""
+    bssid_count: int = 0
+
+
+@dataclass(frozen=True)
+class WifiInterfaceState:
+    """Wi-Fiインターフェース1つ分の接続状態."""
+
+    name: str
+    ssid: str | None = None
+    signal_percent: int = 0
+    profile: str | None = None
+
+    @property
+    def connected(self) -> bool:
+        """いずれかのSSIDに接続しているかどうか."""
+        return self.ssid is not None
+
+
+@dataclass(frozen=True)
+class AssociationResult:
+    """優先SSIDへの接続結果."""
+
+    ssid: str
+    signal_percent: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class WifiConfig:
+    """優先SSIDの設定."""
+
+    preferred_ssids: tuple[str, ...] = ()
+    scan_ttl: float = DEFAULT_SCAN_TTL
+    association_timeout: float = DEFAULT_ASSOCIATION_TIMEOUT
+
+    @classmethod
+    def from_env(cls) -> "WifiConfig":
+        """環境変数から設定を作成.
+
+        WIFI_PREFERRED_SSIDS: 優先SSID（カンマ区切り、プロファイル名はSSIDと同じ）
+        """
+        ssids_env = os.environ.get("WIFI_PREFERRED_SSIDS", "")
+        ssids = tuple(s.strip() for s in ssids_env.split(",") if s.strip())
+        return cls(preferred_ssids=ssids)
+
+
+def _split_field(line: str) -> tuple[str, str]:
+    """ "項目名 : 値" の行を最初のコロンで分割（値にはコロンを含み得る）."""
+    key, _, value = line.partition(":")
+    return key.strip(), value.strip()
+
+
+def _parse_percent(value: str) -> int | None:
+    """ "82%" 形式の値を整数に変換（該当しなければNone）."""
+    if value.endswith("%") and value[:-1].isdigit():
+        return int(value[:-1])
+    return None
+
+
+def parse_networks(text: str) -> list[WifiNetwork]:
+    """`netsh wlan show networks mode=bssid` の出力を解析.
+
+    信号強度はSSIDに属するBSSIDのうち最も強い値を使う.
+    SSIDが空（ステルス）のネットワークは除外する.
+    """
+    networks: list[WifiNetwork] = []
+    ssid: str | None = None
+    signal = 0
+    authentication = ""
+    bssids = 0
+
+    def flush() -> None:
+        if ssid:
+            networks.append(WifiNetwork(ssid, signal, authentication, bssids))
+
+    for line in text.splitlines():
+        if not line or line[0].isspace():
+            if ssid is None or ":" not in line:
+                continue
+            key, value = _split_field(line)
+            if key.startswith("BSSID"):
+                bssids += 1
+            elif key in _AUTHENTICATION_KEYS:
+                authentication = value
+            else:
+                percent = _parse_percent(value)
+                if percent is not None and percent > signal:
+                    signal = percent
+        elif line.startswith("SSID"):
+            flush()
+            ssid = _split_field(line)[1]
+            signal, authentication, bssids = 0, "", 0
+
+    flush()
+    return networks
+
+
+def parse_interfaces(text: str) -> list[WifiInterfaceState]:
+    """`netsh wlan show interfaces` の出力を解析."""
+    states: list[WifiInterfaceState] = []
+    fields: dict[str, str] | None = None
+
+    def flush() -> None:
+        if fields is not None:
+            states.append(
+                WifiInterfaceState(
+                    name=fields["name"],
+                    ssid=fields.get("ssid"),
+                    signal_percent=int(fields.get("signal", "0")),
+                    profile=fields.get("profile"),
+                )
+            )
+
+    for line in text.splitlines():
+        if ":" not in line:
+            continue
+        key, value = _split_field(line)
+        if key in _INTERFACE_NAME_KEYS:
+            flush()
+            fields = {"name": value}
+        elif fields is None:
+            continue
+        elif key == "SSID":
+            if value:
+                fields["ssid"] = value
+        elif key in _PROFILE_KEYS:
+            fields["profile"] = value
+        else:
+            percent = _parse_percent(value)
+            if percent is not None:
+                fields["signal"] = str(percent)
+
+    flush()
+    return states
+
+
+def choose_network(
+    networks: list[WifiNetwork], preferred_ssids: tuple[str, ...]
+) -> WifiNetwork | None:
+    """見えている優先SSIDのうち信号強度が最も強いものを返す.
+
+    信号強度が同じ場合は優先SSIDの並び順で先のものを選ぶ.
+    """
+    rank = {ssid: i for i, ssid in enumerate(preferred_ssids)}
+    candidates = [n for n in networks if n.ssid in rank]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda n: (n.signal_percent, -rank[n.ssid]))
+
+
+def _run_netsh(
+    runner: PowerShellRunner,
+    *args: str,
+    timeout: float | None,
+    cancel: CancellationToken | None,
+) -> "subprocess.CompletedProcess[str]":
+    """`netsh wlan <args>` を直接実行.
+
+    netshの失敗はPowerShellの応答とは無関係なため、ブレーカーには記録しない.
+    """
+    return runner.run_process(
+        ["netsh", "wlan", *args],
+        timeout=timeout,
+        cancel=cancel,
+        use_breaker=False,
+        encoding=NETSH_ENCODING,
+    )
+
+
+class WifiScanner:
+    """netshのスキャン結果をTTL付きでキャッシュするクラス."""
+
+    def __init__(
+        self,
+        runner: PowerShellRunner,
+        ttl: float = DEFAULT_SCAN_TTL,
+    ) -> None:
+        """スキャナーを初期化.
+
+        Args:
+            runner: netshの実行に使うランナー
+            ttl: スキャン結果を再利用する秒数
+        """
+        self.runner = runner
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._cache: dict[str, tuple[float, list[WifiNetwork]]] = {}
+
+    def invalidate(self) -> None:
+        """キャッシュを破棄."""
+        with self._lock:
+            self._cache.clear()
+
+    def scan(
+        self,
+        interface: str,
+        *,
+        force: bool = False,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> list[WifiNetwork]:
+        """インターフェースから見えているネットワークを返す."""
+        now = time.monotonic()
+        if not force:
+            with self._lock:
+                cached = self._cache.get(interface)
+            if cached is not None and now - cached[0] < self.ttl:
+                return cached[1]
+
+        try:
+            result = _run_netsh(
+                self.runner,
+                "show",
+                "networks",
+                "mode=bssid",
+                f"interface={interface}",
+                timeout=timeout,
+                cancel=cancel,
+            )
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            raise WifiError(f"Wi-Fiのスキャンに失敗: {e}") from e
+
+        networks = parse_networks(result.stdout)
+        with self._lock:
+            self._cache[interface] = (time.monotonic(), networks)
+        return networks
+
+
+class WifiConnector:
+    """優先SSIDへ直接接続し、接続完了までの時間を計測するクラス."""
+
+    def __init__(
+        self,
+        runner: PowerShellRunner,
+        config: WifiConfig | None = None,
+        scanner: WifiScanner | None = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        """接続処理を初期化.
+
+        Args:
+            runner: netshの実行に使うランナー（PowerShellの起動回数やブレーカーと
+                分けるため、アダプター操作とは別のランナーを渡す）
+            config: 優先SSIDの設定（省略時は環境変数から作成）
+            scanner: スキャン結果の取得元（省略時はconfigのTTLで生成）
+            poll_interval: スキャン・接続状態の確認間隔（秒）
+        """
+        self.runner = runner
+        self.config = config or WifiConfig.from_env()
+        self.scanner = scanner or WifiScanner(runner, ttl=self.config.scan_ttl)
+        self.poll_interval = poll_interval
+
+    @property
+    def enabled(self) -> bool:
+        """優先SSIDが設定されているかどうか."""
+        return bool(self.config.preferred_ssids)
+
+    def interface_state(
+        self,
+        interface: str,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> WifiInterfaceState | None:
+        """インターフェースの接続状態を取得."""
+        try:
+            result = _run_netsh(
+                self.runner, "show", "interfaces", timeout=timeout, cancel=cancel
+            )
+        except (PowerShellError, subprocess.CalledProcessError) as e:
+            raise WifiError(f"Wi-Fiの状態取得に失敗: {e}") from e
+        for state in parse_interfaces(result.stdout):
+            if state.name == interface:
+                return state
+        return None
+
+    def connect_preferred(
+        self,
+        interface: str,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> AssociationResult:
+        """見えている優先SSIDのうち最も強いものに接続し、接続完了まで待つ.
+
+        有効化直後はスキャン結果が揃っていない・インターフェースの準備ができておらず
+        スキャン自体が失敗することがあるため、優先SSIDが見つかるまでスキャンを繰り返す.
+
+        Raises:
+            WifiError: 優先SSIDが見つからない・接続が時間内に完了しない場合
+        """
+        if timeout is None:
+            timeout = self.config.association_timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        def remaining() -> float:
+            return max(deadline - time.monotonic(), 0.0)
+
+        network = self._scan_preferred(interface, remaining, cancel)
+
+        current = self.interface_state(interface, timeout=remaining(), cancel=cancel)
+        if current is None or current.ssid != network.ssid:
+            try:
+                _run_netsh(
+                    self.runner,
+                    "connect",
+                    f"name={network.ssid}",
+                    f"ssid={network.ssid}",
+                    f"interface={interface}",
+                    timeout=remaining(),
+                    cancel=cancel,
+                )
+            except (PowerShellError, subprocess.CalledProcessError) as e:
+                raise WifiError(f"'{network.ssid}' への接続に失敗: {e}") from e
+
+            while current is None or current.ssid != network.ssid:
+                # 確認間隔だけ待った後に確認する時間が残っていなければ打ち切る
+                # （デッドライン間際にnetshを起動しない）
+                if remaining() < 2 * self.poll_interval:
+                    raise WifiError(f"'{network.ssid}' への接続が完了しませんでした")
+                time.sleep(self.poll_interval)
+                current = self.interface_state(
+                    interface, timeout=remaining(), cancel=cancel
+                )
+
+        seconds = time.monotonic() - start
+        logger.info(
+            f"'{network.ssid}'（信号 {network.signal_percent}%）に"
+            f"{seconds:.2f}秒で接続しました"
+        )
+        return AssociationResult(network.ssid, network.signal_percent, seconds)
+
+    def _scan_preferred(
+        self,
+        interface: str,
+        remaining: Callable[[], float],
+        cancel: CancellationToken | None,
+    ) -> WifiNetwork:
+        """優先SSIDが見つかるまでスキャンを繰り返す（失敗したスキャンも再試行）.
+
+        Raises:
+            WifiError: 時間内に優先SSIDが見つからない場合・キャンセルされた場合
+        """
+        force = False
+        while True:
+            error: WifiError | None = None
+            try:
+                networks = self.scanner.scan(
+                    interface, force=force, timeout=remaining(), cancel=cancel
+                )
+            except WifiError as e:
+                if cancel is not None and cancel.cancelled:
+                    raise
+                logger.debug(f"スキャンに失敗したため再試行します: {e}")
+                error, networks = e, []
+            network = choose_network(networks, self.config.preferred_ssids)
+            if network is not None:
+                return network
+            if remaining() < 2 * self.poll_interval:
+                raise error or WifiError("優先SSIDが見つかりません")
+            time.sleep(self.poll_interval)
+            force = True
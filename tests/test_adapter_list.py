@@ -0,0 +1,189 @@
+"""AdapterListModelのテスト."""
+
+import time
+
+import pytest
+
+from src.adapter_list import AdapterListModel, detail_rows, format_link_speed
+from src.models.models import (
+    AdapterDetails,
+    AdapterStatus,
+    AdapterType,
+    NetworkAdapter,
+)
+
+
+def _adapter(
+    name: str,
+    status: AdapterStatus = AdapterStatus.UP,
+    adapter_type: AdapterType = AdapterType.ETHERNET,
+    link_speed_bps: int = 0,
+    description: str = "Test",
+) -> NetworkAdapter:
+    """テスト用のアダプターを作成."""
+    return NetworkAdapter(
+        name=name,
+        interface_description=description,
+        status=status,
+        adapter_type=adapter_type,
+        link_speed_bps=link_speed_bps,
+    )
+
+
+class TestAdapterListModel:
+    """AdapterListModelのテストクラス."""
+
+    def test_initial_update_inserts_all(self) -> None:
+        """初回更新ですべての行が追加されるテスト."""
+        model = AdapterListModel()
+        changes = model.update([_adapter("Ethernet"), _adapter("Wi-Fi")])
+
+        assert sorted(changes.inserted) == ["Ethernet", "Wi-Fi"]
+        assert changes.updated == []
+        assert changes.removed == []
+        assert len(model) == 2
+
+    def test_incremental_update(self) -> None:
+        """変化した行だけが差分として返るテスト."""
+        model = AdapterListModel()
+        model.update([_adapter("Ethernet"), _adapter("Wi-Fi"), _adapter("VPN")])
+
+        changes = model.update(
+            [
+                _adapter("Ethernet"),
+                _adapter("Wi-Fi", status=AdapterStatus.DISABLED),
+                _adapter("Bluetooth"),
+            ]
+        )
+
+        assert changes.inserted == ["Bluetooth"]
+        assert changes.updated == ["Wi-Fi"]
+        assert changes.removed == ["VPN"]
+
+    def test_no_changes(self) -> None:
+        """変化がなければ空の差分になるテスト."""
+        model = AdapterListModel()
+        model.update([_adapter("Ethernet")])
+
+        assert not model.update([_adapter("Ethernet")])
+
+    def test_sort_toggle(self) -> None:
+        """同じ列を選ぶと昇順・降順が反転するテスト."""
+        model = AdapterListModel()
+        model.update(
+            [
+                _adapter("B", link_speed_bps=100),
+                _adapter("A", link_speed_bps=1000),
+                _adapter("C", link_speed_bps=10),
+            ]
+        )
+
+        assert model.visible_rows() == ["A", "B", "C"]
+
+        model.set_sort("link_speed")
+        assert model.visible_rows() == ["C", "B", "A"]
+
+        model.set_sort("link_speed")
+        assert model.visible_rows() == ["A", "B", "C"]
+
+    def test_sort_unknown_column(self) -> None:
+        """存在しない列での並び替えはエラーになるテスト."""
+        with pytest.raises(ValueError):
+            AdapterListModel().set_sort("unknown")
+
+    def test_filter(self) -> None:
+        """名前・種類・状態・説明の部分一致で絞り込むテスト."""
+        model = AdapterListModel()
+        model.update(
+            [
+                _adapter("Ethernet", description="Realtek PCIe GbE"),
+                _adapter("Wi-Fi", adapter_type=AdapterType.WIFI),
+                _adapter("vEthernet (Default Switch)", status=AdapterStatus.DISABLED),
+            ]
+        )
+
+        model.set_filter("ethernet")
+        assert model.visible_rows() == ["Ethernet", "vEthernet (Default Switch)"]
+
+        model.set_filter("disabled")
+        assert model.visible_rows() == ["vEthernet (Default Switch)"]
+
+        model.set_filter("realtek")
+        assert model.visible_rows() == ["Ethernet"]
+
+        model.set_filter("  ")
+        assert len(model.visible_rows()) == 3
+
+    def test_row_values(self) -> None:
+        """行の表示値のテスト."""
+        model = AdapterListModel()
+        model.update(
+            [
+                _adapter(
+                    "Wi-Fi",
+                    adapter_type=AdapterType.WIFI,
+                    link_speed_bps=866_700_000,
+                    description="Intel(R) Wi-Fi 6 AX200",
+                )
+            ]
+        )
+
+        assert model.row_values("Wi-Fi") == (
+            "Wi-Fi",
+            "Wi-Fi",
+            "Up",
+            "866.7 Mbps",
+            "Intel(R) Wi-Fi 6 AX200",
+        )
+
+    def test_many_adapters(self) -> None:
+        """数百件のアダプターでも差分計算と並び替えが速いテスト."""
+        model = AdapterListModel()
+        adapters = [_adapter(f"Adapter {i:04d}", link_speed_bps=i) for i in range(500)]
+        model.update(adapters)
+
+        start = time.perf_counter()
+        changes = model.update(
+            adapters[:-1] + [_adapter("Adapter 0499", status=AdapterStatus.DISABLED)]
+        )
+        model.set_sort("link_speed")
+        rows = model.visible_rows()
+
+        assert time.perf_counter() - start < 0.5
+        assert changes.updated == ["Adapter 0499"]
+        assert len(rows) == 500
+
+
+@pytest.mark.parametrize(
+    "bps,expected",
+    [
+        (0, ""),
+        (10**9, "1 Gbps"),
+        (2_500_000_000, "2.5 Gbps"),
+        (100 * 10**6, "100 Mbps"),
+        (54_000, "54 kbps"),
+    ],
+)
+def test_format_link_speed(bps: int, expected: str) -> None:
+    """リンク速度の表示文字列テスト."""
+    assert format_link_speed(bps) == expected
+
+
+def test_detail_rows() -> None:
+    """詳細表示の行のテスト."""
+    details = AdapterDetails(
+        name="Ethernet",
+        mac_address="8C-C6-81-AA-BB-CC",
+        link_speed_bps=10**9,
+        ipv4_addresses=("192.168.1.10",),
+        dns_servers=("192.168.1.1", "1.1.1.1"),
+    )
+
+    assert dict(detail_rows(details)) == {
+        "MACアドレス": "8C-C6-81-AA-BB-CC",
+        "リンク速度": "1 Gbps",
+        "IPv4アドレス": "192.168.1.10",
+        "IPv6アドレス": "-",
+        "ゲートウェイ": "-",
+        "DNSサーバー": "192.168.1.1, 1.1.1.1",
+    }
@@ -0,0 +1,213 @@
+"""LinkProberのテスト（ループバックアドレスをアダプターの代わりに使用）."""
+
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from src.link_probe import (
+    LinkProbeError,
+    LinkProber,
+    ProbeCandidate,
+    ProbeConfig,
+    ProbeResult,
+    ProbeTarget,
+    rank_results,
+)
+
+FAST_ADDRESS = "127.0.0.1"
+SLOW_ADDRESS = "127.0.0.2"
+
+
+class StreamServer:
+    """接続元アドレスごとに送信速度を変えてデータを送り続けるTCPサーバー."""
+
+    def __init__(self, slow_sources: set[str]) -> None:
+        """サーバーを初期化."""
+        self.slow_sources = slow_sources
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((FAST_ADDRESS, 0))
+        self.sock.listen(64)
+        self.port = self.sock.getsockname()[1]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn, addr = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self._stream, args=(conn, addr[0]), daemon=True
+            ).start()
+
+    def _stream(self, conn: socket.socket, source: str) -> None:
+        chunk = b"x" * 65536
+        slow = source in self.slow_sources
+        with conn:
+            try:
+                while not self._stop.is_set():
+                    conn.sendall(chunk[:1024] if slow else chunk)
+                    if slow:
+                        time.sleep(0.01)
+            except OSError:
+                return
+
+    def close(self) -> None:
+        self._stop.set()
+        self.sock.close()
+
+
+@pytest.fixture
+def server() -> Iterator[StreamServer]:
+    """SLOW_ADDRESSからの接続だけ低速になるサーバー."""
+    srv = StreamServer(slow_sources={SLOW_ADDRESS})
+    yield srv
+    srv.close()
+
+
+class TestProbeTarget:
+    """ProbeTargetのテストクラス."""
+
+    def test_parse(self) -> None:
+        """host:port形式の解析テスト."""
+        target = ProbeTarget.parse("1.1.1.1:443")
+        assert target == ProbeTarget(host="1.1.1.1", port=443)
+
+    @pytest.mark.parametrize("text", ["1.1.1.1", ":443", "host:abc"])
+    def test_parse_invalid(self, text: str) -> None:
+        """不正な形式のテスト."""
+        with pytest.raises(LinkProbeError):
+            ProbeTarget.parse(text)
+
+    def test_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """環境変数からの設定読み込みテスト."""
+        monkeypatch.setenv("PROBE_TARGETS", "10.0.0.1:80, 10.0.0.2:443")
+        monkeypatch.setenv("PROBE_THROUGHPUT_TARGET", "example.com:80")
+        monkeypatch.setenv("PROBE_THROUGHPUT_PATH", "/file")
+
+        config = ProbeConfig.from_env()
+
+        assert [t.host for t in config.rtt_targets] == ["10.0.0.1", "10.0.0.2"]
+        assert config.throughput_target is not None
+        assert config.throughput_target.request.startswith(b"GET /file HTTP/1.0")
+
+
+class TestRankResults:
+    """rank_resultsのテストクラス."""
+
+    def test_throughput_beats_link_speed(self) -> None:
+        """リンク速度よりも実測スループットを優先するテスト."""
+        ethernet = ProbeResult(
+            name="Ethernet",
+            link_speed_bps=10**9,
+            rtt_ms=5.0,
+            jitter_ms=1.0,
+            throughput_bps=50e6,
+        )
+        wifi = ProbeResult(
+            name="Wi-Fi",
+            link_speed_bps=300 * 10**6,
+            rtt_ms=8.0,
+            jitter_ms=2.0,
+            throughput_bps=200e6,
+        )
+
+        assert [r.name for r in rank_results([ethernet, wifi])] == ["Wi-Fi", "Ethernet"]
+
+    def test_unreachable_last(self) -> None:
+        """到達できないアダプターは最後になるテスト."""
+        down = ProbeResult(name="Ethernet", link_speed_bps=10**9, error="down")
+        up = ProbeResult(name="Wi-Fi", link_speed_bps=0, rtt_ms=20.0, jitter_ms=1.0)
+
+        assert [r.name for r in rank_results([down, up])] == ["Wi-Fi", "Ethernet"]
+
+    def test_rtt_when_no_throughput(self) -> None:
+        """スループット未計測ならRTTの低い順になるテスト."""
+        a = ProbeResult(name="A", link_speed_bps=0, rtt_ms=30.0, jitter_ms=1.0)
+        b = ProbeResult(name="B", link_speed_bps=0, rtt_ms=10.0, jitter_ms=1.0)
+
+        assert [r.name for r in rank_results([a, b])] == ["B", "A"]
+
+
+class TestLinkProber:
+    """LinkProberのテストクラス."""
+
+    def test_probe_ranks_faster_source_first(self, server: StreamServer) -> None:
+        """送信元アドレスごとに計測し、速い方を推奨するテスト."""
+        target = ProbeTarget(host=FAST_ADDRESS, port=server.port)
+        config = ProbeConfig(
+            rtt_targets=(target,),
+            rtt_samples=3,
+            throughput_target=target,
+            throughput_duration=0.3,
+        )
+        prober = LinkProber(config)
+
+        results = prober.probe(
+            [
+                ProbeCandidate("Ethernet", SLOW_ADDRESS, link_speed_bps=10**9),
+                ProbeCandidate("Wi-Fi", FAST_ADDRESS, link_speed_bps=300 * 10**6),
+            ]
+        )
+
+        assert [r.name for r in results] == ["Wi-Fi", "Ethernet"]
+        assert all(r.reachable for r in results)
+        assert results[0].throughput_bps is not None
+        assert results[1].throughput_bps is not None
+        assert results[0].throughput_bps > results[1].throughput_bps
+
+    def test_probe_runs_concurrently(self, server: StreamServer) -> None:
+        """全候補が並行に計測されるテスト."""
+        target = ProbeTarget(host=FAST_ADDRESS, port=server.port)
+        config = ProbeConfig(
+            rtt_targets=(target,),
+            rtt_samples=1,
+            throughput_target=target,
+            throughput_duration=0.5,
+        )
+        candidates = [ProbeCandidate(f"A{i}", FAST_ADDRESS) for i in range(4)]
+
+        start = time.monotonic()
+        LinkProber(config).probe(candidates)
+
+        assert time.monotonic() - start < 0.5 * len(candidates)
+
+    def test_probe_without_address(self) -> None:
+        """IPアドレスがないアダプターは計測不可になるテスト."""
+        result = LinkProber().probe_one(ProbeCandidate("Wi-Fi", None))
+
+        assert result.reachable is False
+        assert result.error is not None
+
+    def test_jitter_is_measured_per_target(self) -> None:
+        """計測先どうしのRTTの差をジッターに含めないテスト."""
+        prober = LinkProber()
+        with patch.object(
+            prober, "_measure_rtts", return_value=[[10.0, 10.0, 10.0], [50.0, 50.0]]
+        ):
+            result = prober.probe_one(ProbeCandidate("Ethernet", FAST_ADDRESS))
+
+        assert result.rtt_ms == 30.0
+        assert result.jitter_ms == 0.0
+
+    def test_probe_unreachable_target(self) -> None:
+        """計測先に接続できない場合のテスト."""
+        with socket.socket() as sock:
+            sock.bind((FAST_ADDRESS, 0))
+            closed_port = sock.getsockname()[1]
+        config = ProbeConfig(
+            rtt_targets=(ProbeTarget(FAST_ADDRESS, closed_port),),
+            rtt_samples=2,
+            connect_timeout=0.5,
+        )
+
+        result = LinkProber(config).probe_one(ProbeCandidate("Ethernet", FAST_ADDRESS))
+
+        assert result.reachable is False
@@ -0,0 +1,246 @@
+"""メトリクスとエクスポーターのテスト."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.metrics import (
+    MetricsRegistry,
+    MetricsServer,
+    NetworkMetrics,
+    metrics_port_from_env,
+)
+from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+from src.network_manager import NetworkManager, NetworkManagerError
+from src.powershell import PowerShellRunner, PowerShellTimeoutError
+
+
+def _mock_popen(stdout: str = "", returncode: int = 0) -> Mock:
+    """subprocess.Popenの戻り値となるプロセスのモックを作成."""
+    process = Mock()
+    process.pid = 12345
+    process.returncode = returncode
+    process.communicate.return_value = (stdout, "")
+    return process
+
+
+@pytest.fixture
+def server() -> Iterator[MetricsServer]:
+    """空きポートで待ち受けるメトリクスサーバー."""
+    registry = MetricsRegistry()
+    metrics_server = MetricsServer(registry, port=0)
+    metrics_server.start()
+    yield metrics_server
+    metrics_server.stop()
+
+
+def _fetch(server: MetricsServer, path: str = "/metrics") -> tuple[str, str]:
+    """サーバーから本文とContent-Typeを取得."""
+    host, port = server.address
+    with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5) as response:
+        return response.read().decode("utf-8"), response.headers["Content-Type"]
+
+
+class TestRegistry:
+    """MetricsRegistryのテストクラス."""
+
+    def test_render_counter_and_gauge(self) -> None:
+        """カウンターとゲージのテキスト形式のテスト."""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "A counter.", ("outcome",))
+        gauge = registry.gauge("test_value", "A gauge.")
+        counter.inc(outcome="success")
+        counter.inc(2, outcome="success")
+        gauge.set(1.5)
+
+        text = registry.render()
+
+        assert "# HELP test_total A counter.\n# TYPE test_total counter\n" in text
+        assert 'test_total{outcome="success"} 3\n' in text
+        assert "# TYPE test_value gauge\ntest_value 1.5\n" in text
+
+    def test_render_histogram(self) -> None:
+        """ヒストグラムのバケットが累積で出力されるテスト."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "test_seconds", "A histogram.", ("op",), buckets=(0.1, 1.0)
+        )
+        for value in (0.05, 0.5, 2.0):
+            histogram.observe(value, op="x")
+
+        lines = registry.render().splitlines()
+
+        assert 'test_seconds_bucket{op="x",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{op="x",le="1"} 2' in lines
+        assert 'test_seconds_bucket{op="x",le="+Inf"} 3' in lines
+        assert 'test_seconds_sum{op="x"} 2.55' in lines
+        assert 'test_seconds_count{op="x"} 3' in lines
+
+    def test_label_values_are_escaped(self) -> None:
+        """ラベル値の引用符・改行・バックスラッシュをエスケープするテスト."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("test_up", "Up.", ("name",))
+        gauge.set(1, name='a"b\\c\nd')
+
+        assert 'test_up{name="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+    def test_wrong_labels_rejected(self) -> None:
+        """ラベル名が一致しない場合のテスト."""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "A counter.", ("outcome",))
+
+        with pytest.raises(ValueError):
+            counter.inc(target="x")
+        with pytest.raises(ValueError):
+            counter.inc(-1, outcome="x")
+        with pytest.raises(ValueError):
+            registry.counter("test_total", "Duplicate.")
+
+    def test_concurrent_increments(self) -> None:
+        """複数スレッドからの加算が失われないテスト."""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "A counter.", ("worker",))
+
+        def work(worker: int) -> None:
+            for _ in range(2000):
+                counter.inc(worker=str(worker % 2))
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value(worker="0") + counter.value(worker="1") == 16000
+
+
+class TestMetricsServer:
+    """MetricsServerのテストクラス."""
+
+    def test_serves_metrics(self, server: MetricsServer) -> None:
+        """/metricsでテキスト形式を返すテスト."""
+        server.registry.counter("test_total", "A counter.").inc()
+
+        body, content_type = _fetch(server)
+
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert "test_total 1\n" in body
+
+    def test_unknown_path_returns_404(self, server: MetricsServer) -> None:
+        """/metrics以外は404を返すテスト."""
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            _fetch(server, "/")
+        assert excinfo.value.code == 404
+
+    def test_port_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """環境変数からポートを読み取るテスト."""
+        monkeypatch.setenv("NAS_METRICS_PORT", "9464")
+        assert metrics_port_from_env() == 9464
+        monkeypatch.setenv("NAS_METRICS_PORT", "abc")
+        assert metrics_port_from_env() is None
+        monkeypatch.delenv("NAS_METRICS_PORT")
+        assert metrics_port_from_env() is None
+
+
+class TestNetworkMetrics:
+    """NetworkManagerが更新するメトリクスのテストクラス."""
+
+    ADAPTERS = [
+        {
+            "Name": "Ethernet",
+            "InterfaceDescription": "Realtek PCIe GbE Family Controller",
+            "Status": "Up",
+            "LinkSpeed": "1 Gbps",
+        },
+        {
+            "Name": "Wi-Fi",
+            "InterfaceDescription": "Intel(R) Wi-Fi 6 AX200",
+            "Status": "Disabled",
+            "LinkSpeed": "0 bps",
+        },
+    ]
+
+    @patch("subprocess.Popen")
+    def test_adapter_gauges_and_spawns(self, mock_popen: Mock) -> None:
+        """アダプター状態・PowerShell起動数・所要時間が公開されるテスト."""
+        mock_popen.return_value = _mock_popen(json.dumps(self.ADAPTERS))
+        manager = NetworkManager()
+
+        manager.get_adapters()
+
+        text = manager.metrics.registry.render()
+        assert 'nas_adapter_up{name="Ethernet",type="Ethernet"} 1' in text
+        assert 'nas_adapter_up{name="Wi-Fi",type="Wi-Fi"} 0' in text
+        assert (
+            'nas_adapter_link_speed_bits_per_second{name="Ethernet",type="Ethernet"}'
+            " 1000000000" in text
+        )
+        assert "nas_powershell_spawns_total 1\n" in text
+        assert 'nas_circuit_breaker_state{state="closed"} 1' in text
+        assert 'nas_operation_duration_seconds_count{operation="get_adapters"} 1' in (
+            text
+        )
+
+    def test_removed_adapters_disappear(self) -> None:
+        """一覧から消えたアダプターのゲージが削除されるテスト."""
+        metrics = NetworkMetrics()
+        adapter = NetworkAdapter(
+            name="USB Ethernet",
+            interface_description="USB 3.0 Gigabit Ethernet",
+            status=AdapterStatus.UP,
+            adapter_type=AdapterType.ETHERNET,
+        )
+        metrics.record_adapters([adapter])
+        metrics.record_adapters([])
+
+        assert "USB Ethernet" not in metrics.registry.render()
+
+    def test_scrape_during_update_sees_previous_adapters(self) -> None:
+        """更新中に出力しても、以前か新しい一覧のどちらかだけが見えるテスト."""
+        metrics = NetworkMetrics()
+        old = NetworkAdapter(
+            "Ethernet", "Realtek PCIe GbE", AdapterStatus.UP, AdapterType.ETHERNET
+        )
+        new = NetworkAdapter(
+            "Wi-Fi", "Intel(R) Wi-Fi 6", AdapterStatus.UP, AdapterType.WIFI
+        )
+        metrics.record_adapters([old])
+        gauge = metrics.adapter_up
+        scraped: list[list[str]] = []
+        new_child = gauge._new_child
+
+        def scrape_then_create() -> object:
+            scraped.append([labels["name"] for _, labels, _ in gauge.samples()])
+            return new_child()
+
+        with patch.object(gauge, "_new_child", side_effect=scrape_then_create):
+            metrics.record_adapters([new])
+
+        assert scraped == [["Ethernet"]]
+        assert [labels["name"] for _, labels, _ in gauge.samples()] == ["Wi-Fi"]
+
+    def test_switch_outcomes(self) -> None:
+        """切り替えの結果ごとにカウンターが増えるテスト."""
+        manager = NetworkManager(runner=PowerShellRunner())
+        with (
+            patch.object(manager, "find_switch_adapters", return_value=(None, None)),
+        ):
+            with pytest.raises(NetworkManagerError):
+                manager.switch_to_wifi()
+
+        timeout = NetworkManagerError("有効化に失敗")
+        timeout.__cause__ = PowerShellTimeoutError("timeout")
+        with patch.object(manager, "find_switch_adapters", side_effect=timeout):
+            with pytest.raises(NetworkManagerError):
+                manager.switch_to_ethernet()
+
+        switches = manager.metrics.switches
+        assert switches.value(target="wifi", outcome="error") == 1
+        assert switches.value(target="ethernet", outcome="timeout") == 1
+        errors = manager.metrics.operation_errors
+        assert errors.value(operation="switch_to_wifi") == 1
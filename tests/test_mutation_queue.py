@@ -0,0 +1,190 @@
+"""変更キューのテスト."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+from src.mutation_queue import MutationOutcome, MutationQueue
+from src.network_manager import NetworkManager, NetworkManagerError
+
+
+def _block(queue: MutationQueue) -> threading.Event:
+    """ワーカーを止めておく要求を投入し、解放用のイベントを返す."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker() -> None:
+        started.set()
+        release.wait(5)
+
+    queue.submit("blocker", "block", blocker)
+    assert started.wait(5)
+    return release
+
+
+class TestMutationQueue:
+    """MutationQueueのテストクラス."""
+
+    def test_mutations_are_serialized(self) -> None:
+        """変更が同時に実行されないテスト."""
+        queue = MutationQueue()
+        active = 0
+        overlap = False
+        lock = threading.Lock()
+
+        def mutation() -> None:
+            nonlocal active, overlap
+            with lock:
+                active += 1
+                overlap = overlap or active > 1
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        futures = [queue.submit(i, "set", mutation) for i in range(10)]
+
+        outcomes = [f.result(timeout=5) for f in futures]
+        assert outcomes == [MutationOutcome.EXECUTED] * 10
+        assert not overlap
+
+    def test_same_pending_request_is_merged(self) -> None:
+        """実行待ちと同じ要求は合流するテスト."""
+        queue = MutationQueue()
+        release = _block(queue)
+        calls = MagicMock()
+
+        first = queue.submit(("adapter", "Wi-Fi"), "enable", calls)
+        second = queue.submit(("adapter", "Wi-Fi"), "enable", calls)
+        release.set()
+
+        assert first.result(timeout=5) == MutationOutcome.EXECUTED
+        assert second.result(timeout=5) == MutationOutcome.MERGED
+        calls.assert_called_once()
+
+    def test_rapid_toggles_collapse(self) -> None:
+        """連続した切り替えは最後の要求だけ実行されるテスト."""
+        queue = MutationQueue()
+        release = _block(queue)
+        executed: list[str] = []
+
+        futures = [
+            queue.submit("switch", target, lambda t=target: executed.append(t))
+            for target in ("ethernet", "wifi", "ethernet")
+        ]
+        assert queue.pending_count == 1
+        release.set()
+
+        outcomes = [f.result(timeout=5) for f in futures]
+        assert outcomes == [
+            MutationOutcome.SUPERSEDED,
+            MutationOutcome.SUPERSEDED,
+            MutationOutcome.EXECUTED,
+        ]
+        assert executed == ["ethernet"]
+
+    def test_error_shared_with_merged_requests(self) -> None:
+        """実行時の例外が合流した要求にも伝わるテスト."""
+        queue = MutationQueue()
+        release = _block(queue)
+        failing = MagicMock(side_effect=RuntimeError("failed"))
+
+        first = queue.submit("key", "action", failing)
+        second = queue.submit("key", "action", failing)
+        release.set()
+
+        with pytest.raises(RuntimeError):
+            first.result(timeout=5)
+        with pytest.raises(RuntimeError):
+            second.result(timeout=5)
+
+    def test_worker_exits_when_idle(self) -> None:
+        """要求がなくなるとワーカースレッドが終了するテスト."""
+        queue = MutationQueue()
+        queue.submit("key", "action", lambda: None).result(timeout=5)
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and any(
+            t.name == "mutation-queue" for t in threading.enumerate()
+        ):
+            time.sleep(0.01)
+        assert not any(t.name == "mutation-queue" for t in threading.enumerate())
+
+
+class TestNetworkManagerMutations:
+    """NetworkManagerの変更キュー経由の操作のテストクラス."""
+
+    ETHERNET = NetworkAdapter(
+        "Ethernet", "Realtek PCIe GbE", AdapterStatus.UP, AdapterType.ETHERNET
+    )
+    WIFI = NetworkAdapter(
+        "Wi-Fi", "Intel(R) Wi-Fi 6", AdapterStatus.DISABLED, AdapterType.WIFI
+    )
+
+    def test_superseded_switch_never_spawns(self) -> None:
+        """取り消された切り替えはPowerShellを起動しないテスト."""
+        manager = NetworkManager(runner=MagicMock())
+        release = _block(manager.mutations)
+        executed: list[str] = []
+
+        with (
+            patch.object(
+                manager, "_switch_to_ethernet", lambda t, c: executed.append("eth")
+            ),
+            patch.object(
+                manager, "_switch_to_wifi", lambda t, c: executed.append("wifi")
+            ),
+        ):
+            futures = [
+                manager.submit_switch_to_wifi(),
+                manager.submit_switch_to_ethernet(),
+                manager.submit_switch_to_ethernet(),
+            ]
+            release.set()
+            outcomes = [f.result(timeout=5) for f in futures]
+
+        assert outcomes == [
+            MutationOutcome.SUPERSEDED,
+            MutationOutcome.EXECUTED,
+            MutationOutcome.MERGED,
+        ]
+        assert executed == ["eth"]
+        manager.runner.run.assert_not_called()
+        mutations = manager.metrics.mutations
+        assert mutations.value(action="wifi", outcome="superseded") == 1
+        assert mutations.value(action="ethernet", outcome="merged") == 1
+
+    @patch.object(NetworkManager, "is_admin", return_value=True)
+    def test_switch_runs_nested_changes_inline(self, _: MagicMock) -> None:
+        """切り替え内部の有効化・無効化がキューを待たずに実行されるテスト."""
+        runner = MagicMock()
+        runner.run.return_value.returncode = 0
+        runner.run.return_value.stdout = "[]"
+        manager = NetworkManager(runner=runner)
+
+        with (
+            patch.object(
+                manager, "find_switch_adapters", return_value=(self.ETHERNET, self.WIFI)
+            ),
+        ):
+            manager.switch_to_wifi(timeout=5)
+
+        commands = [call.args[0] for call in runner.run.call_args_list]
+        assert commands[:2] == [
+            "Disable-NetAdapter -Name 'Ethernet' -Confirm:$false",
+            "Enable-NetAdapter -Name 'Wi-Fi' -Confirm:$false",
+        ]
+        # 変更後の状態の確認
+        assert commands[2].startswith("Get-NetAdapter")
+
+    @patch.object(NetworkManager, "is_admin", return_value=False)
+    def test_errors_reach_synchronous_callers(self, _: MagicMock) -> None:
+        """同期呼び出しでは実行時のエラーがそのまま送出されるテスト."""
+        manager = NetworkManager(runner=MagicMock())
+
+        with pytest.raises(NetworkManagerError, match="管理者権限"):
+            manager.enable_adapter("Wi-Fi")
+        with pytest.raises(NetworkManagerError):
+            manager.submit_disable_adapter("Wi-Fi").result(timeout=5)
@@ -1,12 +1,33 @@
 """NetworkManagerのテスト."""
 
 import json
+import subprocess
+from dataclasses import replace
+from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
-from src.network_manager import NetworkManager, NetworkManagerError
-from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+from src.network_manager import SWITCH_CANDIDATES, NetworkManager, NetworkManagerError
+from src.models.models import (
+    AdapterQuery,
+    AdapterStatus,
+    AdapterType,
+    InterfaceMetric,
+    NetworkAdapter,
+    SwitchMode,
+)
+from src.link_probe import ProbeResult
+from src.powershell import PowerShellTimeoutError
+
+
+def _mock_popen(stdout: str = "", returncode: int = 0) -> Mock:
+    """subprocess.Popenの戻り値となるプロセスのモックを作成."""
+    process = Mock()
+    process.pid = 12345
+    process.returncode = returncode
+    process.communicate.return_value = (stdout, "")
+    return process
 
 
 class TestNetworkManager:
@@ -81,12 +102,9 @@ class TestNetworkManager:
             },
         ]
 
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(mock_adapters)
-        mock_result.stderr = ""
+        mock_process = _mock_popen(json.dumps(mock_adapters))
 
-        with patch("subprocess.run", return_value=mock_result):
+        with patch("subprocess.Popen", return_value=mock_process):
             adapters = manager.get_adapters()
 
             assert len(adapters) == 2
@@ -107,12 +125,9 @@ class TestNetworkManager:
             "Status": "Up",
         }
 
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(mock_adapter)
-        mock_result.stderr = ""
+        mock_process = _mock_popen(json.dumps(mock_adapter))
 
-        with patch("subprocess.run", return_value=mock_result):
+        with patch("subprocess.Popen", return_value=mock_process):
             adapters = manager.get_adapters()
 
             assert len(adapters) == 1
@@ -124,7 +139,7 @@ class TestNetworkManager:
         manager = NetworkManager()
 
         with patch(
-            "subprocess.run",
+            "subprocess.Popen",
             side_effect=Exception("Command failed"),
         ):
             with pytest.raises(NetworkManagerError):
@@ -149,8 +164,11 @@ class TestNetworkManager:
             ),
         ]
 
-        with patch.object(manager, "get_adapters", return_value=mock_adapters):
+        with patch.object(
+            manager, "query_adapters", return_value=mock_adapters
+        ) as mock_query:
             ethernet = manager.find_ethernet_adapter()
+            mock_query.assert_called_once_with(SWITCH_CANDIDATES, None, None)
             assert ethernet is not None
             assert ethernet.name == "Ethernet"
             assert ethernet.adapter_type == AdapterType.ETHERNET
@@ -174,12 +192,81 @@ class TestNetworkManager:
             ),
         ]
 
-        with patch.object(manager, "get_adapters", return_value=mock_adapters):
+        with patch.object(manager, "query_adapters", return_value=mock_adapters):
             wifi = manager.find_wifi_adapter()
             assert wifi is not None
             assert wifi.name == "Wi-Fi"
             assert wifi.adapter_type == AdapterType.WIFI
 
+    def test_switch_queries_candidates_once(self, tmp_path: Path) -> None:
+        """切り替えでは候補を1回だけ問い合わせ、両方のアダプターを選ぶテスト."""
+        manager = NetworkManager(state_path=tmp_path)
+        candidates = [
+            NetworkAdapter(
+                "Ethernet", "Realtek PCIe GbE", AdapterStatus.UP, AdapterType.ETHERNET
+            ),
+            NetworkAdapter(
+                "Wi-Fi", "Intel(R) Wi-Fi 6", AdapterStatus.DISABLED, AdapterType.WIFI
+            ),
+        ]
+
+        with (
+            patch.object(
+                manager, "query_adapters", return_value=candidates
+            ) as mock_query,
+            patch.object(manager, "get_adapters", return_value=[]),
+            patch.object(manager, "disable_adapter") as mock_disable,
+            patch.object(manager, "enable_adapter") as mock_enable,
+        ):
+            manager.switch_to_wifi()
+
+        mock_query.assert_called_once_with(SWITCH_CANDIDATES, None, None)
+        mock_disable.assert_called_once_with("Ethernet", timeout=None, cancel=None)
+        mock_enable.assert_called_once_with("Wi-Fi", timeout=None, cancel=None)
+
+    def test_query_adapters_filters_in_pipeline(self) -> None:
+        """絞り込みと属性の選択をPowerShell側で行うテスト."""
+        runner = Mock()
+        runner.run.return_value = Mock(
+            stdout=json.dumps([{"Name": "Wi-Fi", "Status": "Up"}])
+        )
+        manager = NetworkManager(runner=runner)
+        query = AdapterQuery(
+            physical_only=True,
+            media_types=("Native 802.11",),
+            statuses=(AdapterStatus.UP, AdapterStatus.DISCONNECTED),
+            name_pattern="Wi-Fi*",
+            fields=("status",),
+        )
+
+        adapters = manager.query_adapters(query)
+
+        assert runner.run.call_args.args[0] == (
+            "ConvertTo-Json -InputObject @(Get-NetAdapter -Physical | "
+            "Where-Object { $_.MediaType -in @('Native 802.11') -and "
+            "$_.Status -in @('Up', 'Disconnected') -and $_.Name -like 'Wi-Fi*' } | "
+            "Select-Object Name, Status)"
+        )
+        assert adapters == [
+            NetworkAdapter("Wi-Fi", "", AdapterStatus.UP, AdapterType.UNKNOWN)
+        ]
+
+    def test_query_adapters_empty_result(self) -> None:
+        """条件に合うアダプターがない場合は空のリストを返すテスト."""
+        runner = Mock()
+        runner.run.return_value = Mock(stdout="[]")
+        manager = NetworkManager(runner=runner)
+
+        assert manager.query_adapters(AdapterQuery(name_pattern="vEthernet*")) == []
+        assert "Select-Object Name, InterfaceDescription, Status, LinkSpeed" in (
+            runner.run.call_args.args[0]
+        )
+
+    def test_adapter_query_rejects_unknown_field(self) -> None:
+        """NetworkAdapterにない属性の指定はエラーになるテスト."""
+        with pytest.raises(ValueError, match="mac_address"):
+            AdapterQuery(fields=("name", "mac_address"))
+
     def test_enable_adapter_no_admin(self) -> None:
         """管理者権限なしでのアダプター有効化テスト."""
         manager = NetworkManager()
@@ -192,12 +279,10 @@ class TestNetworkManager:
         """アダプター有効化成功のテスト."""
         manager = NetworkManager()
 
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stderr = ""
+        mock_process = _mock_popen()
 
         with patch.object(manager, "is_admin", return_value=True):
-            with patch("subprocess.run", return_value=mock_result):
+            with patch("subprocess.Popen", return_value=mock_process):
                 manager.enable_adapter("Ethernet")  # エラーが発生しないことを確認
 
     def test_disable_adapter_no_admin(self) -> None:
@@ -212,12 +297,10 @@ class TestNetworkManager:
         """アダプター無効化成功のテスト."""
         manager = NetworkManager()
 
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stderr = ""
+        mock_process = _mock_popen()
 
         with patch.object(manager, "is_admin", return_value=True):
-            with patch("subprocess.run", return_value=mock_result):
+            with patch("subprocess.Popen", return_value=mock_process):
                 manager.disable_adapter("Wi-Fi")  # エラーが発生しないことを確認
 
     def test_switch_to_ethernet_success(self) -> None:
@@ -227,27 +310,112 @@ class TestNetworkManager:
         ethernet_adapter = NetworkAdapter(
             name="Ethernet",
             interface_description="Realtek PCIe GbE Family Controller",
-            status=AdapterStatus.UP,
+            status=AdapterStatus.DISABLED,
             adapter_type=AdapterType.ETHERNET,
         )
 
         wifi_adapter = NetworkAdapter(
             name="Wi-Fi",
             interface_description="Intel(R) Wi-Fi 6 AX200",
-            status=AdapterStatus.DISABLED,
+            status=AdapterStatus.UP,
             adapter_type=AdapterType.WIFI,
         )
+        switched = [
+            replace(ethernet_adapter, status=AdapterStatus.UP),
+            replace(wifi_adapter, status=AdapterStatus.DISABLED),
+        ]
 
         with patch.object(
-            manager, "find_ethernet_adapter", return_value=ethernet_adapter
+            manager,
+            "find_switch_adapters",
+            return_value=(ethernet_adapter, wifi_adapter),
         ):
-            with patch.object(manager, "find_wifi_adapter", return_value=wifi_adapter):
+            with patch.object(manager, "get_adapters", return_value=switched):
                 with patch.object(manager, "disable_adapter") as mock_disable:
                     with patch.object(manager, "enable_adapter") as mock_enable:
                         manager.switch_to_ethernet()
 
-                        mock_disable.assert_called_once_with("Wi-Fi")
-                        mock_enable.assert_called_once_with("Ethernet")
+                        mock_disable.assert_called_once_with(
+                            "Wi-Fi", timeout=None, cancel=None
+                        )
+                        mock_enable.assert_called_once_with(
+                            "Ethernet", timeout=None, cancel=None
+                        )
+
+        report = manager.last_reconcile
+        assert report is not None
+        assert [step.action for step in report.executed] == ["disable", "enable"]
+        assert report.converged
+
+    def test_switch_to_ethernet_already_switched(self) -> None:
+        """すでにイーサネットに切り替わっている場合はPowerShellを起動しないテスト."""
+        runner = MagicMock()
+        manager = NetworkManager(runner=runner)
+
+        ethernet_adapter = NetworkAdapter(
+            name="Ethernet",
+            interface_description="Realtek PCIe GbE Family Controller",
+            status=AdapterStatus.UP,
+            adapter_type=AdapterType.ETHERNET,
+        )
+        wifi_adapter = NetworkAdapter(
+            name="Wi-Fi",
+            interface_description="Intel(R) Wi-Fi 6 AX200",
+            status=AdapterStatus.DISABLED,
+            adapter_type=AdapterType.WIFI,
+        )
+
+        with patch.object(
+            manager,
+            "find_switch_adapters",
+            return_value=(ethernet_adapter, wifi_adapter),
+        ):
+            manager.switch_to_ethernet()
+
+        runner.run.assert_not_called()
+        report = manager.last_reconcile
+        assert report is not None
+        assert report.plan.is_noop
+        assert report.converged
+
+    def test_switch_reports_drift(self) -> None:
+        """変更後も望ましい状態にならなければ差分として報告するテスト."""
+        manager = NetworkManager()
+
+        ethernet_adapter = NetworkAdapter(
+            name="Ethernet",
+            interface_description="Realtek PCIe GbE Family Controller",
+            status=AdapterStatus.DISABLED,
+            adapter_type=AdapterType.ETHERNET,
+        )
+        wifi_adapter = NetworkAdapter(
+            name="Wi-Fi",
+            interface_description="Intel(R) Wi-Fi 6 AX200",
+            status=AdapterStatus.DISABLED,
+            adapter_type=AdapterType.WIFI,
+        )
+
+        with (
+            patch.object(
+                manager,
+                "find_switch_adapters",
+                return_value=(ethernet_adapter, wifi_adapter),
+            ),
+            patch.object(
+                manager, "get_adapters", return_value=[ethernet_adapter, wifi_adapter]
+            ),
+            patch.object(manager, "disable_adapter") as mock_disable,
+            patch.object(manager, "enable_adapter"),
+        ):
+            manager.switch_to_ethernet()
+
+        mock_disable.assert_not_called()
+        report = manager.last_reconcile
+        assert report is not None
+        assert not report.converged
+        assert [(d.adapter_name, d.actual) for d in report.drift] == [
+            ("Ethernet", AdapterStatus.DISABLED)
+        ]
 
     def test_switch_to_ethernet_no_ethernet(self) -> None:
         """イーサネットアダプターがない場合のテスト."""
@@ -260,12 +428,13 @@ class TestNetworkManager:
             adapter_type=AdapterType.WIFI,
         )
 
-        with patch.object(manager, "find_ethernet_adapter", return_value=None):
-            with patch.object(manager, "find_wifi_adapter", return_value=wifi_adapter):
-                with pytest.raises(
-                    NetworkManagerError, match="イーサネットアダプターが見つかりません"
-                ):
-                    manager.switch_to_ethernet()
+        with patch.object(
+            manager, "find_switch_adapters", return_value=(None, wifi_adapter)
+        ):
+            with pytest.raises(
+                NetworkManagerError, match="イーサネットアダプターが見つかりません"
+            ):
+                manager.switch_to_ethernet()
 
     def test_switch_to_wifi_success(self) -> None:
         """Wi-Fi切り替え成功のテスト."""
@@ -286,15 +455,21 @@ class TestNetworkManager:
         )
 
         with patch.object(
-            manager, "find_ethernet_adapter", return_value=ethernet_adapter
+            manager,
+            "find_switch_adapters",
+            return_value=(ethernet_adapter, wifi_adapter),
         ):
-            with patch.object(manager, "find_wifi_adapter", return_value=wifi_adapter):
+            with patch.object(manager, "get_adapters", return_value=[]):
                 with patch.object(manager, "disable_adapter") as mock_disable:
                     with patch.object(manager, "enable_adapter") as mock_enable:
                         manager.switch_to_wifi()
 
-                        mock_disable.assert_called_once_with("Ethernet")
-                        mock_enable.assert_called_once_with("Wi-Fi")
+                    mock_disable.assert_called_once_with(
+                        "Ethernet", timeout=None, cancel=None
+                    )
+                    mock_enable.assert_called_once_with(
+                        "Wi-Fi", timeout=None, cancel=None
+                    )
 
     def test_switch_to_wifi_no_wifi(self) -> None:
         """Wi-Fiアダプターがない場合のテスト."""
@@ -308,10 +483,564 @@ class TestNetworkManager:
         )
 
         with patch.object(
-            manager, "find_ethernet_adapter", return_value=ethernet_adapter
+            manager, "find_switch_adapters", return_value=(ethernet_adapter, None)
         ):
-            with patch.object(manager, "find_wifi_adapter", return_value=None):
-                with pytest.raises(
-                    NetworkManagerError, match="Wi-Fiアダプターが見つかりません"
-                ):
+            with pytest.raises(
+                NetworkManagerError, match="Wi-Fiアダプターが見つかりません"
+            ):
+                manager.switch_to_wifi()
+
+    def test_get_adapters_timeout(self) -> None:
+        """タイムアウトがNetworkManagerErrorとして通知されるテスト."""
+        runner = Mock()
+        runner.run.side_effect = PowerShellTimeoutError("timeout")
+        manager = NetworkManager(runner=runner)
+
+        with pytest.raises(NetworkManagerError) as exc_info:
+            manager.get_adapters(timeout=1.0)
+
+        assert isinstance(exc_info.value.__cause__, PowerShellTimeoutError)
+        runner.run.assert_called_once()
+        assert runner.run.call_args.kwargs["timeout"] == 1.0
+
+    def test_switch_passes_remaining_deadline(self) -> None:
+        """切り替え全体のデッドラインが各操作に引き継がれるテスト."""
+        manager = NetworkManager()
+
+        ethernet_adapter = NetworkAdapter(
+            name="Ethernet",
+            interface_description="Realtek PCIe GbE Family Controller",
+            status=AdapterStatus.DISABLED,
+            adapter_type=AdapterType.ETHERNET,
+        )
+        wifi_adapter = NetworkAdapter(
+            name="Wi-Fi",
+            interface_description="Intel(R) Wi-Fi 6 AX200",
+            status=AdapterStatus.UP,
+            adapter_type=AdapterType.WIFI,
+        )
+
+        with patch.object(
+            manager,
+            "find_switch_adapters",
+            return_value=(ethernet_adapter, wifi_adapter),
+        ):
+            with patch.object(manager, "get_adapters", return_value=[]):
+                with patch.object(manager, "disable_adapter") as mock_disable:
+                    with patch.object(manager, "enable_adapter") as mock_enable:
+                        manager.switch_to_ethernet(timeout=10.0)
+
+                        for mock in (mock_disable, mock_enable):
+                            remaining = mock.call_args.kwargs["timeout"]
+                            assert 0 < remaining <= 10.0
+
+    @pytest.mark.parametrize(
+        "link_speed,expected",
+        [
+            ("1 Gbps", 10**9),
+            ("866.7 Mbps", 866_700_000),
+            ("100 Mbps", 100 * 10**6),
+            ("0 bps", 0),
+            (None, 0),
+            ("", 0),
+        ],
+    )
+    def test_parse_link_speed(self, link_speed: object, expected: int) -> None:
+        """LinkSpeed文字列の変換テスト."""
+        assert NetworkManager._parse_link_speed(link_speed) == expected
+
+    def test_get_adapters_link_speed(self) -> None:
+        """アダプター取得時にリンク速度を読み取るテスト."""
+        manager = NetworkManager()
+
+        mock_adapter = {
+            "Name": "Ethernet",
+            "InterfaceDescription": "Realtek PCIe GbE Family Controller",
+            "Status": "Up",
+            "LinkSpeed": "1 Gbps",
+        }
+
+        with patch(
+            "subprocess.Popen", return_value=_mock_popen(json.dumps(mock_adapter))
+        ):
+            adapters = manager.get_adapters()
+
+        assert adapters[0].link_speed_bps == 10**9
+
+    def test_get_adapter_addresses(self) -> None:
+        """IPv4アドレス取得のテスト."""
+        manager = NetworkManager()
+
+        mock_addresses = [
+            {"InterfaceAlias": "Ethernet", "IPAddress": "192.168.1.10"},
+            {"InterfaceAlias": "Wi-Fi", "IPAddress": "192.168.1.20"},
+        ]
+
+        with patch(
+            "subprocess.Popen", return_value=_mock_popen(json.dumps(mock_addresses))
+        ):
+            addresses = manager.get_adapter_addresses()
+
+        assert addresses == {"Ethernet": "192.168.1.10", "Wi-Fi": "192.168.1.20"}
+
+    BEST_ETHERNET = NetworkAdapter(
+        name="Ethernet",
+        interface_description="Realtek PCIe GbE Family Controller",
+        status=AdapterStatus.UP,
+        adapter_type=AdapterType.ETHERNET,
+        link_speed_bps=10**9,
+    )
+    BEST_WIFI = NetworkAdapter(
+        name="Wi-Fi",
+        interface_description="Intel(R) Wi-Fi 6 AX200",
+        status=AdapterStatus.UP,
+        adapter_type=AdapterType.WIFI,
+        link_speed_bps=300 * 10**6,
+    )
+    # 一覧の先頭に並ぶ仮想アダプター（切り替え候補の問い合わせには含まれない）
+    VETHERNET = NetworkAdapter(
+        name="vEthernet (Default Switch)",
+        interface_description="Hyper-V Virtual Ethernet Adapter",
+        status=AdapterStatus.UP,
+        adapter_type=AdapterType.ETHERNET,
+        link_speed_bps=10 * 10**9,
+    )
+
+    def _switch_to_best(
+        self, manager: NetworkManager, results: list[ProbeResult]
+    ) -> tuple[Mock, Mock, Mock, NetworkAdapter | None, Exception | None]:
+        """計測結果を固定してswitch_to_bestを実行."""
+        prober = Mock()
+        prober.probe.return_value = results
+        best: NetworkAdapter | None = None
+        error: Exception | None = None
+        with (
+            patch.object(
+                manager,
+                "find_switch_adapters",
+                return_value=(
+                    replace(self.BEST_ETHERNET, link_speed_bps=0),
+                    replace(self.BEST_WIFI, link_speed_bps=0),
+                ),
+            ),
+            patch.object(
+                manager,
+                "get_adapters",
+                return_value=[self.VETHERNET, self.BEST_ETHERNET, self.BEST_WIFI],
+            ),
+            patch.object(
+                manager,
+                "get_adapter_addresses",
+                return_value={
+                    self.VETHERNET.name: "172.20.0.1",
+                    "Ethernet": "192.168.1.10",
+                    "Wi-Fi": "192.168.1.20",
+                },
+            ),
+            patch.object(manager, "switch_to_ethernet") as mock_ethernet,
+            patch.object(manager, "switch_to_wifi") as mock_wifi,
+        ):
+            try:
+                best = manager.switch_to_best(prober)
+            except NetworkManagerError as e:
+                error = e
+        return prober, mock_ethernet, mock_wifi, best, error
+
+    def test_switch_to_best(self) -> None:
+        """切り替え対象の組だけを計測し、最も良いアダプターに切り替えるテスト."""
+        manager = NetworkManager(switch_mode=SwitchMode.METRIC)
+
+        prober, mock_ethernet, mock_wifi, best, error = self._switch_to_best(
+            manager,
+            [
+                ProbeResult(name="Wi-Fi", link_speed_bps=300 * 10**6, rtt_ms=5.0),
+                ProbeResult(name="Ethernet", link_speed_bps=10**9, rtt_ms=50.0),
+            ],
+        )
+
+        assert error is None
+        assert best is not None and best.name == "Wi-Fi"
+        mock_wifi.assert_called_once()
+        mock_ethernet.assert_not_called()
+        # 切り替えの件数は実際に切り替えたswitch_to_wifi側でだけ数える
+        assert manager.metrics.switches.samples() == []
+        candidates = prober.probe.call_args.args[0]
+        assert [(c.name, c.source_address, c.link_speed_bps) for c in candidates] == [
+            ("Ethernet", "192.168.1.10", 10**9),
+            ("Wi-Fi", "192.168.1.20", 300 * 10**6),
+        ]
+
+    def test_switch_to_best_unreachable(self) -> None:
+        """どのアダプターも計測先に到達できなければ切り替えないテスト."""
+        manager = NetworkManager(switch_mode=SwitchMode.METRIC)
+
+        _, mock_ethernet, mock_wifi, best, error = self._switch_to_best(
+            manager,
+            [
+                ProbeResult(name="Ethernet", link_speed_bps=10**9, error="timeout"),
+                ProbeResult(name="Wi-Fi", link_speed_bps=300 * 10**6, error="timeout"),
+            ],
+        )
+
+        assert best is None
+        assert isinstance(error, NetworkManagerError)
+        assert "到達できない" in str(error)
+        mock_ethernet.assert_not_called()
+        mock_wifi.assert_not_called()
+
+    def test_switch_to_best_requires_metric_mode(self) -> None:
+        """無効化方式では計測せずにエラーになるテスト."""
+        manager = NetworkManager()
+        prober = Mock()
+
+        with patch.object(manager, "find_switch_adapters") as mock_find:
+            with pytest.raises(NetworkManagerError, match="メトリック方式"):
+                manager.switch_to_best(prober)
+
+        mock_find.assert_not_called()
+        prober.probe.assert_not_called()
+
+    def test_get_adapters_coalesces_refreshes(self) -> None:
+        """連続した更新要求が1回の問い合わせにまとめられるテスト."""
+        manager = NetworkManager(refresh_min_interval=60.0)
+
+        mock_adapter = {
+            "Name": "Ethernet",
+            "InterfaceDescription": "Realtek PCIe GbE Family Controller",
+            "Status": "Up",
+        }
+
+        with patch(
+            "subprocess.Popen", return_value=_mock_popen(json.dumps(mock_adapter))
+        ) as mock_popen:
+            first = manager.get_adapters()
+            second = manager.get_adapters()
+
+        assert first == second
+        assert mock_popen.call_count == 1
+        assert manager.refresh_stats.saved == 1
+
+    def test_enable_adapter_invalidates_refresh_cache(self) -> None:
+        """アダプターの有効化後は最新の状態を問い合わせるテスト."""
+        manager = NetworkManager(refresh_min_interval=60.0)
+
+        mock_adapter = {
+            "Name": "Ethernet",
+            "InterfaceDescription": "Realtek PCIe GbE Family Controller",
+            "Status": "Disabled",
+        }
+
+        with patch.object(manager, "is_admin", return_value=True):
+            with patch(
+                "subprocess.Popen", return_value=_mock_popen(json.dumps(mock_adapter))
+            ) as mock_popen:
+                manager.get_adapters()
+                manager.enable_adapter("Ethernet")
+                manager.get_adapters()
+
+        assert mock_popen.call_count == 3
+
+    def test_get_adapter_details(self) -> None:
+        """詳細情報を1回の問い合わせで取得し、キャッシュするテスト."""
+        manager = NetworkManager()
+
+        mock_details = {
+            "Name": "Ethernet",
+            "MacAddress": "8C-C6-81-AA-BB-CC",
+            "LinkSpeed": "1 Gbps",
+            "IPv4": "192.168.1.10",
+            "IPv6": ["fe80::1", "2001:db8::10"],
+            "Gateways": ["192.168.1.1"],
+            "Dns": ["192.168.1.1", "1.1.1.1"],
+        }
+
+        with patch(
+            "subprocess.Popen", return_value=_mock_popen(json.dumps(mock_details))
+        ) as mock_popen:
+            details = manager.get_adapter_details("Ethernet")
+            cached = manager.get_adapter_details("Ethernet")
+
+        assert details == cached
+        assert mock_popen.call_count == 1
+        script = mock_popen.call_args.args[0][-1]
+        assert "Get-NetAdapter -Name 'Ethernet'" in script
+        assert "Get-NetIPConfiguration -InterfaceAlias 'Ethernet'" in script
+        assert details.mac_address == "8C-C6-81-AA-BB-CC"
+        assert details.link_speed_bps == 10**9
+        assert details.ipv4_addresses == ("192.168.1.10",)
+        assert details.ipv6_addresses == ("fe80::1", "2001:db8::10")
+        assert details.gateways == ("192.168.1.1",)
+        assert details.dns_servers == ("192.168.1.1", "1.1.1.1")
+
+    def test_adapter_details_invalidated_by_change(self) -> None:
+        """アダプターの変更後は詳細情報を取得し直すテスト."""
+        manager = NetworkManager()
+
+        mock_details = {"Name": "Wi-Fi", "IPv4": None, "Gateways": [], "Dns": None}
+
+        with patch.object(manager, "is_admin", return_value=True):
+            with patch(
+                "subprocess.Popen", return_value=_mock_popen(json.dumps(mock_details))
+            ) as mock_popen:
+                details = manager.get_adapter_details("Wi-Fi")
+                manager.disable_adapter("Wi-Fi")
+                manager.get_adapter_details("Wi-Fi")
+
+        assert details.ipv4_addresses == ()
+        assert details.gateways == ()
+        assert mock_popen.call_count == 3
+
+    def test_get_adapters_does_not_fetch_details(self) -> None:
+        """一覧の取得では詳細情報を問い合わせないテスト."""
+        manager = NetworkManager()
+
+        with patch("subprocess.Popen", return_value=_mock_popen("[]")) as mock_popen:
+            manager.get_adapters()
+
+        script = mock_popen.call_args.args[0][-1]
+        assert "Get-NetIPConfiguration" not in script
+
+
+class TestMetricSwitching:
+    """メトリック方式の切り替えのテストクラス."""
+
+    ETHERNET = NetworkAdapter(
+        name="Ethernet",
+        interface_description="Realtek PCIe GbE Family Controller",
+        status=AdapterStatus.UP,
+        adapter_type=AdapterType.ETHERNET,
+    )
+    WIFI = NetworkAdapter(
+        name="Wi-Fi",
+        interface_description="Intel(R) Wi-Fi 6 AX200",
+        status=AdapterStatus.DISABLED,
+        adapter_type=AdapterType.WIFI,
+    )
+    METRICS = [
+        {
+            "InterfaceAlias": "Ethernet",
+            "AddressFamily": 2,
+            "InterfaceMetric": 25,
+            "AutomaticMetric": 1,
+        },
+        {
+            "InterfaceAlias": "Wi-Fi",
+            "AddressFamily": 2,
+            "InterfaceMetric": 40,
+            "AutomaticMetric": 0,
+        },
+    ]
+
+    def _manager(self, tmp_path: Path) -> tuple[NetworkManager, MagicMock]:
+        runner = MagicMock()
+        runner.run.return_value = Mock(stdout=json.dumps(self.METRICS), stderr="")
+        manager = NetworkManager(
+            runner=runner, switch_mode=SwitchMode.METRIC, state_path=tmp_path
+        )
+        return manager, runner
+
+    def test_get_interface_metrics(self, tmp_path: Path) -> None:
+        """メトリック取得の解析テスト."""
+        manager, _ = self._manager(tmp_path)
+
+        metrics = manager.get_interface_metrics(["Ethernet", "Wi-Fi"])
+
+        assert metrics == [
+            InterfaceMetric("Ethernet", "IPv4", 25, True),
+            InterfaceMetric("Wi-Fi", "IPv4", 40, False),
+        ]
+
+    def test_switch_to_wifi_keeps_both_enabled(self, tmp_path: Path) -> None:
+        """メトリック方式ではアダプターを無効化しないテスト."""
+        manager, runner = self._manager(tmp_path)
+
+        with patch.object(manager, "is_admin", return_value=True):
+            with patch.object(
+                manager, "find_switch_adapters", return_value=(self.ETHERNET, self.WIFI)
+            ):
+                with patch.object(manager, "disable_adapter") as mock_disable:
+                    with patch.object(manager, "enable_adapter") as mock_enable:
+                        manager.switch_to_wifi()
+
+        mock_disable.assert_not_called()
+        mock_enable.assert_called_once_with("Wi-Fi", timeout=None, cancel=None)
+        scripts = [c.args[0] for c in runner.run.call_args_list]
+        assert (
+            "Set-NetIPInterface -InterfaceAlias 'Wi-Fi' -InterfaceMetric 5"
+            in scripts[-1]
+        )
+        assert "-InterfaceAlias 'Ethernet' -InterfaceMetric 500" in scripts[-1]
+        assert manager.has_saved_metrics()
+
+    def test_restore_metrics(self, tmp_path: Path) -> None:
+        """保存したメトリックに戻すテスト."""
+        manager, runner = self._manager(tmp_path)
+
+        with patch.object(manager, "is_admin", return_value=True):
+            with patch.object(
+                manager, "find_switch_adapters", return_value=(self.ETHERNET, self.WIFI)
+            ):
+                with patch.object(manager, "enable_adapter"):
                     manager.switch_to_wifi()
+                    manager.switch_to_ethernet()
+            manager.restore_metrics()
+
+        script = runner.run.call_args.args[0]
+        assert (
+            "Set-NetIPInterface -InterfaceAlias 'Ethernet' -AddressFamily IPv4 "
+            "-AutomaticMetric Enabled" in script
+        )
+        assert (
+            "Set-NetIPInterface -InterfaceAlias 'Wi-Fi' -AddressFamily IPv4 "
+            "-InterfaceMetric 40" in script
+        )
+        assert not manager.has_saved_metrics()
+
+    def test_restore_metrics_nothing_saved(self, tmp_path: Path) -> None:
+        """保存したメトリックがなければ何もしないテスト."""
+        manager, runner = self._manager(tmp_path)
+
+        with patch.object(manager, "is_admin", return_value=True):
+            manager.restore_metrics()
+
+        runner.run.assert_not_called()
+
+    def test_quote_escapes_single_quote(self) -> None:
+        """アダプター名の単一引用符をエスケープするテスト."""
+        assert NetworkManager._quote("Bob's NIC") == "'Bob''s NIC'"
+
+
+class TestRememberedAdapters:
+    """記憶したアダプター名による切り替えのテストクラス."""
+
+    ETHERNET = NetworkAdapter(
+        "Ethernet", "Realtek PCIe GbE", AdapterStatus.UP, AdapterType.ETHERNET
+    )
+    WIFI = NetworkAdapter(
+        "Wi-Fi", "Intel(R) Wi-Fi 6 AX200", AdapterStatus.DISABLED, AdapterType.WIFI
+    )
+
+    @staticmethod
+    def _row(adapter: NetworkAdapter, status: str) -> dict[str, str]:
+        return {
+            "Name": adapter.name,
+            "InterfaceDescription": adapter.interface_description,
+            "Status": status,
+        }
+
+    def _remembering_manager(self, tmp_path: Path) -> tuple[NetworkManager, Mock]:
+        """前回の切り替えでアダプター名を記憶した状態のマネージャー."""
+        runner = Mock()
+        manager = NetworkManager(runner=runner, state_path=tmp_path)
+        with (
+            patch.object(
+                manager, "find_switch_adapters", return_value=(self.ETHERNET, self.WIFI)
+            ),
+        ):
+            manager.switch_to_ethernet()
+        runner.run.assert_not_called()
+        return manager, runner
+
+    @patch.object(NetworkManager, "is_admin", return_value=True)
+    def test_switch_without_enumeration(self, _: MagicMock, tmp_path: Path) -> None:
+        """記憶した名前で一覧を取得せず、1回の起動で切り替えと確認を行うテスト."""
+        manager, runner = self._remembering_manager(tmp_path)
+        runner.run.return_value = Mock(
+            stdout=json.dumps(
+                {
+                    "Before": [
+                        self._row(self.ETHERNET, "Up"),
+                        self._row(self.WIFI, "Disabled"),
+                    ],
+                    "After": [
+                        self._row(self.ETHERNET, "Disabled"),
+                        self._row(self.WIFI, "Up"),
+                    ],
+                }
+            )
+        )
+
+        with patch.object(manager, "get_adapters") as mock_get_adapters:
+            manager.switch_to_wifi()
+
+        mock_get_adapters.assert_not_called()
+        runner.run.assert_called_once()
+        script = runner.run.call_args.args[0]
+        assert "Get-NetAdapter -Name 'Ethernet', 'Wi-Fi'" in script
+        assert "Disable-NetAdapter -Name 'Ethernet'" in script
+        assert "Enable-NetAdapter -Name 'Wi-Fi'" in script
+        report = manager.last_reconcile
+        assert report is not None
+        assert [(s.adapter_name, s.action) for s in report.executed] == [
+            ("Ethernet", "disable"),
+            ("Wi-Fi", "enable"),
+        ]
+        assert report.converged
+        durations = manager.metrics.operation_duration
+        assert durations.count(operation="disable_adapter") == 1
+        assert durations.count(operation="enable_adapter") == 1
+        assert manager.metrics.operation_errors.samples() == []
+
+    @patch.object(NetworkManager, "is_admin", return_value=True)
+    def test_drifted_step_counts_as_error(self, _: MagicMock, tmp_path: Path) -> None:
+        """変更後も望ましい状態でない手順は失敗として記録するテスト."""
+        manager, runner = self._remembering_manager(tmp_path)
+        runner.run.return_value = Mock(
+            stdout=json.dumps(
+                {
+                    "Before": [
+                        self._row(self.ETHERNET, "Up"),
+                        self._row(self.WIFI, "Disabled"),
+                    ],
+                    "After": [
+                        self._row(self.ETHERNET, "Disabled"),
+                        self._row(self.WIFI, "Disabled"),
+                    ],
+                }
+            )
+        )
+
+        manager.switch_to_wifi()
+
+        errors = manager.metrics.operation_errors
+        assert errors.samples() == [
+            ("nas_operation_errors_total", {"operation": "enable_adapter"}, 1.0)
+        ]
+
+    @patch.object(NetworkManager, "is_admin", return_value=True)
+    def test_renamed_adapter_falls_back_to_discovery(
+        self, _: MagicMock, tmp_path: Path
+    ) -> None:
+        """記憶したアダプターが見つからなければ一覧から検出し直すテスト."""
+        manager, runner = self._remembering_manager(tmp_path)
+        runner.run.side_effect = subprocess.CalledProcessError(1, "powershell")
+        renamed = replace(self.WIFI, name="WLAN")
+
+        with (
+            patch.object(
+                manager, "find_switch_adapters", return_value=(self.ETHERNET, renamed)
+            ),
+            patch.object(manager, "get_adapters", return_value=[]),
+            patch.object(manager, "disable_adapter") as mock_disable,
+            patch.object(manager, "enable_adapter") as mock_enable,
+        ):
+            manager.switch_to_wifi()
+
+        mock_disable.assert_called_once_with("Ethernet", timeout=None, cancel=None)
+        mock_enable.assert_called_once_with("WLAN", timeout=None, cancel=None)
+        remembered = manager._load_adapter_names()
+        assert remembered is not None
+        assert remembered[1].name == "WLAN"
+
+    @patch.object(NetworkManager, "is_admin", return_value=True)
+    def test_timeout_does_not_fall_back(self, _: MagicMock, tmp_path: Path) -> None:
+        """タイムアウトは検出し直さずにエラーとして通知するテスト."""
+        manager, runner = self._remembering_manager(tmp_path)
+        runner.run.side_effect = PowerShellTimeoutError("timeout")
+
+        with patch.object(manager, "find_switch_adapters") as mock_find:
+            with pytest.raises(NetworkManagerError):
+                manager.switch_to_wifi()
+
+        mock_find.assert_not_called()
+        assert manager._load_adapter_names() is not None
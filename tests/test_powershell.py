@@ -0,0 +1,228 @@
+"""PowerShellRunnerのテスト."""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.powershell import (
+    BreakerState,
+    CancellationToken,
+    CircuitBreaker,
+    CircuitOpenError,
+    OperationCancelledError,
+    PowerShellRunner,
+    PowerShellTimeoutError,
+)
+
+# 子プロセスを起動し、そのPIDをファイルに書いてから眠り続けるスクリプト
+SPAWN_CHILD_AND_HANG = (
+    "import pathlib, subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+    "pathlib.Path(sys.argv[1]).write_text(str(child.pid))\n"
+    "time.sleep(60)\n"
+)
+
+
+def _pid_alive(pid: int) -> bool:
+    """PIDのプロセスが生存しているか（ゾンビは終了扱い）."""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            return f.read().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestCancellationToken:
+    """CancellationTokenのテストクラス."""
+
+    def test_cancel(self) -> None:
+        """キャンセル要求のテスト."""
+        token = CancellationToken()
+        assert token.cancelled is False
+        token.cancel()
+        assert token.cancelled is True
+
+
+class TestCircuitBreaker:
+    """CircuitBreakerのテストクラス."""
+
+    def test_opens_after_threshold(self) -> None:
+        """連続タイムアウトで遮断されるテスト."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+        try:
+            breaker.record_timeout()
+            assert breaker.state == BreakerState.CLOSED
+            breaker.record_timeout()
+            assert breaker.state == BreakerState.OPEN
+
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+        finally:
+            breaker.shutdown()
+
+    def test_success_resets_count(self) -> None:
+        """成功で連続タイムアウト回数がリセットされるテスト."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_timeout()
+        breaker.record_success()
+        breaker.record_timeout()
+
+        assert breaker.state == BreakerState.CLOSED
+        assert breaker.consecutive_timeouts == 1
+
+    def test_background_probe_recovers(self) -> None:
+        """バックグラウンドの復旧確認で閉じるテスト."""
+        recovered = threading.Event()
+        states: list[BreakerState] = []
+
+        def listener(state: BreakerState) -> None:
+            states.append(state)
+            if state == BreakerState.CLOSED:
+                recovered.set()
+
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=0.05, probe=lambda: True
+        )
+        breaker.add_listener(listener)
+        breaker.record_timeout()
+
+        assert recovered.wait(timeout=5)
+        assert states == [
+            BreakerState.OPEN,
+            BreakerState.HALF_OPEN,
+            BreakerState.CLOSED,
+        ]
+        breaker.before_call()
+
+    def test_failed_probe_reopens(self) -> None:
+        """復旧確認に失敗すると再び遮断されるテスト."""
+        attempts = threading.Semaphore(0)
+
+        def probe() -> bool:
+            attempts.release()
+            return False
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05, probe=probe)
+        try:
+            breaker.record_timeout()
+            assert attempts.acquire(timeout=5)
+            assert attempts.acquire(timeout=5)
+            assert breaker.state in (BreakerState.OPEN, BreakerState.HALF_OPEN)
+        finally:
+            breaker.shutdown()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIXのプロセスグループを使用")
+class TestPowerShellRunner:
+    """PowerShellRunnerのテストクラス（PowerShellの代わりにPythonを起動）."""
+
+    def test_run_process_success(self) -> None:
+        """正常終了したコマンドの出力取得テスト."""
+        runner = PowerShellRunner()
+        result = runner.run_process([sys.executable, "-c", "print('ok')"])
+
+        assert result.returncode == 0
+        assert result.stdout.strip() == "ok"
+
+    def test_run_process_nonzero_exit(self) -> None:
+        """終了コードが0以外の場合のテスト."""
+        runner = PowerShellRunner()
+
+        with pytest.raises(subprocess.CalledProcessError):
+            runner.run_process([sys.executable, "-c", "import sys; sys.exit(3)"])
+
+    def test_timeout_kills_process_tree(self, tmp_path: Path) -> None:
+        """デッドライン超過でプロセスツリー全体が終了するテスト."""
+        runner = PowerShellRunner(poll_interval=0.02)
+        pid_file = tmp_path / "child.pid"
+        cmd = [sys.executable, "-c", SPAWN_CHILD_AND_HANG, str(pid_file)]
+
+        start = time.monotonic()
+        with pytest.raises(PowerShellTimeoutError):
+            runner.run_process(cmd, timeout=1.0)
+        assert time.monotonic() - start < 10
+        assert runner.timeout_count == 1
+
+        # 孫プロセスも終了していることを確認
+        child_pid = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while _pid_alive(child_pid):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+    def test_expired_deadline_does_not_spawn(self) -> None:
+        """デッドラインを使い切っていれば起動せず、ブレーカーにも記録しないテスト."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+        runner = PowerShellRunner(breaker=breaker)
+        try:
+            for _ in range(3):
+                with pytest.raises(PowerShellTimeoutError):
+                    runner.run_process([sys.executable, "-c", "pass"], timeout=0.0)
+
+            assert runner.spawn_count == 0
+            assert runner.timeout_count == 0
+            assert breaker.state == BreakerState.CLOSED
+        finally:
+            runner.shutdown()
+
+    def test_cancel_in_flight(self) -> None:
+        """実行中の操作をキャンセルするテスト."""
+        runner = PowerShellRunner(poll_interval=0.02)
+        token = CancellationToken()
+        threading.Timer(0.2, token.cancel).start()
+
+        start = time.monotonic()
+        with pytest.raises(OperationCancelledError):
+            runner.run_process(
+                [sys.executable, "-c", "import time; time.sleep(60)"],
+                timeout=30,
+                cancel=token,
+            )
+        assert time.monotonic() - start < 10
+        assert runner.breaker.consecutive_timeouts == 0
+
+    def test_cancel_all(self) -> None:
+        """cancel_allで実行中の操作がすべてキャンセルされるテスト."""
+        runner = PowerShellRunner(poll_interval=0.02)
+        errors: list[Exception] = []
+
+        def worker() -> None:
+            try:
+                runner.run_process(
+                    [sys.executable, "-c", "import time; time.sleep(60)"], timeout=30
+                )
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)
+        runner.cancel_all()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert len(errors) == 3
+        assert all(isinstance(e, OperationCancelledError) for e in errors)
+
+    def test_breaker_fails_fast(self) -> None:
+        """ブレーカーが開いた後は即時失敗するテスト."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+        runner = PowerShellRunner(breaker=breaker, poll_interval=0.02)
+        try:
+            with pytest.raises(PowerShellTimeoutError):
+                runner.run_process(
+                    [sys.executable, "-c", "import time; time.sleep(60)"],
+                    timeout=0.2,
+                )
+
+            start = time.monotonic()
+            with pytest.raises(CircuitOpenError):
+                runner.run_process([sys.executable, "-c", "pass"])
+            assert time.monotonic() - start < 0.5
+        finally:
+            runner.shutdown()
@@ -0,0 +1,108 @@
+"""プロファイリングモードのテスト."""
+
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.profiling import Profiler, profiling_requested
+
+
+class Worker:
+    """計測対象のテスト用クラス."""
+
+    def busy(self, n: int) -> int:
+        return sum(i * i for i in range(n))
+
+    def fail(self) -> None:
+        raise RuntimeError("boom")
+
+    def offload(self, n: int) -> None:
+        thread = threading.Thread(target=self.busy, args=(n,))
+        thread.start()
+        thread.join()
+
+
+@pytest.fixture
+def profiler(tmp_path: Path) -> Iterator[Profiler]:
+    """計測中のプロファイラー."""
+    prof = Profiler(tmp_path / "profiles", top_n=5)
+    prof.start()
+    yield prof
+    prof.stop()
+
+
+class TestProfiler:
+    """Profilerのテストクラス."""
+
+    def test_instrument_collects_operation_stats(self, profiler: Profiler) -> None:
+        """包んだ操作の回数とCPU時間が集計されるテスト."""
+        worker = Worker()
+        profiler.instrument(worker, ["busy", "fail"])
+
+        assert worker.busy(10_000) == sum(i * i for i in range(10_000))
+        worker.busy(10)
+        with pytest.raises(RuntimeError):
+            worker.fail()
+
+        stats = profiler.operation_stats()
+        assert stats["Worker.busy"].calls == 2
+        assert stats["Worker.busy"].cpu_seconds > 0
+        assert stats["Worker.fail"].calls == 1
+
+    def test_instrument_counts_work_on_other_threads(self, profiler: Profiler) -> None:
+        """別スレッドで実行された処理のCPU時間も集計されるテスト."""
+        worker = Worker()
+        profiler.instrument(worker, ["offload"])
+
+        worker.offload(200_000)
+
+        assert profiler.operation_stats()["Worker.offload"].cpu_seconds > 0
+
+    def test_instrument_only_affects_instance(self, profiler: Profiler) -> None:
+        """計測は包んだインスタンスだけに適用されるテスト."""
+        wrapped, plain = Worker(), Worker()
+        profiler.instrument(wrapped, ["busy"])
+
+        plain.busy(10)
+
+        assert "busy" not in vars(plain)
+        assert profiler.operation_stats() == {}
+
+    def test_write_report(self, profiler: Profiler) -> None:
+        """レポートにCPU・メモリ・操作ごとの各節が出力されるテスト."""
+        worker = Worker()
+        profiler.instrument(worker, ["busy"])
+        worker.busy(1000)
+        retained = [bytearray(1024) for _ in range(100)]
+
+        first = profiler.write_report()
+        second = profiler.write_report()
+
+        assert first != second
+        assert first.parent == profiler.output_dir
+        text = first.read_text(encoding="utf-8")
+        assert "## CPU" in text
+        assert "## メモリ確保の増加" in text
+        assert "Worker.busy" in text
+        assert "test_profiling.py" in text
+        assert retained
+
+    def test_write_report_when_stopped(self, tmp_path: Path) -> None:
+        """計測前でもレポートを出力できるテスト."""
+        path = Profiler(tmp_path).write_report()
+
+        assert "計測データなし" in path.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [("1", True), ("true", True), ("YES", True), ("0", False), ("", False)],
+)
+def test_profiling_requested(
+    monkeypatch: pytest.MonkeyPatch, value: str, expected: bool
+) -> None:
+    """環境変数による有効化判定のテスト."""
+    monkeypatch.setenv("NAS_PROFILE", value)
+    assert profiling_requested() is expected
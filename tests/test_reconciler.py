@@ -0,0 +1,125 @@
+"""望ましい状態との差分計算のテスト."""
+
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+from src.network_manager import NetworkManager
+from src.reconciler import (
+    DesiredState,
+    find_drift,
+    plan_reconcile,
+    switch_state,
+)
+
+ETHERNET = NetworkAdapter(
+    "Ethernet", "Realtek PCIe GbE", AdapterStatus.UP, AdapterType.ETHERNET
+)
+WIFI = NetworkAdapter(
+    "Wi-Fi", "Intel(R) Wi-Fi 6 AX200", AdapterStatus.DISCONNECTED, AdapterType.WIFI
+)
+VPN = NetworkAdapter("VPN", "TAP-Windows", AdapterStatus.DISABLED, AdapterType.UNKNOWN)
+
+
+class TestPlanReconcile:
+    """plan_reconcileのテストクラス."""
+
+    def test_no_op_when_already_desired(self) -> None:
+        """すでに望ましい状態なら手順がないテスト（未接続は有効として扱う）."""
+        desired = DesiredState(by_name={"Ethernet": True, "Wi-Fi": True, "VPN": False})
+
+        plan = plan_reconcile(desired, [ETHERNET, WIFI, VPN])
+
+        assert plan.is_noop
+        assert plan.describe() == []
+
+    def test_disables_before_enables(self) -> None:
+        """無効化が有効化より先に並ぶテスト."""
+        plan = plan_reconcile(switch_state(VPN, ETHERNET), [VPN, ETHERNET, WIFI])
+
+        assert [(s.adapter_name, s.action) for s in plan.steps] == [
+            ("Ethernet", "disable"),
+            ("VPN", "enable"),
+        ]
+        assert plan.describe() == [
+            "1. Ethernet を無効化（現在: Up）",
+            "2. VPN を有効化（現在: Disabled）",
+        ]
+
+    def test_name_overrides_type(self) -> None:
+        """名前での指定が種類での指定より優先されるテスト."""
+        second = NetworkAdapter(
+            "Ethernet 2", "Intel(R) I219-V", AdapterStatus.UP, AdapterType.ETHERNET
+        )
+        desired = DesiredState(
+            by_name={"Ethernet": True}, by_type={AdapterType.ETHERNET: False}
+        )
+
+        plan = plan_reconcile(desired, [ETHERNET, second])
+
+        assert [(s.adapter_name, s.action) for s in plan.steps] == [
+            ("Ethernet 2", "disable")
+        ]
+
+    def test_unknown_status_is_planned(self) -> None:
+        """状態が不明なアダプターは手順に含めるテスト."""
+        unknown = NetworkAdapter(
+            "Wi-Fi", "Intel(R) Wi-Fi 6", AdapterStatus.UNKNOWN, AdapterType.WIFI
+        )
+        desired = DesiredState(by_type={AdapterType.WIFI: False})
+
+        plan = plan_reconcile(desired, [unknown])
+
+        assert [s.action for s in plan.steps] == ["disable"]
+
+    def test_missing_adapters_reported(self) -> None:
+        """見つからない名前・種類を差分として報告するテスト."""
+        desired = DesiredState(
+            by_name={"Ethernet 3": True}, by_type={AdapterType.WIFI: False}
+        )
+
+        drift = find_drift(desired, [ETHERNET])
+
+        assert [(d.adapter_name, d.actual) for d in drift] == [
+            ("Ethernet 3", None),
+            ("Wi-Fi", None),
+        ]
+
+    def test_str_ignores_order(self) -> None:
+        """指定の順序が違っても同じ文字列になるテスト."""
+        first = DesiredState(by_name={"a": True, "b": False})
+        second = DesiredState(by_name={"b": False, "a": True})
+
+        assert str(first) == str(second)
+
+
+class TestNetworkManagerReconcile:
+    """NetworkManager.reconcileのテストクラス."""
+
+    @patch.object(NetworkManager, "is_admin", return_value=True)
+    def test_reconcile_runs_only_needed_steps(self, _: MagicMock) -> None:
+        """必要な手順だけを実行し、確認後の差分がないテスト."""
+        runner = MagicMock()
+        runner.run.return_value.returncode = 0
+        manager = NetworkManager(runner=runner)
+        desired = DesiredState(
+            by_type={AdapterType.ETHERNET: True, AdapterType.WIFI: False}
+        )
+        disabled = replace(WIFI, status=AdapterStatus.DISABLED)
+
+        with patch.object(
+            manager,
+            "get_adapters",
+            side_effect=[[ETHERNET, WIFI], [ETHERNET, WIFI], [ETHERNET, disabled]],
+        ):
+            assert manager.preview_reconcile(desired).describe() == [
+                "1. Wi-Fi を無効化（現在: Disconnected）"
+            ]
+            runner.run.assert_not_called()
+
+            report = manager.reconcile(desired, timeout=5)
+
+        assert report is not None
+        assert report.converged
+        commands = [call.args[0] for call in runner.run.call_args_list]
+        assert commands == ["Disable-NetAdapter -Name 'Wi-Fi' -Confirm:$false"]
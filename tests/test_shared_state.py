@@ -0,0 +1,180 @@
+"""共有メモリのアダプター状態のテスト."""
+
+import json
+import subprocess
+import sys
+import threading
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.models import AdapterStateReader, SharedStateError
+from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+from src.models.shared_state import MAX_ADAPTERS, AdapterStatePublisher
+
+
+def _snapshot(version: int) -> list[NetworkAdapter]:
+    """版番号から中身を決められるアダプター一覧（一貫性の検証用）."""
+    return [
+        NetworkAdapter(
+            name=f"adapter-{version}-{i}",
+            interface_description=f"Test adapter {version}",
+            status=AdapterStatus.UP if version % 2 else AdapterStatus.DISABLED,
+            adapter_type=AdapterType.ETHERNET,
+            link_speed_bps=version,
+        )
+        for i in range(version % 8 + 1)
+    ]
+
+
+def _is_consistent(adapters: tuple[NetworkAdapter, ...]) -> bool:
+    """スナップショットが1回の書き込みだけから成るかどうか."""
+    if not adapters:
+        return True
+    version = adapters[0].link_speed_bps
+    return list(adapters) == _snapshot(version)
+
+
+def _read_many(name: str, reads: int) -> tuple[int, int]:
+    """別プロセスで読み取りを繰り返し、（読み取り数, 不整合数）を返す."""
+    inconsistent = 0
+    with AdapterStateReader(name) as reader:
+        for _ in range(reads):
+            if not _is_consistent(reader.read().adapters):
+                inconsistent += 1
+    return reads, inconsistent
+
+
+# 独立したプロセスで読み取りを繰り返すスクリプト
+_READER_SCRIPT = """
+import json, sys
+from tests.test_shared_state import _read_many
+print(json.dumps(_read_many(sys.argv[1], int(sys.argv[2]))))
+"""
+
+
+@pytest.fixture
+def publisher() -> Iterator[AdapterStatePublisher]:
+    """テストごとに別名の共有メモリを作成."""
+    state = AdapterStatePublisher(f"nas_test_{uuid.uuid4().hex[:12]}")
+    yield state
+    state.close()
+
+
+class TestSharedState:
+    """共有メモリのアダプター状態のテストクラス."""
+
+    def test_round_trip(self, publisher: AdapterStatePublisher) -> None:
+        """書き込んだ一覧をそのまま読み取れるテスト."""
+        adapters = [
+            NetworkAdapter(
+                "イーサネット",
+                "Realtek PCIe GbE",
+                AdapterStatus.UP,
+                AdapterType.ETHERNET,
+                10**9,
+            ),
+            NetworkAdapter(
+                "Wi-Fi",
+                "Intel(R) Wi-Fi 6 AX200",
+                AdapterStatus.DISCONNECTED,
+                AdapterType.WIFI,
+            ),
+        ]
+        sequence = publisher.publish(adapters)
+
+        with AdapterStateReader(publisher.name) as reader:
+            snapshot = reader.read()
+
+        assert snapshot.sequence == sequence
+        assert sequence % 2 == 0
+        assert snapshot.published_at > 0
+        assert snapshot.adapters == tuple(adapters)
+
+    def test_long_values_truncated(self, publisher: AdapterStatePublisher) -> None:
+        """固定長を超える名前は文字の途中で切らずに切り詰めるテスト."""
+        adapter = NetworkAdapter(
+            "あ" * 100, "x" * 300, AdapterStatus.UP, AdapterType.UNKNOWN
+        )
+        adapters = [adapter] * (MAX_ADAPTERS + 5)
+        publisher.publish(adapters)
+
+        with AdapterStateReader(publisher.name) as reader:
+            snapshot = reader.read()
+
+        assert len(snapshot.adapters) == MAX_ADAPTERS
+        assert snapshot.adapters[0].name == "あ" * 42
+        assert snapshot.adapters[0].interface_description == "x" * 128
+
+    def test_missing_segment(self) -> None:
+        """公開されていない場合のテスト."""
+        with pytest.raises(SharedStateError):
+            AdapterStateReader(f"nas_test_missing_{uuid.uuid4().hex[:8]}")
+
+    def test_reader_does_not_remove_segment(
+        self, publisher: AdapterStatePublisher
+    ) -> None:
+        """読み取り側を閉じても共有メモリが残るテスト."""
+        publisher.publish(_snapshot(3))
+        AdapterStateReader(publisher.name).close()
+
+        with AdapterStateReader(publisher.name) as reader:
+            assert _is_consistent(reader.read().adapters)
+
+    def test_concurrent_readers_see_consistent_snapshots(
+        self, publisher: AdapterStatePublisher
+    ) -> None:
+        """書き込み中も多数の読み取りが一貫したスナップショットを得るテスト."""
+        stop = threading.Event()
+        published = 0
+
+        def write() -> None:
+            nonlocal published
+            version = 1
+            while not stop.is_set():
+                publisher.publish(_snapshot(version))
+                version += 1
+            published = version
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            threads_result: list[tuple[int, int]] = []
+            readers = [
+                threading.Thread(
+                    target=lambda: threads_result.append(
+                        _read_many(publisher.name, 300)
+                    )
+                )
+                for _ in range(4)
+            ]
+            for reader in readers:
+                reader.start()
+
+            processes = [
+                subprocess.Popen(
+                    [sys.executable, "-c", _READER_SCRIPT, publisher.name, "300"],
+                    cwd=Path(__file__).parent.parent,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                )
+                for _ in range(8)
+            ]
+            process_result = [
+                tuple(json.loads(process.communicate(timeout=60)[0]))
+                for process in processes
+            ]
+
+            for reader in readers:
+                reader.join()
+        finally:
+            stop.set()
+            writer.join()
+
+        results = threads_result + process_result
+        assert len(results) == 12
+        assert sum(reads for reads, _ in results) == 300 * len(results)
+        assert sum(bad for _, bad in results) == 0
+        assert published > 1
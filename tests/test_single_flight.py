@@ -0,0 +1,96 @@
+"""SingleFlightのテスト."""
+
+import threading
+import time
+
+import pytest
+
+from src.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """SingleFlightのテストクラス."""
+
+    def test_concurrent_calls_share_result(self) -> None:
+        """同時の要求が1回の実行結果を共有するテスト."""
+        flight: SingleFlight[int] = SingleFlight()
+        release = threading.Event()
+        calls = 0
+
+        def query() -> int:
+            nonlocal calls
+            calls += 1
+            release.wait(5)
+            return 42
+
+        results: list[int] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do(query)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while flight.stats.requests < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == [42] * 5
+        assert calls == 1
+        stats = flight.stats
+        assert stats.executions == 1
+        assert stats.joined == 4
+        assert stats.saved == 4
+
+    def test_sequential_calls_execute(self) -> None:
+        """min_intervalが0なら逐次の要求は毎回実行されるテスト."""
+        flight: SingleFlight[int] = SingleFlight()
+        counter = iter(range(10))
+
+        assert flight.do(lambda: next(counter)) == 0
+        assert flight.do(lambda: next(counter)) == 1
+        assert flight.stats.saved == 0
+
+    def test_min_interval_merges_bursts(self) -> None:
+        """min_interval以内の要求は直前の結果を返すテスト."""
+        flight: SingleFlight[int] = SingleFlight(min_interval=60.0)
+        counter = iter(range(10))
+
+        assert flight.do(lambda: next(counter)) == 0
+        assert flight.do(lambda: next(counter)) == 0
+        assert flight.stats.cached == 1
+
+        flight.invalidate()
+        assert flight.do(lambda: next(counter)) == 1
+
+    def test_error_shared_and_not_cached(self) -> None:
+        """エラーは合流先にも伝わり、結果として再利用されないテスト."""
+        flight: SingleFlight[int] = SingleFlight(min_interval=60.0)
+
+        def fail() -> int:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            flight.do(fail)
+        assert flight.do(lambda: 7) == 7
+
+    def test_join_wait_timeout(self) -> None:
+        """合流先が終わらない場合にTimeoutErrorになるテスト."""
+        flight: SingleFlight[int] = SingleFlight()
+        release = threading.Event()
+        leader = threading.Thread(
+            target=lambda: flight.do(lambda: int(release.wait(5)))
+        )
+        leader.start()
+        deadline = time.monotonic() + 5
+        while flight.stats.executions < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        try:
+            with pytest.raises(TimeoutError):
+                flight.do(lambda: 0, wait_timeout=0.05)
+        finally:
+            release.set()
+            leader.join(timeout=5)
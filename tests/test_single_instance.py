@@ -0,0 +1,113 @@
+"""多重起動防止のテスト."""
+
+import json
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.single_instance import (
+    ENDPOINT_FILE,
+    InstanceCommand,
+    SingleInstance,
+    SingleInstanceError,
+)
+
+# ロックを取得したまま待機し、テストから強制終了されるプロセス
+_HOLDER_SCRIPT = """
+import sys, time
+from pathlib import Path
+from src.single_instance import SingleInstance
+instance = SingleInstance(Path(sys.argv[1]))
+instance.acquire()
+print("locked", flush=True)
+time.sleep(60)
+"""
+
+
+@pytest.fixture
+def primary(tmp_path: Path) -> Iterator[SingleInstance]:
+    """最初に起動したインスタンス."""
+    instance = SingleInstance(tmp_path)
+    assert instance.acquire()
+    yield instance
+    instance.close()
+
+
+class TestSingleInstance:
+    """SingleInstanceのテストクラス."""
+
+    def test_second_launch_forwards_command(
+        self, tmp_path: Path, primary: SingleInstance
+    ) -> None:
+        """2回目の起動はロックを取れず、要求を起動中のインスタンスに渡すテスト."""
+        second = SingleInstance(tmp_path)
+        assert not second.acquire()
+
+        start = time.perf_counter()
+        second.forward(InstanceCommand.SWITCH_WIFI)
+        elapsed = time.perf_counter() - start
+
+        assert primary.commands.get(timeout=5) == InstanceCommand.SWITCH_WIFI
+        assert elapsed < 1.0
+
+    def test_lock_released_on_close(self, tmp_path: Path) -> None:
+        """終了したインスタンスのロックを次の起動が取得できるテスト."""
+        first = SingleInstance(tmp_path)
+        assert first.acquire()
+        first.close()
+
+        second = SingleInstance(tmp_path)
+        try:
+            assert second.acquire()
+        finally:
+            second.close()
+
+    def test_crashed_instance_lock_recovered(self, tmp_path: Path) -> None:
+        """異常終了したインスタンスのロックと接続先ファイルが残っても起動できるテスト."""
+        holder = subprocess.Popen(
+            [sys.executable, "-c", _HOLDER_SCRIPT, str(tmp_path)],
+            cwd=Path(__file__).parent.parent,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            assert holder.stdout is not None
+            assert holder.stdout.readline().strip() == "locked"
+            assert not SingleInstance(tmp_path).acquire()
+        finally:
+            holder.kill()
+            holder.wait(timeout=10)
+        stale = json.loads((tmp_path / ENDPOINT_FILE).read_text(encoding="utf-8"))
+
+        instance = SingleInstance(tmp_path)
+        try:
+            assert instance.acquire()
+            endpoint = (tmp_path / ENDPOINT_FILE).read_text(encoding="utf-8")
+            assert json.loads(endpoint)["token"] != stale["token"]
+        finally:
+            instance.close()
+
+    def test_forward_without_running_instance(self, tmp_path: Path) -> None:
+        """起動中のインスタンスがなければ待ち時間の後にエラーになるテスト."""
+        (tmp_path / ENDPOINT_FILE).write_text(
+            json.dumps({"pid": 1, "port": 1, "token": "stale"}), encoding="utf-8"
+        )
+
+        with pytest.raises(SingleInstanceError):
+            SingleInstance(tmp_path, startup_wait=0.2).forward(InstanceCommand.SHOW)
+
+    def test_request_without_token_ignored(
+        self, tmp_path: Path, primary: SingleInstance
+    ) -> None:
+        """トークンが一致しない要求は受け付けないテスト."""
+        endpoint = json.loads((tmp_path / ENDPOINT_FILE).read_text(encoding="utf-8"))
+        with socket.create_connection(("127.0.0.1", endpoint["port"]), timeout=5) as c:
+            c.sendall(b'{"token": "wrong", "command": "switch-wifi"}\n')
+            assert c.makefile("rb").readline() == b""
+
+        assert primary.commands.empty()
@@ -0,0 +1,143 @@
+"""ソークテストのハーネスのテスト."""
+
+import json
+import sys
+import tkinter as tk
+
+import pytest
+
+from src.models.models import AdapterStatus
+from src.soak import (
+    MIB,
+    FakePowerShellBackend,
+    ResourceSample,
+    SoakConfig,
+    build_report,
+    run_soak,
+)
+
+
+def _samples(rss_growth_per_sample: int) -> list[ResourceSample]:
+    """RSSだけが一定量ずつ増えるリソース使用量の記録."""
+    return [
+        ResourceSample(cycle, 0.0, 100 * MIB + i * rss_growth_per_sample, 12, 3, 0)
+        for i, cycle in enumerate(range(0, 101, 10))
+    ]
+
+
+class TestFakePowerShellBackend:
+    """偽のPowerShellのテストクラス."""
+
+    def test_changes_are_reflected_in_queries(self) -> None:
+        """有効化・無効化が以降の一覧に反映されるテスト."""
+        backend = FakePowerShellBackend()
+
+        backend.respond("Disable-NetAdapter -Name 'Ethernet' -Confirm:$false")
+        backend.respond("Enable-NetAdapter -Name 'Wi-Fi' -Confirm:$false")
+        rows = json.loads(
+            backend.respond(
+                "Get-NetAdapter | "
+                "Select-Object Name, InterfaceDescription, Status, LinkSpeed | "
+                "ConvertTo-Json"
+            )
+        )
+
+        statuses = {row["Name"]: row["Status"] for row in rows}
+        assert statuses["Ethernet"] == AdapterStatus.DISABLED.value
+        assert statuses["Wi-Fi"] == AdapterStatus.UP.value
+        assert backend.commands["enable_disable"] == 2
+
+
+class TestBuildReport:
+    """しきい値の判定のテストクラス."""
+
+    def test_steady_run_passes(self) -> None:
+        """増加も劣化もなければ合格するテスト."""
+        config = SoakConfig(cycles=100, warmup_cycles=10)
+
+        report = build_report(config, _samples(0), {"refresh": [0.02] * 100})
+
+        assert report.passed
+        assert report.latencies[0].drift == 0
+
+    def test_memory_growth_fails(self) -> None:
+        """RSSがしきい値を超えて増え続けると不合格になるテスト."""
+        config = SoakConfig(cycles=100, warmup_cycles=10, max_rss_growth_bytes=8 * MIB)
+
+        report = build_report(config, _samples(2 * MIB), {})
+
+        assert not report.passed
+        assert report.failures[0].startswith("rss_bytes")
+        rss = next(t for t in report.resources if t.metric == "rss_bytes")
+        assert rss.slope_per_1000_cycles == pytest.approx(200 * MIB)
+
+    def test_latency_drift_fails(self) -> None:
+        """所要時間の中央値が上限を超えて劣化すると不合格になるテスト."""
+        config = SoakConfig(cycles=100, warmup_cycles=10, max_latency_drift=0.5)
+        durations = [0.02 + i * 0.0005 for i in range(100)]
+
+        report = build_report(config, _samples(0), {"switch": durations})
+
+        assert not report.passed
+        assert "switch" in report.failures[0]
+
+    def test_lingering_child_processes_fail(self) -> None:
+        """回収されない子プロセスが残り続けると不合格になるテスト."""
+        config = SoakConfig(cycles=100, warmup_cycles=10)
+        samples = [
+            ResourceSample(cycle, 0.0, MIB, 12, 3, cycle // 20)
+            for cycle in range(0, 101, 10)
+        ]
+
+        report = build_report(config, samples, {})
+
+        assert [f for f in report.failures if "子プロセス" in f]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="/proc を使用")
+class TestRunSoak:
+    """偽のPowerShellに対する実行のテストクラス."""
+
+    def test_manager_soak_is_steady(self) -> None:
+        """一覧の更新と切り替えを繰り返しても増加・失敗がないテスト."""
+        backend = FakePowerShellBackend()
+        # 所要時間の劣化はTestBuildReportで確認する（短い実行ではばらつきが大きい）
+        config = SoakConfig(
+            cycles=12,
+            sample_interval=3,
+            warmup_cycles=3,
+            gui=False,
+            latency_drift_floor=1.0,
+        )
+
+        report = run_soak(config, backend)
+
+        assert report.passed, report.format()
+        assert not report.gui
+        assert [s.cycle for s in report.samples] == [0, 3, 6, 9, 12]
+        assert report.samples[-1].child_processes == report.samples[0].child_processes
+        assert {t.operation for t in report.latencies} == {
+            "get_adapters",
+            "switch_to_wifi",
+            "get_adapter_details",
+            "switch_to_ethernet",
+        }
+        # 2回目以降の切り替えは記憶したアダプター名で行う
+        assert backend.commands["fast_switch"] == 2 * 12 - 1
+        assert report.spawns == sum(backend.commands.values())
+        json.dumps(report.to_dict())
+
+    def test_gui_soak(self) -> None:
+        """表示できる環境ではGUIも操作できるテスト."""
+        try:
+            tk.Tk().destroy()
+        except tk.TclError:
+            pytest.skip("表示できる環境がありません")
+
+        config = SoakConfig(cycles=6, sample_interval=2, warmup_cycles=2, gui=True)
+
+        report = run_soak(config)
+
+        assert report.gui
+        assert report.passed, report.format()
+        assert report.samples[-1].tk_objects is not None
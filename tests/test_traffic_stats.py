@@ -0,0 +1,207 @@
+"""通信量サンプラーのテスト."""
+
+import json
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from src.powershell import PowerShellTimeoutError
+from src.traffic_stats import (
+    AdapterTraffic,
+    CounterSample,
+    PowerShellStatisticsSource,
+    RingBuffer,
+    SysfsStatisticsSource,
+    TrafficSampler,
+    TrafficStatsError,
+)
+
+
+class FakeSource:
+    """テスト用のカウンター値の取得元."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, CounterSample] = {}
+
+    def read(self) -> dict[str, CounterSample]:
+        return dict(self.samples)
+
+
+class TestRingBuffer:
+    """RingBufferのテストクラス."""
+
+    def test_append_and_values(self) -> None:
+        """追加した順に値が返るテスト."""
+        buffer = RingBuffer(4)
+        for value in (1.0, 2.0, 3.0):
+            buffer.append(value)
+
+        assert buffer.values() == [1.0, 2.0, 3.0]
+        assert buffer.latest() == 3.0
+        assert len(buffer) == 3
+
+    def test_wraps_around(self) -> None:
+        """満杯になると最古の値が上書きされるテスト."""
+        buffer = RingBuffer(3)
+        for value in range(10):
+            buffer.append(float(value))
+
+        assert buffer.values() == [7.0, 8.0, 9.0]
+        assert len(buffer) == 3
+        assert buffer.capacity == 3
+
+    def test_empty(self) -> None:
+        """空のバッファのテスト."""
+        buffer = RingBuffer(3)
+
+        assert buffer.values() == []
+        assert buffer.latest() == 0.0
+
+    def test_invalid_capacity(self) -> None:
+        """容量0はエラーになるテスト."""
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+
+class TestAdapterTraffic:
+    """AdapterTrafficのテストクラス."""
+
+    def test_rates_from_deltas(self) -> None:
+        """前回との差分からレートを計算するテスト."""
+        traffic = AdapterTraffic(10)
+        traffic.update(CounterSample(1000, 500, 10, 5), now=0.0)
+        traffic.update(CounterSample(3000, 1500, 30, 15), now=2.0)
+
+        assert traffic.rx_bps.values() == [8000.0]
+        assert traffic.tx_bps.values() == [4000.0]
+        assert traffic.rx_pps.values() == [10.0]
+        assert traffic.tx_pps.values() == [5.0]
+
+    def test_counter_reset_skipped(self) -> None:
+        """カウンターが巻き戻った場合はレートを追加しないテスト."""
+        traffic = AdapterTraffic(10)
+        traffic.update(CounterSample(5000, 5000, 50, 50), now=0.0)
+        traffic.update(CounterSample(100, 100, 1, 1), now=1.0)
+        traffic.update(CounterSample(200, 100, 2, 1), now=2.0)
+
+        assert traffic.rx_bps.values() == [800.0]
+
+    def test_missing_sample_appends_zero(self) -> None:
+        """アダプターが消えた場合は0を追加するテスト."""
+        traffic = AdapterTraffic(10)
+        traffic.update(CounterSample(0, 0, 0, 0), now=0.0)
+        traffic.update(None, now=1.0)
+
+        assert traffic.rx_bps.values() == [0.0]
+
+
+class TestSources:
+    """カウンター値の取得元のテストクラス."""
+
+    def test_sysfs_source(self, tmp_path: Path) -> None:
+        """sysfsからのカウンター値読み取りテスト."""
+        stats = tmp_path / "veth0" / "statistics"
+        stats.mkdir(parents=True)
+        for name, value in (
+            ("rx_bytes", 100),
+            ("tx_bytes", 200),
+            ("rx_packets", 3),
+            ("tx_packets", 4),
+        ):
+            (stats / name).write_text(f"{value}\n")
+        (tmp_path / "broken").mkdir()
+
+        samples = SysfsStatisticsSource(tmp_path).read()
+
+        assert samples == {"veth0": CounterSample(100, 200, 3, 4)}
+
+    def test_sysfs_source_real(self) -> None:
+        """実際の/sys/class/netからループバックを読み取れるテスト."""
+        if not Path("/sys/class/net/lo/statistics").exists():
+            pytest.skip("sysfsがありません")
+
+        assert "lo" in SysfsStatisticsSource().read()
+
+    def test_powershell_source(self) -> None:
+        """Get-NetAdapterStatisticsの出力解析テスト."""
+        runner = Mock()
+        runner.run.return_value = Mock(
+            stdout=json.dumps(
+                {
+                    "Name": "Ethernet",
+                    "ReceivedBytes": 1000,
+                    "SentBytes": 2000,
+                    "ReceivedUnicastPackets": 10,
+                    "SentUnicastPackets": 20,
+                }
+            )
+        )
+
+        samples = PowerShellStatisticsSource(runner).read()
+
+        assert samples == {"Ethernet": CounterSample(1000, 2000, 10, 20)}
+
+    def test_powershell_source_timeout(self) -> None:
+        """PowerShellのタイムアウトがTrafficStatsErrorになるテスト."""
+        runner = Mock()
+        runner.run.side_effect = PowerShellTimeoutError("timeout")
+
+        with pytest.raises(TrafficStatsError):
+            PowerShellStatisticsSource(runner).read()
+
+
+class TestTrafficSampler:
+    """TrafficSamplerのテストクラス."""
+
+    def test_sample_once(self) -> None:
+        """サンプリングでレート履歴が蓄積されるテスト."""
+        source = FakeSource()
+        sampler = TrafficSampler(source, capacity=5)
+
+        for tick in range(10):
+            source.samples = {
+                "Ethernet": CounterSample(tick * 1000, tick * 100, tick, tick)
+            }
+            sampler.sample_once(now=float(tick))
+
+        rx, tx = sampler.series("Ethernet")
+        assert rx == [8000.0] * 5
+        assert tx == [800.0] * 5
+        assert sampler.latest("Ethernet") == (8000.0, 800.0)
+        assert sampler.series("Wi-Fi") == ([], [])
+
+    def test_absent_adapters_are_evicted(self) -> None:
+        """一定回数続けて見つからないアダプターの履歴が破棄されるテスト."""
+        source = FakeSource()
+        sampler = TrafficSampler(source, capacity=5, evict_after=3)
+
+        for tick in range(20):
+            # VPNなど名前の変わるアダプターが次々に現れては消える
+            source.samples = {
+                "Ethernet": CounterSample(tick, tick, tick, tick),
+                f"VPN {tick}": CounterSample(0, 0, 0, 0),
+            }
+            sampler.sample_once(now=float(tick))
+
+        assert sorted(sampler.adapter_names()) == [
+            "Ethernet",
+            "VPN 17",
+            "VPN 18",
+            "VPN 19",
+        ]
+
+    def test_start_stop(self) -> None:
+        """バックグラウンドサンプリングの開始と停止テスト."""
+        source = FakeSource()
+        source.samples = {"Ethernet": CounterSample(0, 0, 0, 0)}
+        sampler = TrafficSampler(source, interval=0.01)
+
+        sampler.start()
+        deadline = time.monotonic() + 5
+        while not sampler.adapter_names() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sampler.stop()
+
+        assert sampler.adapter_names() == ["Ethernet"]
@@ -0,0 +1,324 @@
+"""Wi-Fi再接続のテスト."""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models.models import AdapterStatus, AdapterType, NetworkAdapter
+from src.network_manager import NetworkManager
+from src.wifi import (
+    AssociationResult,
+    WifiConfig,
+    WifiConnector,
+    WifiError,
+    WifiNetwork,
+    WifiScanner,
+    choose_network,
+    parse_interfaces,
+    parse_networks,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "netsh"
+
+
+def _fixture(name: str) -> str:
+    """記録したnetshの出力を読み込む."""
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _completed(stdout: str) -> "subprocess.CompletedProcess[str]":
+    """ランナーの戻り値を作成."""
+    return subprocess.CompletedProcess([], 0, stdout, "")
+
+
+class TestParseNetworks:
+    """parse_networksのテストクラス."""
+
+    def test_english_output(self) -> None:
+        """英語の出力から最も強いBSSIDの信号強度を取るテスト."""
+        networks = parse_networks(_fixture("networks_en.txt"))
+
+        assert networks == [
+            WifiNetwork("HomeNet", 91, "WPA2-Personal", 2),
+            WifiNetwork("HomeNet-5G", 72, "WPA3-Personal", 1),
+            WifiNetwork("Cafe : Guest", 48, "Open", 1),
+        ]
+
+    def test_japanese_output(self) -> None:
+        """日本語の出力を解析するテスト."""
+        networks = parse_networks(_fixture("networks_ja.txt"))
+
+        assert networks == [
+            WifiNetwork("HomeNet", 58, "WPA2-パーソナル", 1),
+            WifiNetwork("オフィス", 99, "WPA2-エンタープライズ", 1),
+        ]
+
+    def test_no_networks(self) -> None:
+        """ネットワークが見えない場合のテスト."""
+        assert parse_networks(_fixture("networks_none.txt")) == []
+        assert parse_networks("") == []
+
+
+class TestParseInterfaces:
+    """parse_interfacesのテストクラス."""
+
+    def test_connected(self) -> None:
+        """接続中のインターフェースのテスト."""
+        (state,) = parse_interfaces(_fixture("interfaces_connected.txt"))
+
+        assert state.name == "Wi-Fi"
+        assert state.connected
+        assert state.ssid == "HomeNet-5G"
+        assert state.signal_percent == 72
+        assert state.profile == "HomeNet-5G"
+
+    def test_disconnected(self) -> None:
+        """未接続のインターフェースのテスト."""
+        (state,) = parse_interfaces(_fixture("interfaces_disconnected.txt"))
+
+        assert state.name == "Wi-Fi"
+        assert not state.connected
+
+    def test_japanese_output(self) -> None:
+        """日本語の出力を解析するテスト."""
+        (state,) = parse_interfaces(_fixture("interfaces_ja.txt"))
+
+        assert state.ssid == "オフィス"
+        assert state.signal_percent == 99
+        assert state.profile == "オフィス"
+
+
+class TestChooseNetwork:
+    """choose_networkのテストクラス."""
+
+    def test_strongest_preferred(self) -> None:
+        """優先SSIDのうち最も強いものを選ぶテスト."""
+        networks = parse_networks(_fixture("networks_en.txt"))
+
+        chosen = choose_network(networks, ("HomeNet-5G", "HomeNet"))
+
+        assert chosen is not None
+        assert chosen.ssid == "HomeNet"
+
+    def test_tie_uses_preference_order(self) -> None:
+        """信号強度が同じなら設定順で先のものを選ぶテスト."""
+        networks = [WifiNetwork("A", 70), WifiNetwork("B", 70)]
+
+        chosen = choose_network(networks, ("B", "A"))
+
+        assert chosen is not None
+        assert chosen.ssid == "B"
+
+    def test_no_preferred_visible(self) -> None:
+        """優先SSIDが見えない場合のテスト."""
+        networks = parse_networks(_fixture("networks_en.txt"))
+        assert choose_network(networks, ("Office",)) is None
+        assert choose_network(networks, ()) is None
+
+    def test_config_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """環境変数から優先SSIDを読み取るテスト."""
+        monkeypatch.setenv("WIFI_PREFERRED_SSIDS", "HomeNet-5G, HomeNet,")
+        assert WifiConfig.from_env().preferred_ssids == ("HomeNet-5G", "HomeNet")
+
+
+class TestWifiScanner:
+    """WifiScannerのテストクラス."""
+
+    def test_results_cached_within_ttl(self) -> None:
+        """TTL以内はスキャンを再実行しないテスト."""
+        runner = MagicMock()
+        runner.run_process.return_value = _completed(_fixture("networks_en.txt"))
+        scanner = WifiScanner(runner, ttl=60.0)
+
+        first = scanner.scan("Wi-Fi")
+        second = scanner.scan("Wi-Fi")
+        scanner.scan("Wi-Fi", force=True)
+
+        assert first == second
+        assert runner.run_process.call_count == 2
+        assert runner.run_process.call_args.args[0] == [
+            "netsh",
+            "wlan",
+            "show",
+            "networks",
+            "mode=bssid",
+            "interface=Wi-Fi",
+        ]
+        assert runner.run_process.call_args.kwargs["use_breaker"] is False
+        runner.run.assert_not_called()
+
+    def test_failure_raises_wifi_error(self) -> None:
+        """netshが失敗した場合のテスト."""
+        runner = MagicMock()
+        runner.run_process.side_effect = subprocess.CalledProcessError(1, ["netsh"])
+
+        with pytest.raises(WifiError):
+            WifiScanner(runner).scan("Wi-Fi")
+
+
+class TestWifiConnector:
+    """WifiConnectorのテストクラス."""
+
+    def _runner(
+        self, interface_outputs: list[str], scan_failures: int = 0
+    ) -> MagicMock:
+        """スキャン・接続・状態取得に応答するランナーのモック.
+
+        最初のscan_failures回のスキャンは終了コード1で失敗する.
+        """
+        states = iter(interface_outputs)
+        failures = iter(range(scan_failures))
+
+        def run_process(
+            cmd: list[str], **kwargs: object
+        ) -> "subprocess.CompletedProcess[str]":
+            if cmd[:4] == ["netsh", "wlan", "show", "networks"]:
+                if next(failures, None) is not None:
+                    raise subprocess.CalledProcessError(1, cmd)
+                return _completed(_fixture("networks_en.txt"))
+            if cmd == ["netsh", "wlan", "show", "interfaces"]:
+                return _completed(next(states))
+            return _completed("")
+
+        runner = MagicMock()
+        runner.run_process.side_effect = run_process
+        return runner
+
+    def test_connects_to_strongest_preferred(self) -> None:
+        """最も強い優先SSIDに接続し、接続完了を待つテスト."""
+        connected = _fixture("interfaces_connected.txt")
+        runner = self._runner(
+            [_fixture("interfaces_disconnected.txt"), connected.replace("-5G", "")]
+        )
+        config = WifiConfig(preferred_ssids=("HomeNet-5G", "HomeNet"))
+        connector = WifiConnector(runner, config, poll_interval=0.01)
+
+        result = connector.connect_preferred("Wi-Fi", timeout=5)
+
+        assert result.ssid == "HomeNet"
+        assert result.signal_percent == 91
+        assert result.seconds >= 0
+        commands = [call.args[0] for call in runner.run_process.call_args_list]
+        assert [
+            "netsh",
+            "wlan",
+            "connect",
+            "name=HomeNet",
+            "ssid=HomeNet",
+            "interface=Wi-Fi",
+        ] in commands
+        runner.run.assert_not_called()
+
+    def test_already_connected_skips_connect(self) -> None:
+        """既に接続済みなら接続コマンドを送らないテスト."""
+        runner = self._runner([_fixture("interfaces_connected.txt")])
+        config = WifiConfig(preferred_ssids=("HomeNet-5G",))
+        connector = WifiConnector(runner, config, poll_interval=0.01)
+
+        result = connector.connect_preferred("Wi-Fi", timeout=5)
+
+        assert result.ssid == "HomeNet-5G"
+        commands = [call.args[0] for call in runner.run_process.call_args_list]
+        assert not any(c[2] == "connect" for c in commands)
+
+    def test_association_timeout_stops_polling_before_deadline(self) -> None:
+        """接続が完了しない場合、デッドライン間際には状態を確認しないテスト."""
+        disconnected = _fixture("interfaces_disconnected.txt")
+        runner = self._runner([disconnected] * 100)
+        config = WifiConfig(preferred_ssids=("HomeNet",))
+        connector = WifiConnector(runner, config, poll_interval=0.05)
+
+        with pytest.raises(WifiError, match="完了しませんでした"):
+            connector.connect_preferred("Wi-Fi", timeout=0.3)
+
+        timeouts = [c.kwargs["timeout"] for c in runner.run_process.call_args_list]
+        assert min(timeouts) >= 0.05
+
+    def test_netsh_uses_its_own_runner(self) -> None:
+        """netshはアダプター操作とは別のランナーで実行するテスト."""
+        manager = NetworkManager()
+
+        assert manager.wifi_connector.runner is not manager.runner
+
+    def test_scan_errors_are_retried(self) -> None:
+        """有効化直後にスキャンが失敗しても期限まで再試行するテスト."""
+        runner = self._runner([_fixture("interfaces_connected.txt")], scan_failures=2)
+        config = WifiConfig(preferred_ssids=("HomeNet-5G",))
+        connector = WifiConnector(runner, config, poll_interval=0.01)
+
+        result = connector.connect_preferred("Wi-Fi", timeout=5)
+
+        assert result.ssid == "HomeNet-5G"
+
+    def test_scan_errors_until_deadline(self) -> None:
+        """期限までスキャンが失敗し続けた場合はその失敗を返すテスト."""
+        runner = self._runner([], scan_failures=1000)
+        config = WifiConfig(preferred_ssids=("HomeNet-5G",))
+        connector = WifiConnector(runner, config, poll_interval=0.01)
+
+        with pytest.raises(WifiError, match="スキャンに失敗"):
+            connector.connect_preferred("Wi-Fi", timeout=0.05)
+
+    def test_no_preferred_visible(self) -> None:
+        """優先SSIDが見つからない場合のテスト."""
+        runner = self._runner([])
+        config = WifiConfig(preferred_ssids=("Office",))
+        connector = WifiConnector(runner, config, poll_interval=0.01)
+
+        with pytest.raises(WifiError):
+            connector.connect_preferred("Wi-Fi", timeout=0.05)
+
+    def test_switch_to_wifi_connects_preferred(self) -> None:
+        """Wi-Fiへの切り替え後に優先SSIDへ接続するテスト."""
+        connector = MagicMock()
+        connector.enabled = True
+        connector.connect_preferred.return_value = AssociationResult("HomeNet", 91, 1.5)
+        manager = NetworkManager(runner=MagicMock(), wifi_connector=connector)
+        ethernet = NetworkAdapter(
+            "Ethernet", "Realtek PCIe GbE", AdapterStatus.UP, AdapterType.ETHERNET
+        )
+        wifi = NetworkAdapter(
+            "Wi-Fi", "Intel(R) Wi-Fi 6", AdapterStatus.DISABLED, AdapterType.WIFI
+        )
+
+        with (
+            patch.object(
+                manager, "find_switch_adapters", return_value=(ethernet, wifi)
+            ),
+            patch.object(manager, "disable_adapter"),
+            patch.object(manager, "enable_adapter"),
+        ):
+            manager.switch_to_wifi()
+
+        connector.connect_preferred.assert_called_once_with(
+            "Wi-Fi", timeout=None, cancel=None
+        )
+        assert manager.last_association == AssociationResult("HomeNet", 91, 1.5)
+
+    def test_switch_succeeds_when_association_fails(self) -> None:
+        """優先SSIDへの接続に失敗しても切り替えは成功とするテスト."""
+        connector = MagicMock()
+        connector.enabled = True
+        connector.connect_preferred.side_effect = WifiError("not found")
+        manager = NetworkManager(runner=MagicMock(), wifi_connector=connector)
+        ethernet = NetworkAdapter(
+            "Ethernet", "Realtek PCIe GbE", AdapterStatus.UP, AdapterType.ETHERNET
+        )
+        wifi = NetworkAdapter(
+            "Wi-Fi", "Intel(R) Wi-Fi 6", AdapterStatus.DISABLED, AdapterType.WIFI
+        )
+
+        with (
+            patch.object(
+                manager, "find_switch_adapters", return_value=(ethernet, wifi)
+            ),
+            patch.object(manager, "disable_adapter"),
+            patch.object(manager, "enable_adapter"),
+        ):
+            manager.switch_to_wifi()
+
+        assert manager.last_association is None
+        errors = manager.metrics.operation_errors
+        assert errors.value(operation="wifi_association") == 1